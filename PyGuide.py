@@ -15,20 +15,22 @@
 
 """Script de lancement du programme GUIDE-CFR"""
 
+# Le chronomètre du démarrage doit être importé en premier
+from guide.script.launch import chronometre
+
 # Python import
 import sys
 
 # PyQt import
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 
 # Project import
 from guide.mainwindow import MainWindow
 from guide.script.launch.check_database import check_database_created
 
-# Resource import
-import guide.rc_icons
+chronometre.etape("Importation des modules")
 
 # Permettre les écrans High DPI avec PyQt5
 QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
@@ -36,14 +38,24 @@ QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
 
 if __name__ == "__main__":
     APP = QApplication(sys.argv)
+    chronometre.etape("Création de l'application")
+
+    # Les icônes sont chargées seulement lorsque l'application existe, juste avant leur première utilisation
+    import guide.rc_icons
+    chronometre.etape("Chargement des icônes")
 
     # Ajouter l'icon de l'application
     APP.setWindowIcon(QIcon(":/global/global/logo.png"))
 
     # Vérifier l'état de la base de données
     DATABASE = check_database_created()
+    chronometre.etape("Vérification de la base de données")
 
     # Afficher la fenêtre principale
     MAIN_WINDOW = MainWindow(DATABASE)
     MAIN_WINDOW.show()
+    chronometre.etape("Création de la fenêtre")
+
+    # Le rapport est affiché lorsque la fenêtre est dessinée par la boucle d'événements
+    QTimer.singleShot(0, chronometre.terminer)
     sys.exit(APP.exec_())
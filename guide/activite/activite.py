@@ -27,23 +27,20 @@ Classes
 
 
 # Python import
-import os
-from datetime import date, timedelta, datetime
-import tempfile
-import uuid
+from datetime import date, datetime
 
 # PyQt import
 from PyQt5.QtWidgets import QMessageBox, QTableWidgetItem, QDialog
 from PyQt5.QtCore import QDate, QTime, Qt, QDateTime
-from PyQt5.QtSql import QSqlQuery, QSqlDatabase
-
-# PyLaTeX import
-from pylatex import Document, PageStyle, MiniPage, LineBreak, MediumText, LargeText, Head, LongTabu
-from pylatex.utils import bold
+from PyQt5.QtSql import QSqlQuery
 
 # Project import
 from guide.script.database import database_error
+from guide.script.database import reference
 from guide.facturation import facturation
+from guide.facturation import service
+from guide.activite import recurrence
+from guide.script.rapport import document
 
 # Interface import
 from guide.interface.ui_nouvelle_activite import Ui_NouvelleActivite
@@ -75,6 +72,10 @@ class NouvelleActivite(QDialog, Ui_NouvelleActivite):
         self.ded_fin.setDate(current_date)
         self.ded_exclusion.setDate(current_date)
 
+        # Fréquences des activités récurrentes
+        for frequence, texte in recurrence.LISTE_FREQUENCE:
+            self.cbx_frequence.addItem(texte, userData=frequence)
+
         # Affichage des champs pour les dates
         self.afficher_champs_date()
 
@@ -117,25 +118,14 @@ class NouvelleActivite(QDialog, Ui_NouvelleActivite):
         """
         Afficher la liste des categories d'activite dans le combobox
         """
-        # Fetch data from database
-        query = QSqlQuery(self.DATABASE)
-        query.exec_("SELECT "
-                        "id_categorie_activite, nom "
-                    "FROM "
-                      "categorie_activite")
-
-        # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
-
-        # Ajouter les responsables a la liste
-        while query.next():
-            self.cbx_category_activite.addItem(str(query.value(1)), userData=query.value(0))
+        reference.attacher(self.cbx_category_activite, self.DATABASE, reference.CATEGORIE_ACTIVITE)
 
     def afficher_champs_date(self):
         """
         Afficher les champs pour entrer les date selon la fréquence de l'activité
             - Activité unique : un seul champ est affiché pour entrer la date
-            - Activité hebdomadaire : les champs pour afficher les date de début, fin et exlcusion sotn affichés
+            - Activité récurrente : les champs pour afficher la fréquence et les date de début, fin et exlcusion sont
+              affichés
         """
 
         # Date unique
@@ -196,68 +186,27 @@ class NouvelleActivite(QDialog, Ui_NouvelleActivite):
             fin = date(q_date_fin.year(), q_date_fin.month(), q_date_fin.day())
 
             # Preparation de la liste des exclusions
-            exclusion_liste = self.txt_exclusion.text().split(', ')
-            if exclusion_liste != ['']:
-                r = 0
-                for exclusion in exclusion_liste:
-                    date_value = datetime.strptime(exclusion, '%Y-%m-%d').date()
-                    exclusion_liste[r] = date_value
-                    r = r + 1
-
-            # Preparation de la liste des dates
-            liste_date = []
-
-            current_date = debut
-            while current_date <= fin:
-                # Ne pas ajouter une date exclue
-                if current_date not in exclusion_liste:
-                    liste_date.append(current_date)
-
-                current_date = current_date + timedelta(weeks=1)
+            # Les dates sont dans le format affiché par ajout_date_exclusion
+            exclusion_liste = []
+            if self.txt_exclusion.text() != "":
+                for exclusion in self.txt_exclusion.text().split(', '):
+                    exclusion_liste.append(datetime.strptime(exclusion, '%d-%m-%Y').date())
+
+            serie = recurrence.Serie(
+                id_categorie_activite=self.cbx_category_activite.itemData(self.cbx_category_activite.currentIndex()),
+                nom=self.txt_nom.text(),
+                heure_debut=self.tim_debut.time().toString('HH:mm'),
+                heure_fin=self.tim_fin.time().toString('HH:mm'),
+                delai_inscription=self.sbx_fin_inscription.value(),
+                recurrence=recurrence.Recurrence(debut, fin, self.cbx_frequence.currentData(), exclusion_liste))
 
             # Ajouter les informations a la base de donnees
-
-            QSqlDatabase(self.DATABASE).transaction()
-
-            for date_activite in liste_date:
-                query = QSqlQuery(self.DATABASE)
-                query.prepare("INSERT INTO activite "
-                                "(id_categorie_activite, "
-                                "date, "
-                                "heure_debut, "
-                                "heure_fin, "
-                                "date_limite_inscription,"
-                                "nom) "
-                              "VALUES "
-                                "(:id_categorie_activite, "
-                                ":date_activite, "
-                                ":heure_debut, "
-                                ":heure_fin, "
-                                ":date_limite_inscription,"
-                                ":nom)")
-                query.bindValue(':id_categorie_activite',
-                                self.cbx_category_activite.itemData(self.cbx_category_activite.currentIndex()))
-                query.bindValue(':date_activite', QDate(date_activite.year, date_activite.month,
-                                                        date_activite.day).toString('yyyy-MM-dd'))
-                query.bindValue(':heure_debut', self.tim_debut.time().toString('HH:mm'))
-                query.bindValue(':heure_fin', self.tim_fin.time().toString('HH:mm'))
-                query.bindValue(':nom', self.txt_nom.text())
-
-                # Date limite inscription
-                # Le passage par julianDay est nécessaire pour permettre d'effectuer la soustraction
-                date_limite = QDate(date_activite.year, date_activite.month,
-                                   date_activite.day).toJulianDay() - self.sbx_fin_inscription.value()
-                value_date = QDate.fromJulianDay(date_limite).toString('yyyy-MM-dd')
-
-                query.bindValue(':date_limite_inscription', value_date)
-                query.exec_()
-
+            moteur = recurrence.MoteurRecurrence(self.DATABASE)
+            if moteur.enregistrer([serie]) is None:
                 # Affichage d'un message d'erreur si la requete echoue
-                if database_error.sql_error_handler(query.lastError()):
-                    QSqlDatabase(self.DATABASE).rollback()  # Annuler la transaction
-                    return  # Empêche la fermeture du dialog
-            QSqlDatabase(self.DATABASE).commit()
-        self.accept()
+                database_error.sql_error_handler(moteur.lastError())
+                return  # Empêche la fermeture du dialog
+            self.accept()
 
 
 class AfficherActivite(QDialog, Ui_AfficherActivite):
@@ -271,6 +220,7 @@ class AfficherActivite(QDialog, Ui_AfficherActivite):
         # Instance variable definition
         self.DATABASE = database
         self.ID_ACTIVITE = id_activite
+        self.PRESENCES = dict()  # Présences enregistrées {Identifiant de l'inscription: Présent}
 
         # Afficher les informations sur l'activite
         self.afficher_informations()
@@ -292,83 +242,40 @@ class AfficherActivite(QDialog, Ui_AfficherActivite):
 
     def enregistrer_presences(self):
         """Enregistrer la liste des présences"""
+        # Seules les présences modifiées depuis l'affichage sont enregistrées
+        presents = []
+        absents = []
         for row in range(self.tbl_inscriptions.rowCount()):
-            # Entrer la personne comme présente
-            print(self.tbl_inscriptions.item(row, 5).checkState())
-            if self.tbl_inscriptions.item(row, 5).checkState() == Qt.Checked:
-                query = QSqlQuery(self.DATABASE)
-                query.prepare("UPDATE inscription "
-                              "SET "
-                                "present = 1 "
-                              "WHERE id_inscription = :id_inscription")
-                query.bindValue(':id_inscription', self.tbl_inscriptions.item(row, 0).text())
-                query.exec_()
-
-                # Affichage d'un message d'erreur si la requete echoue
-                if database_error.sql_error_handler(query.lastError()):
-                    return  # Ne pas continuer si la requete échoue
-            # Entrer la personne comme abscente
+            item = self.tbl_inscriptions.item(row, 5)
+            if item is None:
+                continue  # La présence ne peut pas encore être entrée
+
+            id_inscription = int(self.tbl_inscriptions.item(row, 0).text())
+            present = item.checkState() == Qt.Checked
+            if self.PRESENCES.get(id_inscription) == present:
+                continue
+
+            # Entrer la personne comme présente ou abscente
+            if present:
+                presents.append(id_inscription)
             else:
-                query = QSqlQuery(self.DATABASE)
-                query.prepare("UPDATE inscription "
-                              "SET "
-                                "present = 0 "
-                              "WHERE id_inscription = :id_inscription")
-                query.bindValue(':id_inscription', self.tbl_inscriptions.item(row, 0).text())
-                query.exec_()
+                absents.append(id_inscription)
 
-                # Affichage d'un message d'erreur si la requete echoue
-                if database_error.sql_error_handler(query.lastError()):
-                    return  # Ne pas continuer si la requete échoue
+        moteur = service.MoteurPresence(self.DATABASE)
+        if not moteur.enregistrer(presents, absents):
+            # Affichage d'un message d'erreur si l'enregistrement echoue
+            database_error.sql_error_handler(moteur.lastError())
+            return
+
+        # Conserver les présences enregistrées
+        self.PRESENCES.update(dict.fromkeys(presents, True))
+        self.PRESENCES.update(dict.fromkeys(absents, False))
 
     def liste_presence(self):
         """Afficher la liste des présences"""
-        geometry_options = {"margin": "1in"}
-        doc = Document(page_numbers=True, geometry_options=geometry_options)
-
-        # Document header
-        header = PageStyle("header")
-        # Left header
-        with header.create(Head("L")):
-            header.append("Liste de présences")
-        # Right header
-        with header.create(Head("R")):
-            header.append("Centre femmes du Haut-Richelieu")
-
-        doc.preamble.append(header)
-        doc.change_document_style("header")
-
-        # Titre du document
-        with doc.create(MiniPage(align='c')):
-            doc.append(LargeText(bold("Liste de présences")))
-            doc.append(LineBreak())
-            doc.append(MediumText("{}".format(self.txt_nom.text())))
-            doc.append(LineBreak())
-            doc.append(MediumText("{}".format(self.ded_date.date().toString('dd MMMM yyyy'))))
-
-        # Generer le tableau
-        with doc.create(LongTabu("X[l] X[l]")) as data_table:
-            header_row1 = ["Nom de la participante", "Signature"]
-            data_table.add_row(header_row1, mapper=[bold])
-            data_table.add_hline()
-            data_table.end_table_header()
-            for r in range(self.tbl_inscriptions.rowCount()):
-                data_table.add_empty_row()
-                row = [self.tbl_inscriptions.item(r, 1).text(), ""]
-                data_table.add_row(row)
-                data_table.add_empty_row()
-                data_table.add_empty_row()
-                data_table.add_hline()
-
-        temp_dir = tempfile.mkdtemp()
-        file = str(uuid.uuid4())
-        filename = os.path.join(temp_dir, file)
-
-        doc.generate_pdf(filename, compiler="pdflatex")
-
-        file_ext = file + ".pdf"
-        filename_ext = os.path.join(temp_dir, file_ext)
-        os.startfile(os.path.normpath(filename_ext))
+        participantes = [self.tbl_inscriptions.item(r, 1).text() for r in range(self.tbl_inscriptions.rowCount())]
+        document.ListePresence(self.txt_nom.text(), self.ded_date.date().toString('dd MMMM yyyy'),
+                               participantes).afficher()
 
     def afficher_inscription(self):
         """Afficher la liste des inscriptions"""
@@ -404,12 +311,15 @@ class AfficherActivite(QDialog, Ui_AfficherActivite):
             # Affichage des donnees
             self.tbl_inscriptions.setItem(r, 0, QTableWidgetItem(str(query.value(0))))
 
+            # Présence enregistrée
+            if str(query.value(7)) in ("0", "1"):
+                self.PRESENCES[int(query.value(0))] = str(query.value(7)) == "1"
+
             nom = str(query.value(1)) + " " + str(query.value(2))
             self.tbl_inscriptions.setItem(r, 1, QTableWidgetItem(nom))
 
             phone_number_string = str(query.value(3))
             phone_number = phone_number_string[:3] + " " + phone_number_string[3:6] + "-" + phone_number_string[6:]
-            print(query.value(4))
             if query.value(4) == " ":
                 phone_number = phone_number + " p. " + str(query.value(4))
             self.tbl_inscriptions.setItem(r, 2, QTableWidgetItem(phone_number))
@@ -22,6 +22,7 @@ from PyQt5.QtWidgets import QDialog
 
 # Projet import
 from guide.script.database import database_error
+from guide.script.database import reference
 from guide.script.interface import validator
 from guide.script.database import data_processing
 from guide.script.data import data_error
@@ -55,64 +56,19 @@ class CategorieActivite(QDialog, Ui_CategorieActivite):
         """
         Afficher la liste des responsables dans le combobox
         """
-        # Fetch data from database
-        query = QSqlQuery(self.DATABASE)
-        query.exec_("SELECT "
-                      "id_responsable, "
-                      "prenom, "
-                      "nom "
-                    "FROM "
-                      "responsable "
-                    "ORDER BY nom ASC")
-
-        # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
-
-        # Ajouter les responsables a la liste
-        while query.next():
-            nom = str(query.value(2)) + ", " + str(query.value(1))
-            self.cbx_responsable.addItem(nom, userData=query.value(0))
+        reference.attacher(self.cbx_responsable, self.DATABASE, reference.RESPONSABLE)
 
     def afficher_type_activite(self):
         """
         Afficher la liste des types d'activite dans le ComboBox
         """
-
-        # Fetch data from database
-        query = QSqlQuery(self.DATABASE)
-        query.exec_("SELECT "
-                      "id_type_activite, "
-                      "nom "
-                    "FROM "
-                      "type_activite "
-                    "ORDER BY nom ASC")
-
-        # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
-
-        # Ajouter les types d'activite a la liste
-        while query.next():
-            self.cbx_type_activite.addItem(str(query.value(1)), userData=query.value(0))
+        reference.attacher(self.cbx_type_activite, self.DATABASE, reference.TYPE_ACTIVITE)
 
     def afficher_lieu(self):
         """
         Afficher la liste des lieux dans le ComboBox
         """
-
-        # Fetch data from database
-        query = QSqlQuery(self.DATABASE)
-        query.exec_("SELECT "
-                      "id_lieu, "
-                      "nom "
-                    "FROM "
-                      "lieu")
-
-        # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
-
-        # Ajouter les types d'activite a la liste
-        while query.next():
-            self.cbx_lieu.addItem(str(query.value(1)), userData=query.value(0))
+        reference.attacher(self.cbx_lieu, self.DATABASE, reference.LIEU)
 
     def check_fields(self):
         """
@@ -180,6 +136,7 @@ class NouvelleCategorieActivite(CategorieActivite):
         query.exec_()
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.CATEGORIE_ACTIVITE)
             self.accept()  # Fermer si dialog seulement si la requete reussie
 
 
@@ -267,4 +224,5 @@ class ModifierCategorieActivite(CategorieActivite):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.CATEGORIE_ACTIVITE)
             self.accept()  # Fermer le dialog seulement si la requete reussie
@@ -22,6 +22,7 @@ from PyQt5.QtWidgets import QDialog
 
 # Project import
 from guide.script.database import database_error
+from guide.script.database import reference
 from guide.script.interface import validator
 from guide.script.interface import completer
 from guide.script.database import data_processing
@@ -109,6 +110,7 @@ class NouveauLieu(Lieu):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.LIEU)
             self.accept() # Fermer le dialog seulement si la requete reussie
 
 
@@ -185,4 +187,5 @@ class ModifierLieu(Lieu):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.LIEU)
             self.accept() # Fermer le dialog seulement si la requete reussie
@@ -0,0 +1,174 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Création des activités récurrentes
+
+Les règles de récurrence sont développées en mémoire puis toutes les activités sont ajoutées avec une seule requête
+préparée exécutée en lot (execBatch) dans une seule transaction.
+
+Methodes :
+    dates : Obtenir les dates d'une récurrence
+
+Classes
+    Recurrence : Règle de récurrence
+    Serie : Série d'activités d'une catégorie
+    MoteurRecurrence : Ajout des activités de plusieurs séries
+"""
+
+# Python import
+import calendar
+from collections import namedtuple
+from datetime import timedelta
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery, QSqlError
+
+# Project import
+from guide.script.database.moteur import Moteur
+
+# Fréquences des activités récurrentes
+FREQUENCE_HEBDOMADAIRE = 0
+FREQUENCE_BIHEBDOMADAIRE = 1
+FREQUENCE_MENSUELLE = 2
+
+# Texte affiché pour chaque fréquence
+LISTE_FREQUENCE = [(FREQUENCE_HEBDOMADAIRE, "Hebdomadaire"),
+                   (FREQUENCE_BIHEBDOMADAIRE, "Aux deux semaines"),
+                   (FREQUENCE_MENSUELLE, "Mensuelle")]
+
+# Règle de récurrence
+# Les dates de début et de fin sont incluses. Les exclusions sont une liste de datetime.date.
+Recurrence = namedtuple('Recurrence', ['debut', 'fin', 'frequence', 'exclusions'])
+
+# Série d'activités d'une catégorie
+# Le délai d'inscription est le nombre de jours entre la date limite d'inscription et la date de l'activité
+Serie = namedtuple('Serie', ['id_categorie_activite', 'nom', 'heure_debut', 'heure_fin', 'delai_inscription',
+                             'recurrence'])
+
+
+def ajouter_mois(date_debut, mois):
+    """
+    Ajouter un nombre de mois à une date
+
+    Le jour est ramené au dernier jour du mois lorsque le mois est plus court.
+
+    :param date_debut: Date
+    :param mois: Nombre de mois
+    :return: Date
+    """
+    annee, mois = divmod(date_debut.month - 1 + mois, 12)
+    annee = date_debut.year + annee
+    mois = mois + 1
+    jour = min(date_debut.day, calendar.monthrange(annee, mois)[1])
+    return date_debut.replace(year=annee, month=mois, day=jour)
+
+
+def dates(recurrence):
+    """
+    Obtenir les dates d'une récurrence
+
+    :param recurrence: Recurrence
+    :return: Liste des datetime.date en ordre chronologique
+    """
+    exclusions = set(recurrence.exclusions or ())
+
+    liste_date = list()
+    occurence = 0
+    date_activite = recurrence.debut
+    while date_activite <= recurrence.fin:
+        # Ne pas ajouter une date exclue
+        if date_activite not in exclusions:
+            liste_date.append(date_activite)
+
+        occurence = occurence + 1
+        if recurrence.frequence == FREQUENCE_MENSUELLE:
+            # Toujours calculer à partir de la date de début pour conserver le jour du mois
+            date_activite = ajouter_mois(recurrence.debut, occurence)
+        elif recurrence.frequence == FREQUENCE_BIHEBDOMADAIRE:
+            date_activite = date_activite + timedelta(weeks=2)
+        else:
+            date_activite = date_activite + timedelta(weeks=1)
+    return liste_date
+
+
+class MoteurRecurrence(Moteur):
+    """
+    Ajout des activités de plusieurs séries
+
+    Methodes :
+        enregistrer : Ajouter toutes les activités des séries
+    """
+
+    def enregistrer(self, series):
+        """
+        Ajouter toutes les activités des séries
+
+        :param series: Liste des Serie
+        :return: Nombre d'activités ajoutées ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+
+        # Développer les récurrences en mémoire
+        categories = list()
+        noms = list()
+        dates_activite = list()
+        heures_debut = list()
+        heures_fin = list()
+        dates_limite = list()
+        for serie in series:
+            for date_activite in dates(serie.recurrence):
+                categories.append(serie.id_categorie_activite)
+                noms.append(serie.nom)
+                dates_activite.append(date_activite.isoformat())
+                heures_debut.append(serie.heure_debut)
+                heures_fin.append(serie.heure_fin)
+                dates_limite.append((date_activite - timedelta(days=serie.delai_inscription)).isoformat())
+
+        if not dates_activite:
+            return 0
+
+        # Commencer une transaction
+        if not self.DATABASE.transaction():
+            self.ERREUR = self.DATABASE.lastError()
+            return None
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO activite "
+                        "(id_categorie_activite, "
+                        "date, "
+                        "heure_debut, "
+                        "heure_fin, "
+                        "date_limite_inscription, "
+                        "nom) "
+                      "VALUES "
+                        "(?, ?, ?, ?, ?, ?)")
+        query.addBindValue(categories)
+        query.addBindValue(dates_activite)
+        query.addBindValue(heures_debut)
+        query.addBindValue(heures_fin)
+        query.addBindValue(dates_limite)
+        query.addBindValue(noms)
+        if not self.executer_lot(query):
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        # Terminer la transaction
+        if not self.DATABASE.commit():
+            self.ERREUR = self.DATABASE.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        return len(dates_activite)
@@ -22,6 +22,7 @@ from PyQt5.QtWidgets import QDialog
 
 # Project import
 from guide.script.database import database_error
+from guide.script.database import reference
 from guide.script.interface import validator
 from guide.script.data import data_error
 
@@ -87,6 +88,7 @@ class NouveauResponsable(Responsable):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.RESPONSABLE)
             self.accept() # Fermer le dialog seulement si la requete reussie
 
 
@@ -145,4 +147,5 @@ class ModifierResponsable(Responsable):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.RESPONSABLE)
             self.accept() # Fermer le dialog seulement si la requete reussie
@@ -31,6 +31,7 @@ from PyQt5.QtWidgets import QDialog
 
 # Project import
 from guide.script.database import database_error
+from guide.script.database import reference
 from guide.script.interface import validator
 from guide.script.data import data_error
 
@@ -112,6 +113,7 @@ class NouveauTypeActivite(TypeActivite):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.TYPE_ACTIVITE)
             self.accept() # Fermer le dialog seulement si la requete reussie
 
 
@@ -172,4 +174,5 @@ class ModifierTypeActivite(TypeActivite):
 
         # Affichage d'un message d'erreur si la requete echoue
         if not database_error.sql_error_handler(query.lastError()):
+            reference.invalider(reference.TYPE_ACTIVITE)
             self.accept() # Fermer le dialog seulement si la requete reussie
@@ -28,6 +28,7 @@ from PyQt5.QtSql import QSqlQuery
 from guide.activite.responsable import NouveauResponsable, ModifierResponsable
 from guide.activite.type_activite import NouveauTypeActivite, ModifierTypeActivite
 from guide.script.database import database_error
+from guide.script.database import index_recherche
 
 # Interface import
 from guide.interface.ui_consultation import Ui_Consultation
@@ -96,11 +97,25 @@ class Consultation(QDialog, Ui_Consultation):
         # Obtenir la liste des responsables de la base de donnees
         query = QSqlQuery(self.DATABASE)
 
-        sql = "SELECT * FROM responsable "
-        if self.txt_search.text() != "":
-            sql = sql + "WHERE prenom LIKE '%{0}%' OR nom LIKE '%{0}%' ".format(self.txt_search.text())
-        sql = sql + "ORDER BY nom ASC"
-        query.exec_(sql)
+        sql = "SELECT responsable.* FROM responsable "
+        order_by = "ORDER BY responsable.nom ASC"
+        valeur_recherche = None
+        search = self.txt_search.text()
+        if search != "":
+            # Recherche dans l'index plein texte (sans accents) triée par pertinence
+            if index_recherche.disponible(self.DATABASE):
+                valeur_recherche = index_recherche.expression(search)
+                if valeur_recherche:
+                    sql = sql + "INNER JOIN recherche ON recherche.rowid = id_responsable * 4 + {} " \
+                                "WHERE recherche MATCH :recherche ".format(index_recherche.TYPE_RESPONSABLE)
+                    order_by = "ORDER BY recherche.rank, responsable.nom ASC"
+            else:
+                sql = sql + "WHERE ifnull(prenom, '') || ' ' || ifnull(nom, '') LIKE :recherche "
+                valeur_recherche = "%" + search + "%"
+        query.prepare(sql + order_by)
+        if valeur_recherche:
+            query.bindValue(':recherche', valeur_recherche)
+        query.exec_()
 
         # Affichage d'un message d'erreur si la requete echoue
         database_error.sql_error_handler(query.lastError())
@@ -24,24 +24,24 @@ from PyQt5.QtGui import QColor, QBrush
 
 # Project import
 from guide.script.database import database_error
+from guide.script.database import sequence
+from guide.script.database import annuaire
 from guide.script.interface import selection
 from guide.script.interface import validator
 from guide.script.database import data_processing
 from guide.script.data import data_error
 from guide.script.data import parsing
+from guide.facturation import service
+from guide.facturation import places
+from guide.script.rapport import document
+from guide.facturation.service import STATUS_INSCRIPTION_ANNULEE, STATUS_INSCRIPTION, STATUS_FACTURE, \
+    STATUS_REMBOURSE
 
 # Interface import
 from guide.interface.ui_facturation import Ui_Facturation
 from guide.interface.ui_inscription import Ui_Inscription
 
 
-# Définition de constantes
-STATUS_INSCRIPTION_ANNULEE = 0
-STATUS_INSCRIPTION = 1
-STATUS_FACTURE = 2
-STATUS_REMBOURSE = 3
-
-
 class Facture(QDialog):
     """Fonctions nécessaires pour tous les types de facture"""
 
@@ -67,43 +67,26 @@ class Facture(QDialog):
         :return: Informations sur la participante
         """
         # Vérifier si le numéro de téléphone est valide
-        if len(numero_telephone) == 12:
-
-            # Preparation du numero de telephone
-            phone_number = int(data_processing.check_phone_number(numero_telephone))
-
-            query = QSqlQuery()
-            query.prepare("SELECT "
-                            "participante.id_participante, "
-                            "participante.prenom, "
-                            "participante.nom, "
-                            "participante.ville, "
-                            "membre.actif "
-                          "FROM participante "
-                          "LEFT JOIN membre ON participante.id_participante = membre.id_participante "
-                          "WHERE "
-                            "(participante.telephone_1 = :phone) "
-                            "OR "
-                            "(participante.telephone_2 = :phone)")
-            query.bindValue(':phone', phone_number)
-            query.exec_()
+        if annuaire.normaliser(numero_telephone) is not None:
 
-            # Affichage d'un message d'erreur si la requete echoue
-            database_error.sql_error_handler(query.lastError())
+            # Les participantes sont recherchées dans l'annuaire partagé par tous les dialogs
+            participantes = annuaire.rechercher(self.DATABASE, numero_telephone)
+            if participantes is None:
+                return False
 
             resultat = []
 
             # Obtenir les informations de la requete
-            while query.next():
+            for participante in participantes:
                 informations = dict()
-                informations["index"] = int(query.value(0))
-                self.ID_PARTICIPANTE = int(query.value(0))
+                informations["index"] = participante.id_participante
+                self.ID_PARTICIPANTE = participante.id_participante
 
-                nom = str(query.value(1)) + " " + str(query.value(2))
+                nom = participante.prenom + " " + participante.nom
                 informations["nom"] = nom
 
-                informations["ville"] = str(query.value(3))
-                informations["actif"] = query.value(4)
+                informations["ville"] = participante.ville
+                informations["actif"] = participante.actif
                 resultat.append(informations)
 
             # La requête ne contient aucune information
@@ -138,7 +121,8 @@ class Facture(QDialog):
         :param table: Tableau dans lequel les données sont affichées
         """
         # Fetch data from database
-        query = QSqlQuery()
+        # Le nombre de participantes est lu dans le compteur maintenu par les triggers de la table inscription
+        query = QSqlQuery(self.DATABASE)
         sql = "SELECT " \
                 "categorie_activite.nom, " \
                 "categorie_activite.prix_membre, " \
@@ -146,31 +130,31 @@ class Facture(QDialog):
                 "activite.date, " \
                 "activite.heure_debut, " \
                 "activite.heure_fin, " \
-                "activite.id_activite, "\
-                "("\
-                  "SELECT COUNT(inscription.id_inscription) "\
-                  "FROM inscription "\
-                  "WHERE (inscription.id_activite = activite.id_activite) AND (inscription.status = 1) "\
-                ") nombre_participante, "\
+                "activite.id_activite, " + \
+                places.NOMBRE_INSCRIPTION + " nombre_participante, " \
                 "categorie_activite.participante_maximum," \
                 "activite.nom "\
               "FROM activite " \
               "INNER JOIN categorie_activite "\
-                "ON activite.id_categorie_activite = categorie_activite.id_categorie_activite " \
-              "WHERE activite.date_limite_inscription >= {} ".format(QDate.currentDate().toString('yyyy-MM-dd'))
-
-        # Afficher les activités qui ne sont pas annulées
-        if not annule:
-            sql = sql + "AND activite.status = 1 "
-        else:
-            sql = sql + "AND activite.status = 0 "
+                "ON activite.id_categorie_activite = categorie_activite.id_categorie_activite " + \
+              places.JOINTURE_COMPTEUR + \
+              "WHERE (activite.date_limite_inscription >= :current_date) AND (activite.status = :status) "
 
         # Recherche par nom d'activite
         if search != "":
-            sql = sql + "WHERE categorie_activite.nom LIKE '%{}%' ".format(search)
+            sql = sql + "AND categorie_activite.nom LIKE :search "
 
         sql = sql + "ORDER BY categorie_activite.nom ASC, activite.date ASC LIMIT 100"
-        query.exec_(sql)
+        query.prepare(sql)
+
+        # Seules les activités dont la date limite d'inscription n'est pas passée sont affichées
+        query.bindValue(':current_date', QDate.currentDate().toString('yyyy-MM-dd'))
+
+        # Afficher les activités qui ne sont pas annulées
+        query.bindValue(':status', 0 if annule else 1)
+        if search != "":
+            query.bindValue(':search', '%' + search + '%')
+        query.exec_()
 
         # Affichage d'un message d'erreur si la requete echoue
         database_error.sql_error_handler(query.lastError())
@@ -219,23 +203,20 @@ class Facture(QDialog):
                         "activite.date, "
                         "activite.heure_debut, "
                         "activite.heure_fin, "
-                        "activite.id_activite, "
-                        "("
-                          "SELECT COUNT(inscription.id_inscription) "
-                          "FROM inscription "
-                          "WHERE (inscription.id_activite = activite.id_activite) AND (inscription.status = 1) "
-                        ") nombre_participante, "
+                        "activite.id_activite, " +
+                        places.NOMBRE_INSCRIPTION + " nombre_participante, "
                         "categorie_activite.participante_maximum "
                       "FROM inscription "
                       "LEFT JOIN activite "
                         "ON inscription.id_activite = activite.id_activite "
                       "LEFT JOIN categorie_activite "
-                        "ON activite.id_categorie_activite = categorie_activite.id_categorie_activite "
+                        "ON activite.id_categorie_activite = categorie_activite.id_categorie_activite " +
+                      places.JOINTURE_COMPTEUR +
                       "WHERE "
                         "(inscription.id_participante = :id_participante) "
                         "AND (activite.date >= :current_date) "
                         "AND (inscription.status = :status) "
-                        "AND (activite.status = 1)"
+                        "AND (activite.status = 1) "
                       "ORDER BY categorie_activite.nom ASC, activite.date ASC")
         query.bindValue(':id_participante', self.ID_PARTICIPANTE)
         query.bindValue(':current_date', QDate.currentDate().toString('yyyy-MM-dd'))
@@ -285,45 +266,21 @@ class Facture(QDialog):
         msgbox.setWindowTitle("Liste d'attente")
         msgbox.setText("Libération d'une place")
 
-        # Vérifier l'inscription pour laquelle la place est libérée
-        query = QSqlQuery(self.DATABASE)
-        query.prepare("SELECT participante.prenom, participante.nom "
-                      "FROM inscription "
-                      "LEFT JOIN participante ON participante.id_participante = inscription.id_participante "
-                      "WHERE (inscription.status = 1) AND (inscription.id_activite = :id_activite) "
-                      "ORDER BY inscription.time")
-        query.bindValue(':id_activite', id_activite)
-        query.exec_()
+        # Obtenir le nombre de places de l'activité
+        places_activite = places.places(self.DATABASE, id_activite)
 
-        # Affiche un message en cas d'erreur dans la requete
-        if database_error.sql_error_handler(query.lastError()):
-            return  # Empeche de continuer la fonction avec des donnees incompletes
-
-        # Affichage de l'information sur la place libérée
-        lst = []
-        while query.next():
-            lst.append(query.value(0) + " " + query.value(1))
-
-        # Vérifier le nombre total de participantes
-        query = QSqlQuery(self.DATABASE)
-        query.prepare("SELECT COUNT(inscription.id_inscription) "
-                      "FROM inscription "
-                      "WHERE (inscription.id_activite = :id_activite) "
-                      "AND (inscription.status = 1) ")
-        query.bindValue(':id_activite', id_activite)
-        query.exec_()
-
-        # Affiche un message en cas d'erreur dans la requete
-        if database_error.sql_error_handler(query.lastError()):
-            return  # Empeche de continuer la fonction avec des donnees incompletes
+        # Continuer seulement s'il y a des participante sur la liste d'attente
+        if places_activite is None or not places_activite.attente:
+            return
 
-        # Obtenir le nombre de participante
-        query.first()
-        nombre_participante = query.value(0)
+        # Obtenir la participante pour laquelle la place est libérée
+        nom_participante = places.premiere_attente(self.DATABASE, id_activite, places_activite.maximum)
+        if nom_participante is None:
+            return
 
         # Obtenir les informations sur l'activite
         query = QSqlQuery(self.DATABASE)
-        query.prepare("SELECT categorie_activite.nom, categorie_activite.participante_maximum, activite.date "
+        query.prepare("SELECT categorie_activite.nom, activite.date "
                       "FROM activite "
                       "LEFT JOIN categorie_activite ON categorie_activite.id_categorie_activite = "
                       "activite.id_categorie_activite "
@@ -338,15 +295,10 @@ class Facture(QDialog):
         # Preparation des donnees
         query.first()
         nom_activite = str(query.value(0))
-        maximum = int(query.value(1))
-        date = QDate().fromString(query.value(2), 'yyyy-MM-dd')
-
-        # Continuer seulement s'il y a des participante sur la liste d'attente
-        if nombre_participante <= maximum:
-            return
+        date = QDate().fromString(query.value(1), 'yyyy-MM-dd')
 
         text = "Une place pour {} sera libérée dans l'activitée {} du {} lorsque vous enregistrerez ces inscriptions."\
-            .format(lst[maximum], nom_activite, date.toString('dd MMM yyyy'))
+            .format(nom_participante, nom_activite, date.toString('dd MMM yyyy'))
         msgbox.setInformativeText(text)
         msgbox.setIcon(QMessageBox.Information)
         msgbox.setStandardButtons(QMessageBox.Ok)
@@ -402,51 +354,16 @@ class Facturation(Facture, Ui_Facturation):
 
         resultat = self.inscription(self.chk_actif.isChecked())
 
+        # Rang de toutes les inscriptions de la participante
+        rangs = places.rangs(self.DATABASE, self.ID_PARTICIPANTE)
+        if rangs is None:
+            return  # Empeche de continuer la fonction avec des donnees incompletes
+
         for inscription in resultat:
-            # Vérifier si l'inscription est complete
-            if int(inscription["complet"]):
-                # Obtenir la liste des noms sur la liste d'attente
-                query = QSqlQuery(self.DATABASE)
-                query.prepare("SELECT participante.id_participante "
-                            "FROM inscription "
-                            "LEFT JOIN participante ON participante.id_participante = inscription.id_participante "
-                            "WHERE (inscription.status = 1) AND (inscription.id_activite = :id_activite) "
-                            "ORDER BY inscription.time")
-                query.bindValue(':id_activite', inscription["id_activite"])
-                query.exec_()
-
-                # Affiche un message en cas d'erreur dans la requete
-                if database_error.sql_error_handler(query.lastError()):
-                    return  # Empeche de continuer la fonction avec des donnees incompletes
-
-                # Liste d'attente
-                liste_attente = []
-                while query.next():
-                    liste_attente.append(query.value(0))
-
-                # Obtenir le nombre maximal de participante
-                query = QSqlQuery(self.DATABASE)
-                query.prepare("SELECT categorie_activite.participante_maximum "
-                              "FROM activite "
-                              "LEFT JOIN categorie_activite ON categorie_activite.id_categorie_activite = "
-                              "activite.id_categorie_activite "
-                              "WHERE activite.id_activite = :id_activite")
-                query.bindValue(':id_activite', inscription["id_activite"])
-                query.exec_()
-
-                # Affiche un message en cas d'erreur dans la requete
-                if database_error.sql_error_handler(query.lastError()):
-                    return  # Empeche de continuer la fonction avec des donnees incompletes
-
-                # Preparation des donnees
-                query.first()
-                maximum = int(query.value(0))
-
-                index = liste_attente.index(self.ID_PARTICIPANTE)
-
-                # Si la personne est encore sur la liste d'attente
-                if index > maximum-1:
-                    continue
+            # Si la personne est encore sur la liste d'attente
+            rang = rangs.get(int(inscription["id_activite"]))
+            if rang is None or not rang.confirme:
+                continue
 
             # Afficher les informations dans le tableau
             self.tbl_inscription.insertRow(self.tbl_inscription.rowCount())
@@ -508,25 +425,14 @@ class Facturation(Facture, Ui_Facturation):
         row = self.tbl_activite.currentRow()
 
         # Vérifier si l'activité à deja ete facturée
-        query = QSqlQuery()
-        query.prepare("SELECT COUNT(id_inscription) "
-                      "FROM inscription "
-                      "WHERE "
-                        "(status = :status) AND "
-                        "(id_activite = :id_activite) AND "
-                        "(id_participante = :id_participante)")
-        query.bindValue(':status', STATUS_FACTURE)
-        query.bindValue(':id_activite', self.tbl_activite.item(row, 0).text())
-        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-        query.exec_()
+        moteur = service.MoteurFacturation(self.DATABASE)
+        count = moteur.facturee(self.ID_PARTICIPANTE, self.tbl_activite.item(row, 0).text())
 
         # Affiche un message en cas d'erreur dans la requete
-        if database_error.sql_error_handler(query.lastError()):
+        if count is None:
+            database_error.sql_error_handler(moteur.lastError())
             return  # Empeche de continuer la fonction avec des donnees incompletes
 
-        query.first()
-        count = int(query.value(0))
-
         # Valeur de la quantité
         if self.sender() == self.btn_ajouter_activite:
             quantite = "1"
@@ -627,199 +533,51 @@ class Facturation(Facture, Ui_Facturation):
 
     def process(self):
         """Traitement des donnees pour la base de données"""
-        # Commencer une transaction
-        self.DATABASE.transaction()
-
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(self.DATABASE.lastError()):
-            return  # Empêche la fermeture du dialog
-
-        # Ajouter une facture
-        query = QSqlQuery()
-        query.prepare("INSERT INTO facture "
-                        "(numero_recu, id_participante, total) "
-                      "VALUES "
-                        "(:numero_recu, :id_participante, :total)")
-        query.bindValue(':numero_recu', data_processing.check_string(self.txt_recu.text()))
-        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-        query.bindValue(':total', float(self.txt_total.text()[:-1]))
-        query.exec_()
-
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(query.lastError()):
-            self.DATABASE.rollback()  # Annuler la transaction
-            return  # Empêche la fermeture du dialog
-
-        # Obtenir le numero de de la facture
-        query = QSqlQuery(self.DATABASE)
-        query.exec("SELECT last_insert_rowid()")
-
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(query.lastError()):
-            self.DATABASE.rollback()  # Annuler la transaction
-            return  # Empêche la fermeture du dialog
-
-        query.first()
-        id_facture = int(query.value(0))
-
-        # Ajouter les articles à la facture
+        # Obtenir les articles de la facture
+        articles = []
         for row in range(self.tbl_article.rowCount()):
-            # Prix de l'article
-            if self.tbl_article.item(row, 5) == "1":
-                prix = float(self.tbl_article.item(row, 2))
-            else:
-                prix = float("-" + str(self.tbl_article.item(row, 2).text()[:-1]))
-            query = QSqlQuery(self.DATABASE)
-            query.prepare("INSERT INTO article "
-                          "(id_facture, id_activite, prix, description) "
-                          "VALUES "
-                          "(:id_facture, :id_activite, :prix, :description)")
-            query.bindValue(':id_facture', id_facture)
-            query.bindValue(':prix', prix)
-            print(str(self.tbl_article.item(row, 1).text()))
-            query.bindValue(':id_activite', str(self.tbl_article.item(row, 0).text()))
-            description = str(self.tbl_article.item(row, 1).text()) + " (" + \
-                          str(self.tbl_article.item(row, 3).text()) + ")"
-            query.bindValue(':description', description)
-            query.exec_()
-
+            articles.append(service.creer_article(self.tbl_article.item(row, 0).text(),
+                                                  self.tbl_article.item(row, 1).text(),
+                                                  self.tbl_article.item(row, 3).text(),
+                                                  self.tbl_article.item(row, 2).text()[:-1],
+                                                  self.tbl_article.item(row, 5).text() != "1"))
+
+        # Le total est calculé à partir des articles
+        facture = service.creer_facture(self.ID_PARTICIPANTE,
+                                        data_processing.check_string(self.txt_recu.text()),
+                                        articles,
+                                        self.NUMERO_FACTURE)
+
+        # Enregistrer la facture, les articles et les inscriptions
+        moteur = service.MoteurFacturation(self.DATABASE)
+        id_facture = moteur.enregistrer(facture, self.SEQUENCE)
+        if id_facture is None:
             # Affichage d'un message d'erreur si la requete echoue
-            if database_error.sql_error_handler(query.lastError()):
-                self.DATABASE.rollback()  # Annuler la transaction
-                return  # Empêche la fermeture du dialog
-
-        # Gestion des inscriptions
-        for row in range(self.tbl_article.rowCount()):
-            if self.tbl_article.item(row, 5).text() == "1":
-                # Ajouter les inscriptions
-
-                # Essayer d'ajouter une nouvelle inscription
-                query = QSqlQuery()
-                query.prepare("INSERT INTO inscription "
-                                "(id_inscription, id_participante, id_activite, status) "
-                            "VALUES "
-                                "((SELECT id_inscription "
-                                "FROM inscription "
-                                "WHERE (id_participante = :id_participante) "
-                                "AND (id_activite = :id_activite)), "
-                                ":id_participante, :id_activite, :status)")
-                query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                query.bindValue(':id_activite', self.tbl_article.item(row, 0).text())
-                query.bindValue(':status', STATUS_FACTURE)
-                query.exec_()
-
-                # Vérifier s'il y a violation de la contraint de la primary key
-                if query.lastError().nativeErrorCode() == str(database_error.SQLITE_CONSTRAINT):
-                    # Vérifier si une transaction a deja ete annulee
-                    query = QSqlQuery(self.DATABASE)
-                    query.prepare("SELECT status "
-                                  "FROM inscription "
-                                  "WHERE (id_participante = :id_participante) AND (id_activite = :id_activite)")
-                    query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                    query.bindValue(':id_activite', self.tbl_article.item(row, 0).text())
-                    query.exec_()
-
-                    # Affichage d'un message d'erreur si la requete echoue
-                    if database_error.sql_error_handler(query.lastError()):
-                        self.DATABASE.rollback()  # Annuler la transaction
-                        return  # Empêche la fermeture du dialog
-
-                    # Obtenir le status
-                    query.first()
-                    status = int(query.value(0))
-
-                    if status == 1:
-                        # Ajouter les inscriptions
-                        query = QSqlQuery(self.DATABASE)
-                        query.prepare("UPDATE inscription "
-                                      "SET "
-                                        "status = :status "
-                                      "WHERE "
-                                        "id_inscription = (SELECT id_inscription "
-                                        "FROM inscription "
-                                        "WHERE (id_participante = :id_participante) "
-                                        "AND (id_activite = :id_activite))")
-                        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                        query.bindValue(':id_activite', self.tbl_article.item(row, 0).text())
-                        query.bindValue(':status', STATUS_FACTURE)
-                        query.exec_()
-
-                        # Affichage d'un message d'erreur si la requete echoue
-                        if database_error.sql_error_handler(query.lastError()):
-                            self.DATABASE.rollback()  # Annuler la transaction
-                            return  # Empêche la fermeture du dialog
-                    else:
-                        query = QSqlQuery()
-                        query.prepare("INSERT OR IGNORE INTO inscription "
-                                        "(id_inscription, id_participante, id_activite, status) "
-                                    "VALUES "
-                                        "((SELECT id_inscription "
-                                        "FROM inscription "
-                                        "WHERE (id_participante = :id_participante) "
-                                        "AND (id_activite = :id_activite)), "
-                                        ":id_participante, :id_activite, :status)")
-                        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                        query.bindValue(':id_activite', self.tbl_article.item(row, 0).text())
-                        query.bindValue(':status', STATUS_FACTURE)
-                        query.exec_()
-
-                        # Affichage d'un message d'erreur si la requete echoue
-                        if database_error.sql_error_handler(query.lastError()):
-                            self.DATABASE.rollback()  # Annuler la transaction
-                            return  # Empêche la fermeture du dialog
-                # Affichage d'un message d'erreur
-                else:
-                    if database_error.sql_error_handler(query.lastError()):
-                        self.DATABASE.rollback()  # Annuler la transaction
-                        return  # Empêche la fermeture du dialog
-
-            # Effacer une inscription
-            else:
-                # La date d'insertion est remise à zéro lorsque l'inscription est effacee
-                query = QSqlQuery()
-                query.prepare("INSERT OR REPLACE INTO inscription "
-                                "(id_inscription, id_participante, id_activite, status) "
-                              "VALUES "
-                                "((SELECT id_inscription "
-                                  "FROM inscription "
-                                  "WHERE (id_participante = :id_participante) "
-                                  "AND (id_activite = :id_activite)), "
-                                ":id_participante, :id_activite, :status)")
-                query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                query.bindValue(':id_activite', self.tbl_article.item(row, 0).text())
-                query.bindValue(':status', STATUS_REMBOURSE)
-                query.exec_()
-
-                # Affichage d'un message d'erreur si la requete echoue
-                if database_error.sql_error_handler(query.lastError()):
-                    self.DATABASE.rollback()  # Annuler la transaction
-                    return  # Empêche la fermeture du dialog
-
-        # Terminer la transaction
-        self.DATABASE.commit()
-
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(self.DATABASE.lastError()):
-            self.DATABASE.rollback()  # Annuler la transaction
+            database_error.sql_error_handler(moteur.lastError())
             return  # Empêche la fermeture du dialog
 
+        # Afficher le reçu
+        if self.chk_recu.isChecked():
+            document.Recu(facture, id_facture, self.txt_nom.text(),
+                          QDate.currentDate().toString('dd MMMM yyyy')).afficher()
+
         self.accept()
 
     def get_numero_facture(self):
         """Recuperer le numero de la facture"""
-        query = QSqlQuery()
-        query.exec_("SELECT MAX(id_facture) FROM facture")
+        # Le numéro est réservé pour ce poste de travail et consommé lorsque la facture est enregistrée
+        self.SEQUENCE = sequence.Sequence(self.DATABASE, sequence.SEQUENCE_FACTURE)
+        self.NUMERO_FACTURE = self.SEQUENCE.prochain()
 
         # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
-        query.first()
+        if self.NUMERO_FACTURE is None:
+            database_error.sql_error_handler(self.SEQUENCE.lastError())
+            self.txt_facture.setText("")
 
-        # S'il existe deja des facture dans la base de donnees
-        if query.value(0) != "":
-            self.txt_facture.setText(str(query.value(0)+1))
-        # S'il s'agit de la première facture
+            # Empêcher l'enregistrement d'une facture sans numéro
+            self.btn_enregistrer.setEnabled(False)
         else:
-            self.txt_facture.setText("1")
+            self.txt_facture.setText(str(self.NUMERO_FACTURE))
 
 
 class Inscription(Facture, Ui_Inscription):
@@ -932,127 +690,25 @@ class Inscription(Facture, Ui_Inscription):
 
     def process(self):
         """Traitement des donnees pour la base de données"""
-        # Commencer une transaction
-        self.DATABASE.transaction()
-
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(self.DATABASE.lastError()):
-            return  # Empêche la fermeture du dialog
-
+        inscriptions = list()
+        annulations = list()
         for row in range(self.tbl_panier.rowCount()):
+            id_activite = int(self.tbl_panier.item(row, 0).text())
+
             # Ajouter une inscription
             if int(self.tbl_panier.item(row, 1).text()) == 1:
-                # Essayer d'ajouter une nouvelle inscription
-                query = QSqlQuery()
-                query.prepare("INSERT INTO inscription "
-                                "(id_inscription, id_participante, id_activite, status) "
-                              "VALUES "
-                                "((SELECT id_inscription "
-                                "FROM inscription "
-                                "WHERE (id_participante = :id_participante) "
-                                "AND (id_activite = :id_activite)), "
-                                ":id_participante, :id_activite, :status)")
-                query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                query.bindValue(':id_activite', self.tbl_panier.item(row, 0).text())
-                query.bindValue(':status', STATUS_INSCRIPTION)
-                query.exec_()
-
-                # Vérifier s'il y a violation de la contraint de la primary key
-                if query.lastError().nativeErrorCode() == str(database_error.SQLITE_CONSTRAINT):
-                    # Vérifier si une transaction a deja ete annulee
-                    query = QSqlQuery(self.DATABASE)
-                    query.prepare("SELECT status "
-                                  "FROM inscription "
-                                  "WHERE (id_participante = :id_participante) AND (id_activite = :id_activite)")
-                    query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                    query.bindValue(':id_activite', self.tbl_panier.item(row, 0).text())
-                    query.exec_()
-
-                    # Affichage d'un message d'erreur si la requete echoue
-                    if database_error.sql_error_handler(query.lastError()):
-                        self.DATABASE.rollback() # Annuler la transaction
-                        return # Empêche la fermeture du dialog
-
-                    # Obtenir le status
-                    query.first()
-                    status = int(query.value(0))
-
-                    if status == 1:
-                        # Ajouter les inscriptions
-                        query = QSqlQuery(self.DATABASE)
-                        query.prepare("UPDATE inscription "
-                                      "SET "
-                                        "status = :status, "
-                                        "id_facture = :id_facture "
-                                      "WHERE "
-                                        "id_inscription = (SELECT id_inscription "
-                                        "FROM inscription "
-                                        "WHERE (id_participante = :id_participante) "
-                                        "AND (id_activite = :id_activite))")
-                        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                        query.bindValue(':id_activite', self.tbl_panier.item(row, 0).text())
-                        query.bindValue(':status', STATUS_INSCRIPTION)
-                        query.exec_()
-
-                        # Affichage d'un message d'erreur si la requete echoue
-                        if database_error.sql_error_handler(query.lastError()):
-                            self.DATABASE.rollback() # Annuler la transaction
-                            return # Empêche la fermeture du dialog
-                    else:
-                        query = QSqlQuery()
-                        query.prepare("INSERT OR REPLACE INTO inscription "
-                                        "(id_inscription, id_participante, id_activite, status) "
-                                     "VALUES "
-                                        "((SELECT id_inscription "
-                                        "FROM inscription "
-                                        "WHERE (id_participante = :id_participante) "
-                                        "AND (id_activite = :id_activite)), "
-                                        ":id_participante, :id_activite, :status)")
-                        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                        query.bindValue(':id_activite', self.tbl_panier.item(row, 0).text())
-                        query.bindValue(':status', STATUS_INSCRIPTION)
-                        query.exec_()
-
-                        # Affichage d'un message d'erreur si la requete echoue
-                        if database_error.sql_error_handler(query.lastError()):
-                            self.DATABASE.rollback() # Annuler la transaction
-                            return # Empêche la fermeture du dialog
-
-                # Affichage d'un message d'erreur
-                else:
-                    if database_error.sql_error_handler(query.lastError()):
-                        self.DATABASE.rollback() # Annuler la transaction
-                        return # Empêche la fermeture du dialog
+                inscriptions.append(id_activite)
 
             # Effacer une inscription
             elif int(self.tbl_panier.item(row, 1).text()) == -1:
-                # La date d'insertion est remise à zéro lorsque l'inscription est effacee
-                query = QSqlQuery()
-                query.prepare("INSERT OR REPLACE INTO inscription "
-                                "(id_inscription, id_participante, id_activite, status) "
-                              "VALUES "
-                                "((SELECT id_inscription "
-                                  "FROM inscription "
-                                  "WHERE (id_participante = :id_participante) "
-                                  "AND (id_activite = :id_activite)), "
-                                ":id_participante, :id_activite, :status)")
-                query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-                query.bindValue(':id_activite', self.tbl_panier.item(row, 0).text())
-                query.bindValue(':status', STATUS_INSCRIPTION_ANNULEE)
-                query.exec_()
-
-                #Affichage d'un message d'erreur si la requete echoue
-                if database_error.sql_error_handler(query.lastError()):
-                    self.DATABASE.rollback() # Annuler la transaction
-                    return # Empêche la fermeture du dialog
-
-        # Terminer la transaction
-        self.DATABASE.commit()
+                annulations.append(id_activite)
 
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(self.DATABASE.lastError()):
-            self.DATABASE.rollback() # Annuler la transaction
-            return # Empêche la fermeture du dialog
+        # Enregistrer toutes les inscriptions dans une seule transaction
+        moteur = service.MoteurInscription(self.DATABASE)
+        if not moteur.enregistrer(self.ID_PARTICIPANTE, inscriptions, annulations):
+            # Affichage d'un message d'erreur si la requete echoue
+            database_error.sql_error_handler(moteur.lastError())
+            return  # Empêche la fermeture du dialog
 
         self.accept()
 
@@ -25,6 +25,7 @@ from PyQt5.QtSql import QSqlQuery
 # Project import
 from guide.script.database import database_error
 from guide.script.data import data_error
+from guide.script.database.schema import COLONNES_GROUPE
 
 # Interface import
 from guide.interface.ui_groupe import Ui_Groupe
@@ -53,64 +54,62 @@ class Groupe(QDialog, Ui_Groupe):
     def process(self):
         """
         Ajout du groupe dans la base de donnees
+
+        Le groupe existant de l'activité est modifié et un nouveau groupe est ajouté seulement si l'activité n'en a
+        pas. INSERT OR REPLACE n'est pas utilisé puisque le remplacement d'une ligne ne déclenche pas les triggers de
+        suppression qui maintiennent la table sommaire_groupe.
         """
         activite_row = self.tbl_activite.currentRow()
         if activite_row != -1:
+            id_activite = int(self.tbl_activite.item(activite_row, 0).text())
+
+            # Commencer une transaction
+            self.DATABASE.transaction()
+
             query = QSqlQuery(self.DATABASE)
-            query.prepare("INSERT OR REPLACE INTO groupe "
-                            "(id_groupe, "
-                            "id_activite, "
-                            "f_0_4, "
-                            "f_5_11, "
-                            "f_12_17, "
-                            "f_18_34, "
-                            "f_35_64, "
-                            "f_65, "
-                            "h_0_4, "
-                            "h_5_11, "
-                            "h_12_17, "
-                            "h_18_34, "
-                            "h_35_64, "
-                            "h_65) "
-                          "VALUES "
-                            "((SELECT id_groupe "
-                              "FROM groupe "
-                              "WHERE id_activite = "
-                              ":id_activite), "
-                            ":id_activite, "
-                            ":f_0_4, "
-                            ":f_5_11, "
-                            ":f_12_17, "
-                            ":f_18_34, "
-                            ":f_35_64, "
-                            ":f_65, "
-                            ":h_0_4, "
-                            ":h_5_11, "
-                            ":h_12_17, "
-                            ":h_18_34, "
-                            ":h_35_64, "
-                            ":h_65) ")
-            query.bindValue(':id_activite', self.tbl_activite.item(activite_row, 0).text())
-            query.bindValue(':f_0_4', self.sbx_f_0_4.value())
-            query.bindValue(':f_5_11', self.sbx_f_5_11.value())
-            query.bindValue(':f_12_17', self.sbx_f_12_17.value())
-            query.bindValue(':f_18_34', self.sbx_f_18_34.value())
-            query.bindValue(':f_35_64', self.sbx_f_35_64.value())
-            query.bindValue(':f_65', self.sbx_f_65.value())
-            query.bindValue(':h_0_4', self.sbx_h_0_4.value())
-            query.bindValue(':h_5_11', self.sbx_h_5_11.value())
-            query.bindValue(':h_12_17', self.sbx_h_12_17.value())
-            query.bindValue(':h_18_34', self.sbx_h_18_34.value())
-            query.bindValue(':h_35_64', self.sbx_h_35_64.value())
-            query.bindValue(':h_65', self.sbx_h_65.value())
+            query.prepare("UPDATE groupe "
+                          "SET " + ", ".join("{0} = :{0}".format(colonne) for colonne in COLONNES_GROUPE) + " "
+                          "WHERE id_activite = :id_activite")
+            self.lier_valeurs(query, id_activite)
             query.exec_()
 
             # Affichage d'un message d'erreur si la requete echoue
-            if not database_error.sql_error_handler(query.lastError()):
-                self.accept() # Fermer le dialog seulement si la requete reussie
+            if database_error.sql_error_handler(query.lastError()):
+                self.DATABASE.rollback()  # Annuler la transaction
+                return
+
+            # Ajouter le groupe si l'activité n'en a pas
+            if query.numRowsAffected() == 0:
+                query = QSqlQuery(self.DATABASE)
+                query.prepare("INSERT INTO groupe "
+                                "(id_activite, " + ", ".join(COLONNES_GROUPE) + ") "
+                              "VALUES "
+                                "(:id_activite, " + ", ".join(":" + colonne for colonne in COLONNES_GROUPE) + ")")
+                self.lier_valeurs(query, id_activite)
+                query.exec_()
+
+                # Affichage d'un message d'erreur si la requete echoue
+                if database_error.sql_error_handler(query.lastError()):
+                    self.DATABASE.rollback()  # Annuler la transaction
+                    return
+
+            # Terminer la transaction
+            self.DATABASE.commit()
+            self.accept()  # Fermer le dialog seulement si la requete reussie
         else:
             data_error.aucun_article_selectionne()
 
+    def lier_valeurs(self, query, id_activite):
+        """
+        Lier l'activité et le nombre de personnes de chaque tranche d'âge à une requête
+
+        :param query: Requête préparée
+        :param id_activite: Identifiant de l'activité
+        """
+        query.bindValue(':id_activite', id_activite)
+        for colonne in COLONNES_GROUPE:
+            query.bindValue(':' + colonne, getattr(self, 'sbx_' + colonne).value())
+
     def afficher_liste_activite(self):
         """
         Afficher la liste des activite
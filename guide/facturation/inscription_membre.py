@@ -15,6 +15,8 @@
 
 """Inscription et renouvellement des membres"""
 
+# Python import
+from datetime import date
 
 # PyQt import
 from PyQt5.QtWidgets import QTableWidgetItem, QMessageBox, QDialog
@@ -24,9 +26,13 @@ from PyQt5.QtSql import QSqlQuery, QSqlDatabase
 # Project import
 from guide.script.database import database_error
 from guide.script.database import data_processing
+from guide.script.database import sequence
+from guide.script.database import annuaire
+from guide.facturation import renouvellement
 
 # Interface import
 from guide.interface.ui_inscription_membre import Ui_InscriptionMembre
+from guide.interface.ui_renouvellement import Ui_Renouvellement
 
 
 class InscriptionMembre(QDialog, Ui_InscriptionMembre):
@@ -115,19 +121,10 @@ class InscriptionMembre(QDialog, Ui_InscriptionMembre):
         Ajouter le renouvellement du status à la liste d'article
         """
         # Article
-        self.tbl_commande.setItem(0, 0, QTableWidgetItem())
-        month = QDate.currentDate().month()
-        year = QDate().currentDate().year()
-        year = year
-        if month > 9:
-            year = year + 2
-        else:
-            year = year + 1
-        article = "Renouvellement membre " + str(year)
+        article, prix = renouvellement.article(date.today())
         self.tbl_commande.setItem(0, 0, QTableWidgetItem(article))
 
         # Prix
-        prix = 5.00
         item = QTableWidgetItem('%.2f' % prix)
         item.setTextAlignment(Qt.AlignVCenter | Qt.AlignLeft)
         self.tbl_commande.setItem(0, 1, item)
@@ -161,20 +158,17 @@ class NouvelleInscription(InscriptionMembre):
         """
         Recuperer le numero du nouveau membre
         """
-        query = QSqlQuery()
-        query.exec_("SELECT MAX(numero_membre) FROM membre")
+        # Le numéro est réservé pour ce poste de travail et consommé lorsque le membre est enregistré
+        self.SEQUENCE = sequence.Sequence(self.DATABASE, sequence.SEQUENCE_MEMBRE)
+        numero_membre = self.SEQUENCE.prochain()
 
         # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
+        if numero_membre is None:
+            database_error.sql_error_handler(self.SEQUENCE.lastError())
+            self.btn_inscription.setEnabled(False)
+            return
 
-        query.first()
-
-        # S'il existe deja des membres dans la base de donnees
-        if query.value(0) != "":
-            self.txt_numero_membre.setText(str(query.value(0)+1))
-        # Si le membre est le premier
-        else:
-            self.txt_numero_membre.setText("1")
+        self.txt_numero_membre.setText(str(numero_membre))
 
     def inscription(self):
         """
@@ -225,6 +219,12 @@ class NouvelleInscription(InscriptionMembre):
             QSqlDatabase(self.DATABASE).rollback() # Annuler la transaction
             return # Empecher la fermeture du dialog
 
+        # Consommer le numéro de membre
+        if not self.SEQUENCE.consommer(int(self.txt_numero_membre.text())):
+            database_error.sql_error_handler(self.SEQUENCE.lastError())
+            QSqlDatabase(self.DATABASE).rollback() # Annuler la transaction
+            return # Empecher la fermeture du dialog
+
         # Ouvre une facture
         query = QSqlQuery(self.DATABASE)
         query.prepare("INSERT INTO facture "
@@ -267,6 +267,9 @@ class NouvelleInscription(InscriptionMembre):
 
         #Termine la transation
         QSqlDatabase(self.DATABASE).commit()
+
+        # Le status de membre de la participante a changé
+        annuaire.invalider()
         self.accept()
 
 
@@ -313,70 +316,125 @@ class RenouvelerInscription(InscriptionMembre):
         """
         Enregistre le status de membre lorsque l'inscription est completee
         """
-        # Ouvre une transation
-        QSqlDatabase(self.DATABASE).transaction()
-        # Active le membre
-        query = QSqlQuery(self.DATABASE)
-        query.prepare("UPDATE membre "
-                      "SET membre_honoraire = :honoraire, date_renouvellement = :renouvellement "
-                      "WHERE id_participante = :id_participante")
+        moteur = renouvellement.MoteurRenouvellement(self.DATABASE)
 
-        # Determiner si le membre est honoraire
-        if self.chk_honoraire.isChecked():
-            query.bindValue(':honoraire', True)
+        # Membre de la participante
+        liste_membre = moteur.membres([self.ID_PARTICIPANTE])
+        if liste_membre is None:
+            database_error.sql_error_handler(moteur.lastError())
+            return # Empecher la fermeture du dialog
 
-            # Aucune date de renouvellement
-            query.bindValue(':renouvellement', 0)
-        # Si le membre n'est pas honoraire
-        else:
-            query.bindValue(':honoraire', False)
+        resultat = moteur.renouveler(liste_membre,
+                                     honoraire=self.chk_honoraire.isChecked(),
+                                     numero_recu=data_processing.check_string(self.txt_recu.text()))
 
-            # Determiner la date de renouvellement
-            month = QDate.currentDate().month()
-            year = QDate().currentDate().year()
-            if month > 9:
-                year = year + 2
-            else:
-                year = year + 1
-            date = QDate(year, 9, 1).toString('yyyy-MM-dd')
-            query.bindValue(':renouvellement', date)
+        # Affichage d'un message d'erreur si l'enregistrement echoue
+        if resultat is None:
+            database_error.sql_error_handler(moteur.lastError())
+            return # Empecher la fermeture du dialog
 
-        query.bindValue(':id_participante', int(self.ID_PARTICIPANTE))
+        self.accept()
 
-        query.exec_()
 
-        # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(query.lastError()):
-            QSqlDatabase(self.DATABASE).rollback() # Annuler la transaction
-            return # Empecher la fermeture du dialog
+class RenouvellementMembres(QDialog, Ui_Renouvellement):
+    """Dialog pour le renouvellement de tous les membres dont l'adhésion se termine avant une date"""
+    def __init__(self, database):
+        super(RenouvellementMembres, self).__init__()
+        self.setupUi(self)
 
-        # Enregistre la commande
-        query = QSqlQuery(self.DATABASE)
-        query.prepare("INSERT INTO inscription_membre "
-                        "(id_membre, "
-                        "date, "
-                        "article, "
-                        "prix, "
-                        "numero_recu) "
-                      "VALUES "
-                        "((SELECT id_membre "
-                          "FROM membre "
-                          "WHERE id_participante = :id_participante), "
-                        "(SELECT date('now')), "
-                        ":article, "
-                        ":prix, "
-                        ":numero_recu)")
-        query.bindValue(':id_participante', self.ID_PARTICIPANTE)
-        query.bindValue(':article', self.tbl_commande.item(0, 0).text())
-        query.bindValue(':prix', self.tbl_commande.item(0, 1).text())
-        query.bindValue(':numero_recu', data_processing.check_string(self.txt_recu.text()))
-        query.exec_()
+        # Instance variable definition
+        self.DATABASE = database
+        self.MOTEUR = renouvellement.MoteurRenouvellement(database)
+        self.LISTE_MEMBRE = list()
+
+        # Affichage de l'interface
+        self.tbl_membre.setColumnCount(2)
+        self.tbl_membre.setHorizontalHeaderLabels(["Nom", "Renouvellement"])
+        self.tbl_membre.horizontalHeader().setStretchLastSection(True)
+        self.tbl_membre.verticalHeader().hide()
+        self.ded_echeance.setDate(QDate(date.today().year, renouvellement.MOIS_RENOUVELLEMENT, 1))
+
+        # Slots
+        self.btn_annuler.clicked.connect(self.reject)
+        self.btn_renouveler.clicked.connect(self.renouveler)
+        self.ded_echeance.dateChanged.connect(self.afficher_membres)
+
+        self.afficher_membres()
+
+    def afficher_membres(self):
+        """
+        Afficher les membres dont l'adhésion se termine avant l'échéance
+        """
+        self.LISTE_MEMBRE = self.MOTEUR.membres(echeance=self.ded_echeance.date().toPyDate())
 
         # Affichage d'un message d'erreur si la requete echoue
-        if database_error.sql_error_handler(query.lastError()):
-            QSqlDatabase(self.DATABASE).rollback() # Annuler la transaction
-            return # Empecher la fermeture du dialog
-        #Termine la transation
-        QSqlDatabase(self.DATABASE).commit()
+        if self.LISTE_MEMBRE is None:
+            database_error.sql_error_handler(self.MOTEUR.lastError())
+            self.LISTE_MEMBRE = list()
+
+        self.tbl_membre.setRowCount(0)
+        self.tbl_membre.setRowCount(len(self.LISTE_MEMBRE))
+        for ligne, membre in enumerate(self.LISTE_MEMBRE):
+            self.tbl_membre.setItem(ligne, 0, QTableWidgetItem(membre.nom))
+            self.tbl_membre.setItem(ligne, 1, QTableWidgetItem(str(membre.date_renouvellement)))
+
+        # Le résultat est calculé sans écrire dans la base de données
+        self.afficher_resultat(self.MOTEUR.renouveler(self.LISTE_MEMBRE, simulation=True))
+        self.pbr_renouvellement.setValue(0)
+        self.btn_renouveler.setEnabled(bool(self.LISTE_MEMBRE))
+
+    def afficher_resultat(self, resultat):
+        """
+        Afficher l'article et le total d'un renouvellement
+        :param resultat: Resultat
+        """
+        self.txt_article.setText(resultat.article)
+        self.txt_total.setText('%.2f' % resultat.total)
 
-        self.accept()
+    def afficher_progression(self, fait, total):
+        """
+        Afficher la progression du renouvellement
+
+        Seule la barre de progression est redessinée. Les événements ne sont pas traités pendant le renouvellement,
+        dont la transaction est ouverte : un clic ne peut pas relancer le renouvellement, changer la liste des membres
+        ou fermer le dialog avant la fin de la transaction.
+
+        :param fait: Nombre de membres renouvelés
+        :param total: Nombre de membres à renouveler
+        """
+        self.pbr_renouvellement.setMaximum(total)
+        self.pbr_renouvellement.setValue(fait)
+        self.pbr_renouvellement.repaint()
+
+    def renouveler(self):
+        """
+        Renouveler les membres affichés
+        """
+        simulation = self.chk_simulation.isChecked()
+        resultat = self.MOTEUR.renouveler(self.LISTE_MEMBRE,
+                                          numero_recu=data_processing.check_string(self.txt_recu.text()),
+                                          simulation=simulation,
+                                          progression=self.afficher_progression)
+
+        # Affichage d'un message d'erreur si l'enregistrement echoue
+        if resultat is None:
+            database_error.sql_error_handler(self.MOTEUR.lastError())
+            return
+
+        self.afficher_resultat(resultat)
+
+        if simulation:
+            texte = "{} membres seraient renouvelés jusqu'au {}.".format(resultat.nombre, resultat.date_renouvellement)
+        else:
+            texte = "{} membres ont été renouvelés jusqu'au {}.".format(resultat.nombre, resultat.date_renouvellement)
+
+        msgbox = QMessageBox()
+        msgbox.setWindowTitle("Renouvellement des membres")
+        msgbox.setText("Renouvellement des membres")
+        msgbox.setInformativeText(texte)
+        msgbox.setIcon(QMessageBox.Information)
+        msgbox.setStandardButtons(QMessageBox.Ok)
+        msgbox.exec()
+
+        if not simulation:
+            self.accept()
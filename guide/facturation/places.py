@@ -0,0 +1,147 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Places disponibles et liste d'attente des activités
+
+Le nombre d'inscriptions (status 1) de chaque activité est conservé dans la table compteur_activite et maintenu par des
+triggers sur la table inscription. Les inscriptions au-delà du nombre maximal de participantes forment la liste
+d'attente, dans l'ordre de leur date d'inscription.
+
+Methodes :
+    places : Obtenir le nombre de places et la longueur de la liste d'attente d'une activité
+    rangs : Obtenir le rang de toutes les inscriptions d'une participante
+    premiere_attente : Obtenir le nom de la première participante de la liste d'attente
+"""
+
+# Python import
+from collections import namedtuple
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database import database_error
+
+# Jointure et colonne du nombre d'inscriptions pour les requêtes sur la table activite
+JOINTURE_COMPTEUR = "LEFT JOIN compteur_activite ON compteur_activite.id_activite = activite.id_activite "
+NOMBRE_INSCRIPTION = "ifnull(compteur_activite.inscription, 0)"
+
+# Places d'une activité
+Places = namedtuple('Places', ['maximum', 'inscription', 'disponible', 'attente'])
+
+# Rang d'une inscription
+# Le rang commence à 1. La position sur la liste d'attente est 0 lorsque l'inscription est confirmée.
+Rang = namedtuple('Rang', ['rang', 'confirme', 'attente'])
+
+
+def places(database, id_activite):
+    """
+    Obtenir le nombre de places et la longueur de la liste d'attente d'une activité
+
+    :param database: Base de données
+    :param id_activite: Identifiant de l'activité
+    :return: Places ou None si l'activité n'existe pas
+    """
+    query = QSqlQuery(database)
+    query.prepare("SELECT categorie_activite.participante_maximum, " + NOMBRE_INSCRIPTION + " "
+                  "FROM activite "
+                  "INNER JOIN categorie_activite "
+                    "ON categorie_activite.id_categorie_activite = activite.id_categorie_activite " +
+                  JOINTURE_COMPTEUR +
+                  "WHERE activite.id_activite = :id_activite")
+    query.bindValue(':id_activite', id_activite)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()) or not query.first():
+        return None
+
+    maximum = int(query.value(0))
+    inscription = int(query.value(1))
+    return Places(maximum, inscription, max(maximum - inscription, 0), max(inscription - maximum, 0))
+
+
+def rangs(database, id_participante):
+    """
+    Obtenir le rang de toutes les inscriptions d'une participante
+
+    Le rang de chaque inscription est calculé avec ROW_NUMBER() dans une seule requête. Les fonctions de fenêtrage
+    nécessitent SQLite 3.25 ou plus récent.
+
+    :param database: Base de données
+    :param id_participante: Identifiant de la participante
+    :return: Dictionnaire {Identifiant de l'activité: Rang} ou None si la requête échoue
+    """
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare("WITH rang_inscription AS ("
+                    "SELECT "
+                      "inscription.id_participante, "
+                      "inscription.id_activite, "
+                      "ROW_NUMBER() OVER (PARTITION BY inscription.id_activite "
+                                         "ORDER BY inscription.time, inscription.id_inscription) AS rang "
+                    "FROM inscription "
+                    "WHERE (inscription.status = 1) AND inscription.id_activite IN "
+                      "(SELECT id_activite FROM inscription "
+                       "WHERE (id_participante = :id_participante) AND (status = 1))"
+                  ") "
+                  "SELECT rang_inscription.id_activite, rang_inscription.rang, "
+                    "categorie_activite.participante_maximum "
+                  "FROM rang_inscription "
+                  "INNER JOIN activite ON activite.id_activite = rang_inscription.id_activite "
+                  "INNER JOIN categorie_activite "
+                    "ON categorie_activite.id_categorie_activite = activite.id_categorie_activite "
+                  "WHERE rang_inscription.id_participante = :participante")
+    query.bindValue(':id_participante', id_participante)
+    query.bindValue(':participante', id_participante)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    resultat = dict()
+    while query.next():
+        rang = int(query.value(1))
+        maximum = int(query.value(2))
+        resultat[int(query.value(0))] = Rang(rang, rang <= maximum, max(rang - maximum, 0))
+    return resultat
+
+
+def premiere_attente(database, id_activite, maximum):
+    """
+    Obtenir le nom de la première participante de la liste d'attente
+
+    :param database: Base de données
+    :param id_activite: Identifiant de l'activité
+    :param maximum: Nombre maximal de participantes de l'activité
+    :return: Prénom et nom de la participante ou None si la liste d'attente est vide
+    """
+    query = QSqlQuery(database)
+    query.prepare("SELECT participante.prenom, participante.nom "
+                  "FROM inscription "
+                  "LEFT JOIN participante ON participante.id_participante = inscription.id_participante "
+                  "WHERE (inscription.status = 1) AND (inscription.id_activite = :id_activite) "
+                  "ORDER BY inscription.time, inscription.id_inscription "
+                  "LIMIT 1 OFFSET :maximum")
+    query.bindValue(':id_activite', id_activite)
+    query.bindValue(':maximum', maximum)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()) or not query.first():
+        return None
+    return str(query.value(0)) + " " + str(query.value(1))
@@ -0,0 +1,301 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Renouvellement des membres sans interface graphique
+
+La date de renouvellement, l'article et le prix sont calculés une seule fois pour tous les membres. Les membres, les
+factures et les inscriptions de membre sont ensuite écrits dans une seule transaction avec une requête préparée par
+table exécutée en lot (execBatch). Les numéros de facture sont réservés en un seul bloc avant la transaction.
+
+Methodes :
+    annee_renouvellement : Obtenir l'année de la fin de l'adhésion d'un membre renouvelé à une date
+    date_renouvellement : Obtenir la date de renouvellement d'un membre renouvelé à une date
+    article : Obtenir la description et le prix de l'article de renouvellement
+
+Classes
+    Membre : Membre à renouveler
+    Resultat : Résultat d'un renouvellement
+    MoteurRenouvellement : Renouvellement d'une liste de membres
+"""
+
+# Python import
+from collections import namedtuple
+from datetime import date
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery, QSqlError
+
+# Project import
+from guide.script.database.moteur import Moteur
+from guide.script.database import annuaire
+from guide.script.database import sequence
+
+# Prix du renouvellement
+PRIX_RENOUVELLEMENT = 5.00
+PRIX_HONORAIRE = 0.00
+
+# Les adhésions se terminent le 1er septembre
+MOIS_RENOUVELLEMENT = 9
+
+# Nombre maximal de valeurs dans une clause IN
+TAILLE_IN = 500
+
+# Membre à renouveler
+Membre = namedtuple('Membre', ['id_membre', 'id_participante', 'nom', 'date_renouvellement'])
+
+# Résultat d'un renouvellement
+# premiere_facture est None lors d'une simulation
+Resultat = namedtuple('Resultat', ['nombre', 'date_renouvellement', 'article', 'total', 'premiere_facture'])
+
+
+def annee_renouvellement(reference):
+    """
+    Obtenir l'année de la fin de l'adhésion d'un membre renouvelé à une date
+
+    Un renouvellement après le mois de septembre couvre aussi l'année suivante.
+
+    :param reference: Date du renouvellement (datetime.date)
+    :return: Année
+    """
+    if reference.month > MOIS_RENOUVELLEMENT:
+        return reference.year + 2
+    return reference.year + 1
+
+
+def date_renouvellement(reference, honoraire=False):
+    """
+    Obtenir la date de renouvellement d'un membre renouvelé à une date
+
+    :param reference: Date du renouvellement (datetime.date)
+    :param honoraire: Membre honoraire
+    :return: Date au format yyyy-MM-dd ou 0 pour un membre honoraire
+    """
+    if honoraire:
+        return 0  # Aucune date de renouvellement
+
+    return date(annee_renouvellement(reference), MOIS_RENOUVELLEMENT, 1).isoformat()
+
+
+def article(reference, honoraire=False):
+    """
+    Obtenir la description et le prix de l'article de renouvellement
+
+    :param reference: Date du renouvellement (datetime.date)
+    :param honoraire: Membre honoraire
+    :return: (Description, Prix)
+    """
+    if honoraire:
+        return "Membre honoraire", PRIX_HONORAIRE
+
+    return "Renouvellement membre " + str(annee_renouvellement(reference)), PRIX_RENOUVELLEMENT
+
+
+class MoteurRenouvellement(Moteur):
+    """
+    Renouvellement d'une liste de membres
+
+    Methodes :
+        membres : Obtenir les membres à renouveler
+        renouveler : Renouveler les membres
+    """
+    # Nombre de lignes écrites entre deux mises à jour de la progression
+    TAILLE_LOT = 200
+
+    def membres(self, ids_participante=None, echeance=None):
+        """
+        Obtenir les membres à renouveler
+
+        :param ids_participante: Liste des identifiants des participantes ou None pour utiliser l'échéance
+        :param echeance: Date (datetime.date). Les membres actifs non honoraires dont la date de renouvellement est
+                         antérieure ou égale sont retournés.
+        :return: Liste des Membre ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+
+        sql = "SELECT membre.id_membre, membre.id_participante, " \
+                "ifnull(participante.prenom, '') || ' ' || ifnull(participante.nom, ''), " \
+                "membre.date_renouvellement " \
+              "FROM membre " \
+              "INNER JOIN participante ON participante.id_participante = membre.id_participante "
+
+        liste_membre = list()
+        if ids_participante is None:
+            query = QSqlQuery(self.DATABASE)
+            query.setForwardOnly(True)
+            query.prepare(sql + "WHERE (membre.actif = 1) AND (ifnull(membre.membre_honoraire, 0) = 0) "
+                                "AND (membre.date_renouvellement <= :echeance) "
+                                "ORDER BY participante.nom, participante.prenom")
+            query.bindValue(':echeance', (echeance or date.today()).isoformat())
+            if not self.executer(query):
+                return None
+            self.lire_membres(query, liste_membre)
+        else:
+            # Les identifiants sont séparés en groupes pour respecter la limite de paramètres de SQLite
+            ids_participante = list(ids_participante)
+            for debut in range(0, len(ids_participante), TAILLE_IN):
+                groupe = ids_participante[debut:debut + TAILLE_IN]
+                query = QSqlQuery(self.DATABASE)
+                query.setForwardOnly(True)
+                query.prepare(sql + "WHERE membre.id_participante IN ({})".format(", ".join("?" * len(groupe))))
+                for id_participante in groupe:
+                    query.addBindValue(int(id_participante))
+                if not self.executer(query):
+                    return None
+                self.lire_membres(query, liste_membre)
+
+        return liste_membre
+
+    @staticmethod
+    def lire_membres(query, liste_membre):
+        """
+        Ajouter les membres d'une requête exécutée à une liste
+
+        :param query: Requête exécutée
+        :param liste_membre: Liste des Membre
+        """
+        while query.next():
+            liste_membre.append(Membre(int(query.value(0)), int(query.value(1)), str(query.value(2)).strip(),
+                                       query.value(3)))
+
+    def renouveler(self, liste_membre, reference=None, honoraire=False, numero_recu=None, simulation=False,
+                   progression=None):
+        """
+        Renouveler les membres
+
+        :param liste_membre: Liste des Membre
+        :param reference: Date du renouvellement (datetime.date) ou None pour aujourd'hui
+        :param honoraire: Renouveler comme membres honoraires
+        :param numero_recu: Numéro du reçu inscrit sur chaque facture
+        :param simulation: Calculer le résultat sans rien écrire dans la base de données
+        :param progression: Fonction appelée avec le nombre de membres renouvelés et le nombre total
+        :return: Resultat ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+
+        # Valeurs communes à tous les membres
+        reference = reference or date.today()
+        renouvellement = date_renouvellement(reference, honoraire)
+        description, prix = article(reference, honoraire)
+        nombre = len(liste_membre)
+
+        if simulation or not liste_membre:
+            return Resultat(nombre, renouvellement, description, prix * nombre, None)
+
+        # Réserver un numéro de facture par membre avant la transaction
+        sequence_facture = sequence.Sequence(self.DATABASE, sequence.SEQUENCE_FACTURE)
+        premiere_facture = sequence_facture.reserver(nombre)
+        if premiere_facture is None:
+            self.ERREUR = sequence_facture.lastError()
+            return None
+
+        # Commencer une transaction
+        if not self.DATABASE.transaction():
+            self.ERREUR = self.DATABASE.lastError()
+            return None
+
+        for debut in range(0, nombre, self.TAILLE_LOT):
+            lot = liste_membre[debut:debut + self.TAILLE_LOT]
+            factures = list(range(premiere_facture + debut, premiere_facture + debut + len(lot)))
+
+            if not self.modifier_membres(lot, honoraire, renouvellement) or \
+                    not self.ajouter_factures(lot, factures, numero_recu, prix) or \
+                    not self.ajouter_inscriptions(lot, factures, reference, description, prix, numero_recu):
+                self.DATABASE.rollback()  # Annuler la transaction
+                return None
+
+            if progression is not None:
+                progression(debut + len(lot), nombre)
+
+        # Consommer les numéros de facture
+        if not sequence_facture.consommer(premiere_facture, nombre):
+            self.ERREUR = sequence_facture.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        # Terminer la transaction
+        if not self.DATABASE.commit():
+            self.ERREUR = self.DATABASE.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        # Le status de membre des participantes a changé
+        annuaire.invalider()
+
+        return Resultat(nombre, renouvellement, description, prix * nombre, premiere_facture)
+
+    def modifier_membres(self, lot, honoraire, renouvellement):
+        """
+        Modifier la date de renouvellement des membres
+
+        :param lot: Liste des Membre
+        :param honoraire: Membres honoraires
+        :param renouvellement: Date de renouvellement
+        :return: True si les membres sont modifiés
+        """
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("UPDATE membre "
+                      "SET actif = 1, membre_honoraire = ?, date_renouvellement = ? "
+                      "WHERE id_membre = ?")
+        query.addBindValue([honoraire] * len(lot))
+        query.addBindValue([renouvellement] * len(lot))
+        query.addBindValue([membre.id_membre for membre in lot])
+        return self.executer_lot(query)
+
+    def ajouter_factures(self, lot, factures, numero_recu, prix):
+        """
+        Ajouter une facture par membre
+
+        :param lot: Liste des Membre
+        :param factures: Numéro de la facture de chaque membre
+        :param numero_recu: Numéro du reçu
+        :param prix: Total de chaque facture
+        :return: True si les factures sont ajoutées
+        """
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO facture "
+                        "(id_facture, numero_recu, id_participante, total) "
+                      "VALUES "
+                        "(?, ?, ?, ?)")
+        query.addBindValue(factures)
+        query.addBindValue([numero_recu] * len(lot))
+        query.addBindValue([membre.id_participante for membre in lot])
+        query.addBindValue([prix] * len(lot))
+        return self.executer_lot(query)
+
+    def ajouter_inscriptions(self, lot, factures, reference, description, prix, numero_recu):
+        """
+        Ajouter l'article de renouvellement de chaque membre
+
+        :param lot: Liste des Membre
+        :param factures: Numéro de la facture de chaque membre
+        :param reference: Date du renouvellement (datetime.date)
+        :param description: Description de l'article
+        :param prix: Prix de l'article
+        :param numero_recu: Numéro du reçu
+        :return: True si les articles sont ajoutés
+        """
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO inscription_membre "
+                        "(id_membre, id_facture, date, article, prix, numero_recu) "
+                      "VALUES "
+                        "(?, ?, ?, ?, ?, ?)")
+        query.addBindValue([membre.id_membre for membre in lot])
+        query.addBindValue(factures)
+        query.addBindValue([reference.isoformat()] * len(lot))
+        query.addBindValue([description] * len(lot))
+        query.addBindValue([prix] * len(lot))
+        query.addBindValue([numero_recu] * len(lot))
+        return self.executer_lot(query)
@@ -0,0 +1,422 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Traitement des factures sans interface graphique
+
+Les classes de ce module n'accèdent à aucun widget et n'affichent aucun message. En cas d'erreur, la transaction est
+annulée et l'erreur est disponible avec lastError() pour être affichée par le dialog avec
+database_error.sql_error_handler.
+
+Methodes :
+    creer_article : Créer l'article d'une activité facturée ou remboursée
+    creer_facture : Créer la description d'une facture et calculer son total
+
+Classes
+    Article : Article d'une facture
+    DescriptionFacture : Description d'une facture à enregistrer
+    MoteurFacturation : Enregistrement d'une facture, de ses articles et des inscriptions
+    MoteurInscription : Enregistrement des inscriptions et des annulations d'une participante
+    MoteurPresence : Enregistrement des présences aux activités
+"""
+
+# Python import
+from collections import namedtuple
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery, QSqlError
+
+# Project import
+from guide.script.database.moteur import Moteur
+
+# Définition des status des inscriptions
+STATUS_INSCRIPTION_ANNULEE = 0
+STATUS_INSCRIPTION = 1
+STATUS_FACTURE = 2
+STATUS_REMBOURSE = 3
+
+# Article d'une facture
+# Le prix d'un remboursement est négatif
+Article = namedtuple('Article', ['id_activite', 'prix', 'description', 'remboursement'])
+
+# Description d'une facture à enregistrer
+# Le numéro de la facture est attribué par la base de données lorsque id_facture est None
+DescriptionFacture = namedtuple('DescriptionFacture', ['id_participante', 'numero_recu', 'total', 'articles',
+                                                       'id_facture'])
+
+
+def creer_article(id_activite, nom, date, prix, remboursement=False):
+    """
+    Créer l'article d'une activité facturée ou remboursée
+
+    :param id_activite: Identifiant de l'activité
+    :param nom: Nom de l'activité
+    :param date: Date de l'activité affichée dans la description
+    :param prix: Prix de l'activité (positif)
+    :param remboursement: L'activité est remboursée
+    :return: Article
+    """
+    prix = abs(float(prix))
+    if remboursement:
+        prix = -prix
+    return Article(int(id_activite), prix, str(nom) + " (" + str(date) + ")", remboursement)
+
+
+def creer_facture(id_participante, numero_recu, articles, id_facture=None):
+    """
+    Créer la description d'une facture et calculer son total
+
+    :param id_participante: Identifiant de la participante
+    :param numero_recu: Numéro du reçu
+    :param articles: Liste des Article
+    :param id_facture: Numéro de la facture ou None pour un numéro attribué par la base de données
+    :return: DescriptionFacture
+    """
+    total = round(sum(article.prix for article in articles), 2)
+    return DescriptionFacture(id_participante, numero_recu, total, list(articles), id_facture)
+
+
+class MoteurFacturation(Moteur):
+    """
+    Enregistrement d'une facture, de ses articles et des inscriptions
+
+    Toutes les écritures sont effectuées dans une seule transaction avec une requête préparée par table exécutée en
+    lot (execBatch).
+
+    Methodes :
+        enregistrer : Enregistrer une facture
+        facturee : Vérifier si une activité est facturée à une participante
+    """
+
+    def facturee(self, id_participante, id_activite):
+        """
+        Vérifier si une activité est facturée à une participante
+
+        :param id_participante: Identifiant de la participante
+        :param id_activite: Identifiant de l'activité
+        :return: True si l'activité est facturée ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("SELECT EXISTS (SELECT 1 FROM inscription "
+                                     "WHERE (status = :status) AND (id_activite = :id_activite) "
+                                     "AND (id_participante = :id_participante))")
+        query.bindValue(':status', STATUS_FACTURE)
+        query.bindValue(':id_activite', int(id_activite))
+        query.bindValue(':id_participante', int(id_participante))
+        if not self.executer(query) or not query.first():
+            return None
+        return bool(query.value(0))
+
+    def enregistrer(self, facture, sequence=None):
+        """
+        Enregistrer une facture
+
+        :param facture: DescriptionFacture
+        :param sequence: Sequence qui a fourni le numéro de la facture. Le numéro est consommé dans la transaction.
+        :return: Identifiant de la facture ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+
+        # Commencer une transaction
+        if not self.DATABASE.transaction():
+            self.ERREUR = self.DATABASE.lastError()
+            return None
+
+        id_facture = self.ajouter_facture(facture)
+        if id_facture is None or not self.ajouter_articles(id_facture, facture.articles) or \
+                not self.traiter_inscriptions(facture.id_participante, facture.articles):
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        # Consommer le numéro de la facture
+        if sequence is not None and not sequence.consommer(id_facture):
+            self.ERREUR = sequence.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        # Terminer la transaction
+        if not self.DATABASE.commit():
+            self.ERREUR = self.DATABASE.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return None
+
+        return id_facture
+
+    def ajouter_facture(self, facture):
+        """
+        Ajouter la facture
+
+        :param facture: DescriptionFacture
+        :return: Identifiant de la facture ou None en cas d'erreur
+        """
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO facture "
+                        "(id_facture, numero_recu, id_participante, total) "
+                      "VALUES "
+                        "(:id_facture, :numero_recu, :id_participante, :total)")
+        query.bindValue(':id_facture', facture.id_facture)
+        query.bindValue(':numero_recu', facture.numero_recu)
+        query.bindValue(':id_participante', facture.id_participante)
+        query.bindValue(':total', facture.total)
+
+        if not self.executer(query):
+            return None
+        return int(query.lastInsertId())
+
+    def ajouter_articles(self, id_facture, articles):
+        """
+        Ajouter tous les articles de la facture
+
+        :param id_facture: Identifiant de la facture
+        :param articles: Liste des Article
+        :return: True si les articles sont ajoutés
+        """
+        if not articles:
+            return True
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO article "
+                        "(id_facture, id_activite, prix, description) "
+                      "VALUES "
+                        "(?, ?, ?, ?)")
+        query.addBindValue([id_facture] * len(articles))
+        query.addBindValue([article.id_activite for article in articles])
+        query.addBindValue([article.prix for article in articles])
+        query.addBindValue([article.description for article in articles])
+        return self.executer_lot(query)
+
+    def traiter_inscriptions(self, id_participante, articles):
+        """
+        Modifier le status des inscriptions associées aux articles
+
+        Une activité facturée passe au status facturé. L'inscription est créée si elle n'existe pas et la date
+        d'inscription est remise à zéro si l'inscription avait été annulée ou remboursée. Une activité remboursée passe
+        au status remboursé et sa date d'inscription est remise à zéro.
+
+        :param id_participante: Identifiant de la participante
+        :param articles: Liste des Article
+        :return: True si les inscriptions sont modifiées
+        """
+        factures = [article.id_activite for article in articles if not article.remboursement]
+        remboursements = [article.id_activite for article in articles if article.remboursement]
+
+        if factures:
+            # Facturer les inscriptions existantes
+            query = QSqlQuery(self.DATABASE)
+            query.prepare("UPDATE inscription "
+                          "SET "
+                            "time = CASE WHEN status = ? THEN time ELSE datetime('now', 'localtime') END, "
+                            "status = ? "
+                          "WHERE (id_participante = ?) AND (id_activite = ?) AND (status != ?)")
+            query.addBindValue([STATUS_INSCRIPTION] * len(factures))
+            query.addBindValue([STATUS_FACTURE] * len(factures))
+            query.addBindValue([id_participante] * len(factures))
+            query.addBindValue(factures)
+            query.addBindValue([STATUS_FACTURE] * len(factures))
+            if not self.executer_lot(query):
+                return False
+
+            # Ajouter les inscriptions qui n'existent pas
+            query = QSqlQuery(self.DATABASE)
+            query.prepare("INSERT INTO inscription "
+                            "(id_participante, id_activite, status) "
+                          "SELECT ?, ?, ? "
+                          "WHERE NOT EXISTS (SELECT 1 FROM inscription "
+                                            "WHERE (id_participante = ?) AND (id_activite = ?))")
+            query.addBindValue([id_participante] * len(factures))
+            query.addBindValue(factures)
+            query.addBindValue([STATUS_FACTURE] * len(factures))
+            query.addBindValue([id_participante] * len(factures))
+            query.addBindValue(factures)
+            if not self.executer_lot(query):
+                return False
+
+        if remboursements:
+            # La date d'inscription est remise à zéro lorsque l'inscription est remboursée
+            query = QSqlQuery(self.DATABASE)
+            query.prepare("UPDATE inscription "
+                          "SET "
+                            "status = ?, "
+                            "time = datetime('now', 'localtime') "
+                          "WHERE (id_participante = ?) AND (id_activite = ?)")
+            query.addBindValue([STATUS_REMBOURSE] * len(remboursements))
+            query.addBindValue([id_participante] * len(remboursements))
+            query.addBindValue(remboursements)
+            if not self.executer_lot(query):
+                return False
+
+        return True
+
+
+class MoteurInscription(Moteur):
+    """
+    Enregistrement des inscriptions et des annulations d'une participante
+
+    Les inscriptions sont modifiées avec UPDATE et ajoutées avec INSERT seulement lorsqu'elles n'existent pas. Les
+    requêtes INSERT OR REPLACE ne sont pas utilisées puisque la suppression implicite de la ligne remplacée ne déclenche
+    pas les triggers qui maintiennent le nombre d'inscriptions de chaque activité.
+
+    Methodes :
+        enregistrer : Enregistrer les inscriptions et les annulations
+    """
+
+    def enregistrer(self, id_participante, inscriptions, annulations):
+        """
+        Enregistrer les inscriptions et les annulations
+
+        Une nouvelle inscription ou une inscription qui n'était pas au status inscription passe au status inscription
+        et sa date d'inscription est remise à zéro. Une annulation passe au status annulé et sa date d'inscription est
+        remise à zéro.
+
+        :param id_participante: Identifiant de la participante
+        :param inscriptions: Liste des identifiants des activités à ajouter
+        :param annulations: Liste des identifiants des activités à annuler
+        :return: True si les inscriptions sont enregistrées
+        """
+        self.ERREUR = QSqlError()
+
+        # Commencer une transaction
+        if not self.DATABASE.transaction():
+            self.ERREUR = self.DATABASE.lastError()
+            return False
+
+        if not self.modifier_status(id_participante, inscriptions, STATUS_INSCRIPTION) or \
+                not self.ajouter_inscriptions(id_participante, inscriptions) or \
+                not self.modifier_status(id_participante, annulations, STATUS_INSCRIPTION_ANNULEE):
+            self.DATABASE.rollback()  # Annuler la transaction
+            return False
+
+        # Terminer la transaction
+        if not self.DATABASE.commit():
+            self.ERREUR = self.DATABASE.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return False
+
+        return True
+
+    def modifier_status(self, id_participante, activites, status):
+        """
+        Modifier le status des inscriptions existantes
+
+        La date d'inscription est remise à zéro seulement si le status change.
+
+        :param id_participante: Identifiant de la participante
+        :param activites: Liste des identifiants des activités
+        :param status: Nouveau status
+        :return: True si les inscriptions sont modifiées
+        """
+        if not activites:
+            return True
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("UPDATE inscription "
+                      "SET "
+                        "status = ?, "
+                        "time = datetime('now', 'localtime') "
+                      "WHERE (id_participante = ?) AND (id_activite = ?) AND (status != ?)")
+        query.addBindValue([status] * len(activites))
+        query.addBindValue([id_participante] * len(activites))
+        query.addBindValue(list(activites))
+        query.addBindValue([status] * len(activites))
+        return self.executer_lot(query)
+
+    def ajouter_inscriptions(self, id_participante, activites):
+        """
+        Ajouter les inscriptions qui n'existent pas
+
+        :param id_participante: Identifiant de la participante
+        :param activites: Liste des identifiants des activités
+        :return: True si les inscriptions sont ajoutées
+        """
+        if not activites:
+            return True
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO inscription "
+                        "(id_participante, id_activite, status) "
+                      "SELECT ?, ?, ? "
+                      "WHERE NOT EXISTS (SELECT 1 FROM inscription "
+                                        "WHERE (id_participante = ?) AND (id_activite = ?))")
+        query.addBindValue([id_participante] * len(activites))
+        query.addBindValue(list(activites))
+        query.addBindValue([STATUS_INSCRIPTION] * len(activites))
+        query.addBindValue([id_participante] * len(activites))
+        query.addBindValue(list(activites))
+        return self.executer_lot(query)
+
+
+class MoteurPresence(Moteur):
+    """
+    Enregistrement des présences aux activités
+
+    Les présences et les absences sont enregistrées avec une requête UPDATE ... WHERE id_inscription IN (...) chacune,
+    dans une seule transaction.
+
+    Methodes :
+        enregistrer : Enregistrer les présences et les absences
+    """
+
+    def enregistrer(self, presents, absents):
+        """
+        Enregistrer les présences et les absences
+
+        :param presents: Liste des identifiants des inscriptions présentes
+        :param absents: Liste des identifiants des inscriptions absentes
+        :return: True si les présences sont enregistrées
+        """
+        self.ERREUR = QSqlError()
+
+        # Aucune modification
+        if not presents and not absents:
+            return True
+
+        # Commencer une transaction
+        if not self.DATABASE.transaction():
+            self.ERREUR = self.DATABASE.lastError()
+            return False
+
+        if not self.modifier_presence(presents, True) or not self.modifier_presence(absents, False):
+            self.DATABASE.rollback()  # Annuler la transaction
+            return False
+
+        # Terminer la transaction
+        if not self.DATABASE.commit():
+            self.ERREUR = self.DATABASE.lastError()
+            self.DATABASE.rollback()  # Annuler la transaction
+            return False
+
+        return True
+
+    def modifier_presence(self, inscriptions, present):
+        """
+        Modifier la présence d'une liste d'inscriptions
+
+        :param inscriptions: Liste des identifiants des inscriptions
+        :param present: Présence
+        :return: True si les inscriptions sont modifiées
+        """
+        if not inscriptions:
+            return True
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("UPDATE inscription "
+                      "SET present = ? "
+                      "WHERE id_inscription IN ({})".format(", ".join("?" * len(inscriptions))))
+        query.addBindValue(int(present))
+        for id_inscription in inscriptions:
+            query.addBindValue(int(id_inscription))
+        return self.executer(query)
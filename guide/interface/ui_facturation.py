@@ -288,6 +288,9 @@ class Ui_Facturation(object):
         self.verticalLayout_4.addLayout(self.horizontalLayout_11)
         self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.chk_recu = QtWidgets.QCheckBox(Facturation)
+        self.chk_recu.setObjectName("chk_recu")
+        self.horizontalLayout_6.addWidget(self.chk_recu)
         spacerItem8 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.horizontalLayout_6.addItem(spacerItem8)
         self.btn_annuler = QtWidgets.QPushButton(Facturation)
@@ -382,6 +385,8 @@ class Ui_Facturation(object):
         item.setText(_translate("Facturation", "Quantité"))
         self.label_10.setText(_translate("Facturation", "Total : "))
         self.btn_remove.setText(_translate("Facturation", "Retirer"))
+        self.chk_recu.setStatusTip(_translate("Facturation", "Afficher le reçu en PDF après l'enregistrement de la facture"))
+        self.chk_recu.setText(_translate("Facturation", "Afficher le reçu"))
         self.btn_annuler.setText(_translate("Facturation", "Annuler"))
         self.btn_enregistrer.setText(_translate("Facturation", "Enregistrer"))
 
@@ -80,6 +80,8 @@ class Ui_MainWindow(object):
         self.act_type_activite.setObjectName("act_type_activite")
         self.act_responsables = QtWidgets.QAction(MainWindow)
         self.act_responsables.setObjectName("act_responsables")
+        self.act_renouvellement = QtWidgets.QAction(MainWindow)
+        self.act_renouvellement.setObjectName("act_renouvellement")
         self.act_inscription = QtWidgets.QAction(MainWindow)
         icon4 = QtGui.QIcon()
         icon4.addPixmap(QtGui.QPixmap("../Resources/Inscription.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
@@ -107,6 +109,7 @@ class Ui_MainWindow(object):
         self.act_enregistre.setObjectName("act_enregistre")
         self.menuGestion.addAction(self.act_type_activite)
         self.menuGestion.addAction(self.act_responsables)
+        self.menuGestion.addAction(self.act_renouvellement)
         self.menuGestion.addSeparator()
         self.menuGestion.addAction(self.act_reglage)
         self.menuStatistiques.addAction(self.act_statistiques)
@@ -145,6 +148,7 @@ class Ui_MainWindow(object):
         self.act_consult_categorie_activite.setToolTip(_translate("MainWindow", "Catégorie d\'activité"))
         self.act_type_activite.setText(_translate("MainWindow", "Type d\'activité"))
         self.act_responsables.setText(_translate("MainWindow", "Responsables"))
+        self.act_renouvellement.setText(_translate("MainWindow", "Renouvellement des membres"))
         self.act_inscription.setText(_translate("MainWindow", "Inscription"))
         self.act_facturation.setText(_translate("MainWindow", "Facturation"))
         self.act_about.setText(_translate("MainWindow", "À propos"))
@@ -117,6 +117,23 @@ class Ui_NouvelleActivite(object):
         self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.widget_recurrente)
         self.verticalLayout_2.setContentsMargins(0, 0, 0, 0)
         self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.hlay_frequence = QtWidgets.QHBoxLayout()
+        self.hlay_frequence.setObjectName("hlay_frequence")
+        self.lbl_frequence = QtWidgets.QLabel(self.widget_recurrente)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.lbl_frequence.sizePolicy().hasHeightForWidth())
+        self.lbl_frequence.setSizePolicy(sizePolicy)
+        self.lbl_frequence.setMinimumSize(QtCore.QSize(140, 0))
+        self.lbl_frequence.setObjectName("lbl_frequence")
+        self.hlay_frequence.addWidget(self.lbl_frequence)
+        self.cbx_frequence = QtWidgets.QComboBox(self.widget_recurrente)
+        self.cbx_frequence.setObjectName("cbx_frequence")
+        self.hlay_frequence.addWidget(self.cbx_frequence)
+        spacerItem_frequence = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.hlay_frequence.addItem(spacerItem_frequence)
+        self.verticalLayout_2.addLayout(self.hlay_frequence)
         self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_4.setObjectName("horizontalLayout_4")
         self.lbl_debut = QtWidgets.QLabel(self.widget_recurrente)
@@ -286,8 +303,9 @@ class Ui_NouvelleActivite(object):
         self.txt_nom.setPlaceholderText(_translate("NouvelleActivite", "Nom de l\'activité"))
         self.label_2.setText(_translate("NouvelleActivite", "Type d\'activité : "))
         self.rbt_unique.setText(_translate("NouvelleActivite", "Unique"))
-        self.rbt_hebdomadaire.setText(_translate("NouvelleActivite", "Hebdomadaire"))
+        self.rbt_hebdomadaire.setText(_translate("NouvelleActivite", "Récurrente"))
         self.lbl_unique.setText(_translate("NouvelleActivite", "Date :"))
+        self.lbl_frequence.setText(_translate("NouvelleActivite", "Fréquence : "))
         self.lbl_debut.setText(_translate("NouvelleActivite", "Début : "))
         self.lbl_fin.setText(_translate("NouvelleActivite", "Fin : "))
         self.lbl_exclusion.setStatusTip(_translate("NouvelleActivite", "Retirer les dates où l\'activité n\'a pas lieu"))
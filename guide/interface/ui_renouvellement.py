@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'guide/interface/ui/ui_renouvellement.ui'
+#
+# Created by: PyQt5 UI code generator 5.9.2
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_Renouvellement(object):
+    def setupUi(self, Renouvellement):
+        Renouvellement.setObjectName("Renouvellement")
+        Renouvellement.resize(500, 450)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Renouvellement)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.lbl_titre = QtWidgets.QLabel(Renouvellement)
+        font = QtGui.QFont()
+        font.setFamily("Segoe UI")
+        font.setPointSize(10)
+        self.lbl_titre.setFont(font)
+        self.lbl_titre.setObjectName("lbl_titre")
+        self.verticalLayout.addWidget(self.lbl_titre)
+        self.hlay_echeance = QtWidgets.QHBoxLayout()
+        self.hlay_echeance.setObjectName("hlay_echeance")
+        self.lbl_echeance = QtWidgets.QLabel(Renouvellement)
+        self.lbl_echeance.setObjectName("lbl_echeance")
+        self.hlay_echeance.addWidget(self.lbl_echeance)
+        self.ded_echeance = QtWidgets.QDateEdit(Renouvellement)
+        self.ded_echeance.setCalendarPopup(True)
+        self.ded_echeance.setObjectName("ded_echeance")
+        self.hlay_echeance.addWidget(self.ded_echeance)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.hlay_echeance.addItem(spacerItem)
+        self.verticalLayout.addLayout(self.hlay_echeance)
+        self.tbl_membre = QtWidgets.QTableWidget(Renouvellement)
+        self.tbl_membre.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tbl_membre.setAlternatingRowColors(True)
+        self.tbl_membre.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.tbl_membre.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tbl_membre.setObjectName("tbl_membre")
+        self.tbl_membre.setColumnCount(0)
+        self.tbl_membre.setRowCount(0)
+        self.verticalLayout.addWidget(self.tbl_membre)
+        self.flay_renouvellement = QtWidgets.QFormLayout()
+        self.flay_renouvellement.setObjectName("flay_renouvellement")
+        self.lbl_article = QtWidgets.QLabel(Renouvellement)
+        self.lbl_article.setObjectName("lbl_article")
+        self.flay_renouvellement.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.lbl_article)
+        self.txt_article = QtWidgets.QLineEdit(Renouvellement)
+        self.txt_article.setReadOnly(True)
+        self.txt_article.setObjectName("txt_article")
+        self.flay_renouvellement.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.txt_article)
+        self.lbl_total = QtWidgets.QLabel(Renouvellement)
+        self.lbl_total.setObjectName("lbl_total")
+        self.flay_renouvellement.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.lbl_total)
+        self.txt_total = QtWidgets.QLineEdit(Renouvellement)
+        self.txt_total.setReadOnly(True)
+        self.txt_total.setObjectName("txt_total")
+        self.flay_renouvellement.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.txt_total)
+        self.lbl_recu = QtWidgets.QLabel(Renouvellement)
+        self.lbl_recu.setObjectName("lbl_recu")
+        self.flay_renouvellement.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.lbl_recu)
+        self.txt_recu = QtWidgets.QLineEdit(Renouvellement)
+        self.txt_recu.setObjectName("txt_recu")
+        self.flay_renouvellement.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.txt_recu)
+        self.verticalLayout.addLayout(self.flay_renouvellement)
+        self.chk_simulation = QtWidgets.QCheckBox(Renouvellement)
+        self.chk_simulation.setObjectName("chk_simulation")
+        self.verticalLayout.addWidget(self.chk_simulation)
+        self.pbr_renouvellement = QtWidgets.QProgressBar(Renouvellement)
+        self.pbr_renouvellement.setProperty("value", 0)
+        self.pbr_renouvellement.setObjectName("pbr_renouvellement")
+        self.verticalLayout.addWidget(self.pbr_renouvellement)
+        self.hlay_bouton = QtWidgets.QHBoxLayout()
+        self.hlay_bouton.setObjectName("hlay_bouton")
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.hlay_bouton.addItem(spacerItem1)
+        self.btn_annuler = QtWidgets.QPushButton(Renouvellement)
+        self.btn_annuler.setObjectName("btn_annuler")
+        self.hlay_bouton.addWidget(self.btn_annuler)
+        self.btn_renouveler = QtWidgets.QPushButton(Renouvellement)
+        self.btn_renouveler.setDefault(True)
+        self.btn_renouveler.setObjectName("btn_renouveler")
+        self.hlay_bouton.addWidget(self.btn_renouveler)
+        self.verticalLayout.addLayout(self.hlay_bouton)
+
+        self.retranslateUi(Renouvellement)
+        QtCore.QMetaObject.connectSlotsByName(Renouvellement)
+
+    def retranslateUi(self, Renouvellement):
+        _translate = QtCore.QCoreApplication.translate
+        Renouvellement.setWindowTitle(_translate("Renouvellement", "Renouvellement des membres"))
+        self.lbl_titre.setText(_translate("Renouvellement", "Renouvellement des membres"))
+        self.lbl_echeance.setText(_translate("Renouvellement", "Renouvellement avant le"))
+        self.ded_echeance.setDisplayFormat(_translate("Renouvellement", "dd-MM-yyyy"))
+        self.lbl_article.setText(_translate("Renouvellement", "Article"))
+        self.lbl_total.setText(_translate("Renouvellement", "Total"))
+        self.lbl_recu.setText(_translate("Renouvellement", "Numéro de reçu"))
+        self.chk_simulation.setText(_translate("Renouvellement", "Simulation (aucune modification)"))
+        self.btn_annuler.setText(_translate("Renouvellement", "Fermer"))
+        self.btn_renouveler.setText(_translate("Renouvellement", "Renouveler"))
+
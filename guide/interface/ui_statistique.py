@@ -163,7 +163,7 @@ class Ui_Statistique(object):
         self.tbl_champs.setPalette(palette)
         self.tbl_champs.setAlternatingRowColors(True)
         self.tbl_champs.setObjectName("tbl_champs")
-        self.tbl_champs.setColumnCount(3)
+        self.tbl_champs.setColumnCount(4)
         self.tbl_champs.setRowCount(0)
         item = QtWidgets.QTableWidgetItem()
         self.tbl_champs.setHorizontalHeaderItem(0, item)
@@ -171,6 +171,8 @@ class Ui_Statistique(object):
         self.tbl_champs.setHorizontalHeaderItem(1, item)
         item = QtWidgets.QTableWidgetItem()
         self.tbl_champs.setHorizontalHeaderItem(2, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tbl_champs.setHorizontalHeaderItem(3, item)
         self.tbl_champs.horizontalHeader().setDefaultSectionSize(250)
         self.tbl_champs.horizontalHeader().setStretchLastSection(True)
         self.verticalLayout.addWidget(self.tbl_champs)
@@ -265,6 +267,8 @@ class Ui_Statistique(object):
         item = self.tbl_champs.horizontalHeaderItem(1)
         item.setText(_translate("Statistique", "Colonne"))
         item = self.tbl_champs.horizontalHeaderItem(2)
+        item.setText(_translate("Statistique", "Calcul"))
+        item = self.tbl_champs.horizontalHeaderItem(3)
         item.setText(_translate("Statistique", "Contrainte"))
         self.label_5.setText(_translate("Statistique", "Option de tri : "))
         item = self.tbl_tri.horizontalHeaderItem(0)
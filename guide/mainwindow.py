@@ -30,31 +30,25 @@ Classes
 # Python import
 import pathlib
 import os
-import xml.etree.ElementTree as ET
 
 # PyQt import
 
 from PyQt5.QtWidgets import QMainWindow, QWidget, QTableWidgetItem, \
-    QAbstractItemView, QHeaderView
+    QAbstractItemView, QHeaderView, QTableView
 from PyQt5.QtCore import QSettings, QDate, QTime, QByteArray
 from PyQt5.Qt import QApplication, QDialog
 from PyQt5.QtGui import QIcon
 from PyQt5.QtSql import QSqlQuery
 
 # Projet import
-from guide.membre.participante import NewParticipant, UpdateParticipant
-from guide.activite.lieu import NouveauLieu, ModifierLieu
-from guide.activite.activite import NouvelleActivite, AfficherActivite
-from guide.activite.categorie_activite import NouvelleCategorieActivite, ModifierCategorieActivite
-from guide.setting import Setting
-from guide.consultation import Consultation
-from guide.facturation.facturation import Facturation, Inscription
-from guide.facturation.groupe import Groupe
-from guide.statistique.statistiques import Statistiques, StatistiquesDialog
-from guide.script.interface.selection import SelectionStatistique
-from guide.script.interface.a_propos import APropos
+# Les dialogs sont importés à leur première ouverture pour accélérer le démarrage
+from guide.script.interface.table_model import ModeleParticipante
+from guide.script.interface.recherche import RechercheIncrementale, like
 from guide.script.database import database_error
 from guide.script.database import data_processing
+from guide.script.database import index_recherche
+from guide.statistique import definition
+from guide.statistique import registre
 
 # Interface import
 from guide.interface.ui_main_window import Ui_MainWindow
@@ -71,6 +65,9 @@ CATEGORY_ACTIVITE = 1
 LIEU = 2
 PARTICIPANTE = 3
 
+# Marge verticale des lignes du tableau des participantes (pixels)
+MARGE_LIGNE = 8
+
 # Largeur relative des colonnes des tableaux
 FACTOR_COL_NOM = 0.23
 FACTOR_COL_ADRESSE = 0.2
@@ -113,7 +110,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         read_settings : Lecture des réglages et affichage de l'interface enregistrée dans les réglages
         closeEvent : Enregistre l'état de la fenêtre principale à la fermeture
         afficher_liste_statistique : Afficher la liste des statistiques enregistrées dans une fenêtre de sélection
-        ouvrir_statistique : Exécuter un fichier de statistique et afficher le résultat
+        ouvrir_statistique : Exécuter une statistique enregistrée et afficher le résultat
         verifier_path_statistique : Obtenir le chemin vers le folder contenant les statistiques
         statistiques : Ouvre le dialog des statistiques
         inscription : Ouvre un dialog pour entrer une nouvelle inscription
@@ -125,6 +122,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         a_propos : Ouvre le dialog qui affiche les informations sur l'application
         resizeEvent : Appelle la fonction responsable de modifier la taille des colonnes lorsque la taille de la fenêtre est modifiée
         resize_table : Ajuster la taille des colonnes à la taille du tableau
+        afficher_tableau : Afficher le tableau chargé par page ou le tableau de la fenêtre principale
         showEvent : Appelle la fonction responsable de modifier la taille des colonnes du tableau lorsque la programme apparait
 
         afficher_participante : Affichage de la liste des participantes et des options de tri dans la fenêtre principale
@@ -155,6 +153,28 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Connection à la base de données
         self.DATABASE = database
 
+        # Tableau de la liste des participantes chargé par page
+        self.modele_participante = ModeleParticipante(self.DATABASE)
+        self.table_view = QTableView(self.centralwidget)
+        self.table_view.setModel(self.modele_participante)
+        self.table_view.setColumnHidden(0, True)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table_view.setAlternatingRowColors(True)
+        # Hauteur fixe des lignes : ResizeToContents mesurerait chaque ligne, donc chargerait toutes les pages
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(self.table_view.fontMetrics().height() +
+                                                               MARGE_LIGNE)
+        self.table_view.clicked.connect(self.edit_participante)
+        self.verticalLayout.addWidget(self.table_view)
+        self.table_view.hide()
+
+        # Recherche différée des listes
+        self.recherche_participante = RechercheIncrementale(self.update_liste_participante, self)
+        self.recherche_activite = RechercheIncrementale(self.update_liste_activite, self)
+        self.LIGNES_ACTIVITE = list()
+
         # Charger les réglages
         self.read_settings()
 
@@ -183,6 +203,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.act_reglage.triggered.connect(self.reglage)
         self.act_type_activite.triggered.connect(self.consultation_type_activite)
         self.act_responsables.triggered.connect(self.consultation_responsables)
+        self.act_renouvellement.triggered.connect(self.renouvellement_membres)
         self.act_inscription.triggered.connect(self.inscription)
         self.act_facturation.triggered.connect(self.facturation)
         self.act_groupe.triggered.connect(self.groupe)
@@ -248,6 +269,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         # Taille du tableau
         width = self.table_widget.width()
+        if self.table_view.isVisible():
+            width = self.table_view.width()
 
         # Régler la taille des colonnes
         if isinstance(self.dock_widget.widget(), DockWidgetActivite):
@@ -267,60 +290,78 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.table_widget.setColumnWidth(2, FACTOR_COL_ADRESSE_LIEU*width)
             self.table_widget.setColumnWidth(3, FACTOR_COL_VILLE*width)
         elif isinstance(self.dock_widget.widget(), DockWidgetParticipante):
-            self.table_widget.setColumnWidth(1, FACTOR_COL_NOM*width)
-            self.table_widget.setColumnWidth(2, FACTOR_COL_ADRESSE*width)
-            self.table_widget.setColumnWidth(3, FACTOR_COL_COURRIEL*width)
-            self.table_widget.setColumnWidth(4, FACTOR_COL_TELEPHONE*width)
+            self.table_view.setColumnWidth(1, FACTOR_COL_NOM*width)
+            self.table_view.setColumnWidth(2, FACTOR_COL_ADRESSE*width)
+            self.table_view.setColumnWidth(3, FACTOR_COL_COURRIEL*width)
+            self.table_view.setColumnWidth(4, FACTOR_COL_TELEPHONE*width)
 
         # Ajouter la dernier colonne pour prendre tout l'espace restant
         self.table_widget.horizontalHeader().setStretchLastSection(True)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+
+    def afficher_tableau(self, pagine):
+        """
+        Afficher le tableau chargé par page ou le tableau de la fenêtre principale
+
+        Argument :
+            pagine : Afficher le tableau chargé par page
+        """
+        self.table_view.setVisible(pagine)
+        self.table_widget.setVisible(not pagine)
 
     def afficher_liste_statistique(self):
         """
         Afficher la liste des statistiques enregistrées dans une fenêtre de sélection
         """
         # Obtenir le dossier ou les fichiers statistique sont enregistrée
-        statistique = self.verifier_path_statistique()
+        dossier = self.verifier_path_statistique()
 
-        # Obtenir la liste des fichiers statistique
+        # Obtenir la liste des statistiques du registre
+        # Seuls les fichiers ajoutés ou modifiés depuis la dernière ouverture sont lus
         liste_statistique = []
-        for file in os.listdir(statistique):
-            statname = os.path.splitext(file)[0]
-
+        for fichier, statistique in registre.lister(dossier):
             dict_stat = dict()
-            dict_stat['fichier'] = file
-            dict_stat['nom'] = statname
+            dict_stat['fichier'] = fichier
+            dict_stat['nom'] = statistique.titre
 
             liste_statistique.append(dict_stat)
 
         # Afficher la liste des statistiques à l'utilisation
+        from guide.script.interface.selection import SelectionStatistique
         selection = SelectionStatistique(liste_statistique)
         selection.setWindowTitle("Statistique")
         if selection.exec() == QDialog.Accepted:
-            nom = selection.get_value()
-            path = os.path.join(statistique, nom)
-            self.ouvrir_statistique(path)
+            statistique = registre.obtenir(dossier, selection.get_value())
+            if statistique:
+                self.ouvrir_statistique(statistique)
 
-    def ouvrir_statistique(self, path):
+    def ouvrir_statistique(self, statistique):
         """
-        Exécuter un fichier de statistique et afficher le résultat
+        Exécuter une statistique enregistrée et afficher le résultat
+
+        Les paramètres de la statistique peuvent être modifiés avant son exécution.
 
         Argument :
-            path : Chemin du fichier de statistique sélectionné
+            statistique : definition.Statistique sélectionnée
         """
-        # Préparer le contenu du fichier XML
-        tree = ET.parse(path)
-        stat = tree.getroot()
+        from guide.statistique.statistiques import Statistiques, ParametresStatistique
 
-        sql = stat.find('sql').text
-        stat_type = stat.find('output').text
+        # Modifier les paramètres
+        valeurs = dict()
+        if statistique.parametres:
+            parametres = ParametresStatistique(statistique)
+            if parametres.exec() != QDialog.Accepted:
+                return
+            valeurs = parametres.valeurs()
 
         # Exécuter la statistique
+        requete = definition.requete(statistique, valeurs)
         statistiques = Statistiques(self.DATABASE)
-        if stat_type == "csv":
-            statistiques.afficher_csv(sql)
+        # La statistique est exécutée en arrière-plan, la fenêtre principale reste utilisable
+        if statistique.sortie == "csv":
+            statistiques.afficher_csv(requete, statistique.titre, self)
         else:
-            statistiques.afficher_pdf(sql)
+            statistiques.afficher_pdf(requete, statistique.titre, self)
 
     def verifier_path_statistique(self):
         """
@@ -353,6 +394,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog des statistiques
         """
+        from guide.statistique.statistiques import StatistiquesDialog
         statistiques = StatistiquesDialog(self.DATABASE)
         statistiques.exec()
 
@@ -360,6 +402,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre un dialog pour entrer une nouvelle inscription
         """
+        from guide.facturation.facturation import Inscription
         inscription = Inscription(self.DATABASE)
         inscription.exec()
 
@@ -367,6 +410,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre un dialog pour entrer une nouvelle facture
         """
+        from guide.facturation.facturation import Facturation
         facturation = Facturation(self.DATABASE)
         facturation.exec()
 
@@ -374,13 +418,23 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog pour consulter les responsables
         """
+        from guide.consultation import Consultation
         consultation = Consultation(2, self.DATABASE)
         consultation.exec()
 
+    def renouvellement_membres(self):
+        """
+        Ouvre le dialog pour renouveler les membres
+        """
+        from guide.facturation.inscription_membre import RenouvellementMembres
+        renouvellement = RenouvellementMembres(self.DATABASE)
+        renouvellement.exec()
+
     def consultation_type_activite(self):
         """
         Ouvrir le dialog pour consulter les types d'activite
         """
+        from guide.consultation import Consultation
         consultation = Consultation(1, self.DATABASE)
         consultation.exec()
 
@@ -388,6 +442,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog des réglages
         """
+        from guide.setting import Setting
         setting = Setting()
         setting.exec()
 
@@ -395,6 +450,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog pour entrer un groupe à une activité
         """
+        from guide.facturation.groupe import Groupe
         groupe = Groupe(self.DATABASE)
         groupe.exec()
 
@@ -402,6 +458,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog qui affiche les informations sur l'application
         """
+        from guide.script.interface.a_propos import APropos
         a_propos = APropos()
         a_propos.exec()
 
@@ -420,23 +477,18 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Vider le table widget
         self.table_widget.setRowCount(0)
 
-        # Afficher l'interface du table widget
-        self.table_widget.setColumnCount(6)
-        self.table_widget.setColumnHidden(0, True)
-        headers = ["Index", "Nom", "Ville", "Courriel", "Téléphone", "Numéro \n de membre"]
-        self.table_widget.setHorizontalHeaderLabels(headers)
-        self.table_widget.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table_widget.setSelectionMode(QAbstractItemView.NoSelection)
-        self.table_widget.setAlternatingRowColors(True)
+        # Afficher le tableau chargé par page
+        self.afficher_tableau(True)
+
+        # Oublier la recherche précédente
+        self.recherche_participante.annuler()
 
         # Slots
         self.dock_widget.widget().btn_add.clicked.connect(self.nouvelle_participante)
-        self.table_widget.clicked.connect(self.edit_participante)
-        self.dock_widget.widget().txt_search.textEdited.connect(self.update_liste_participante)
-        self.dock_widget.widget().cbx_sort.currentIndexChanged.connect(self.update_liste_participante)
-        self.dock_widget.widget().chk_membre.toggled.connect(self.update_liste_participante)
-        self.dock_widget.widget().chk_desc.toggled.connect(self.update_liste_participante)
+        self.dock_widget.widget().txt_search.textEdited.connect(self.recherche_participante.demarrer)
+        self.dock_widget.widget().cbx_sort.currentIndexChanged.connect(self.recherche_participante.executer)
+        self.dock_widget.widget().chk_membre.toggled.connect(self.recherche_participante.executer)
+        self.dock_widget.widget().chk_desc.toggled.connect(self.recherche_participante.executer)
 
         # Afficher la liste
         self.update_liste_participante()
@@ -449,7 +501,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         Argument :
             index : Index de la colonne
         """
-        participante_id = self.table_widget.item(index.row(), 0).text()
+        participante_id = str(self.modele_participante.id_participante(index.row()))
+        from guide.membre.participante import UpdateParticipant
         modifier_participante = UpdateParticipant(participante_id, self.DATABASE)
         modifier_participante.accepted.connect(self.update_liste_participante)
         modifier_participante.exec()
@@ -458,6 +511,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog pour creer une nouvelle participante
         """
+        from guide.membre.participante import NewParticipant
         nouvelle_participante = NewParticipant(self.DATABASE)
         nouvelle_participante.accepted.connect(self.update_liste_participante)
         nouvelle_participante.exec()
@@ -465,6 +519,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def update_liste_participante(self):
         """
         Met à jour la liste des participantes lorsque les options de tri sont modifiées
+
+        Les lignes sont chargées par page par le modèle lorsque le tableau défile.
         """
         # Obtenir la liste des participantes dans la base de donnée
 
@@ -490,16 +546,36 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                             "ON membre.id_participante = participante.id_participante "
 
         # Ajout des options de recherche
+        valeurs = dict()
+        colonne_recherche = None
+        recherche_texte = False
         search = self.dock_widget.widget().txt_search.text()
         if search != "":
             if self.dock_widget.widget().cbx_search.currentText() == "Prénom":
-                sql = sql + "WHERE participante.prenom LIKE '{}%' ".format(search)
+                colonne_recherche = 1
+                colonne_sql, colonne_index = "participante.prenom", "prenom"
             elif self.dock_widget.widget().cbx_search.currentText() == "Nom":
-                sql = sql + "WHERE participante.nom LIKE '{}%' ".format(search)
+                colonne_recherche = 2
+                colonne_sql, colonne_index = "participante.nom", "nom"
             elif self.dock_widget.widget().cbx_search.currentText() == "Ville":
-                sql = sql + "WHERE participante.ville LIKE '{}%' ".format(search)
+                colonne_recherche = 3
+                colonne_sql, colonne_index = "participante.ville", "ville"
+            else:
+                colonne_recherche = 5
+                colonne_sql, colonne_index = "participante.telephone_1", None
+                search = str(data_processing.check_phone_number(search))
+
+            # Recherche dans l'index plein texte (sans accents)
+            if colonne_index and index_recherche.disponible(self.DATABASE):
+                recherche_texte = True
+                expression = index_recherche.expression(search, [colonne_index])
+                if expression:
+                    sql = sql + "WHERE " + index_recherche.filtre("participante.id_participante",
+                                                                  index_recherche.TYPE_PARTICIPANTE)
+                    valeurs['recherche'] = expression
             else:
-                sql = sql + "WHERE participante.telephone_1 LIKE '{}%' ".format(data_processing.check_phone_number(search))
+                sql = sql + "WHERE " + colonne_sql + " LIKE :recherche "
+                valeurs['recherche'] = search + "%"
 
         # Ajouter les options de tri
         if self.dock_widget.widget().cbx_sort.currentText() == "Prénom":
@@ -519,44 +595,31 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         else:
             sql = sql + "ASC "
 
-        # Exécution de la requête
-        query = QSqlQuery(self.DATABASE)
-        query.exec_(sql)
+        # Clé de tri unique pour que les pages soient stables
+        sql = sql + ", participante.id_participante "
 
-        # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
+        # Afficher le prénom avant le nom lorsque la liste est triée par prénom
+        self.modele_participante.PRENOM_NOM = self.dock_widget.widget().cbx_sort.currentText() == "Prénom"
 
-        # Vider la table des éléments existants
-        self.table_widget.setRowCount(0)
+        # Options de la liste affichée
+        options = (self.dock_widget.widget().cbx_search.currentText(),
+                   self.dock_widget.widget().chk_membre.isChecked(),
+                   self.dock_widget.widget().cbx_sort.currentText(),
+                   self.dock_widget.widget().chk_desc.isChecked())
 
-        # Ajouter les éléments de la requête à la table des participantes
-        while query.next():
-            self.table_widget.insertRow(self.table_widget.rowCount())
-            r = self.table_widget.rowCount() - 1
-
-            self.table_widget.setItem(r, 0, QTableWidgetItem(str(query.value(0))))
-
-            if self.dock_widget.widget().cbx_sort.currentText() == "Prénom":
-                if not query.value(2) == "":
-                    nom = str(query.value(1)) + " " + str(query.value(2))
-                else:
-                    nom = str(query.value(1))
+        # Filtrer la liste précédente en mémoire si la recherche prolonge la recherche précédente
+        if self.recherche_participante.peut_filtrer(search, options, self.modele_participante.COMPLET):
+            if recherche_texte:
+                self.modele_participante.filtrer(
+                    sql, valeurs, lambda ligne: index_recherche.correspond(ligne[colonne_recherche], search))
             else:
-                if not query.value(2) == "":
-                    nom = str(query.value(2)) + ", " + str(query.value(1))
-                else:
-                    nom = str(query.value(1))
-
-            self.table_widget.setItem(r, 1, QTableWidgetItem(nom))
+                self.modele_participante.filtrer(sql, valeurs,
+                                                 lambda ligne: like(ligne[colonne_recherche], search))
+        # Charger la première page de la liste
+        else:
+            self.modele_participante.set_requete(sql, valeurs)
 
-            self.table_widget.setItem(r, 2, QTableWidgetItem(str(query.value(3))))
-            self.table_widget.setItem(r, 3, QTableWidgetItem(str(query.value(4))))
-            phone_number_string = str(query.value(5))
-            phone_number = phone_number_string[:3] + " " + phone_number_string[3:6] + "-" + phone_number_string[6:]
-            if query.value(6) is None:
-                phone_number = phone_number + " p. " + str(query.value(6))
-            self.table_widget.setItem(r, 4, QTableWidgetItem(phone_number))
-            self.table_widget.setItem(r, 5, QTableWidgetItem(str(query.value(7))))
+        self.recherche_participante.enregistrer(search, options)
 
     def afficher_activite(self):
         """
@@ -570,6 +633,12 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Deconnection des signaux existants
         self.table_widget.disconnect()
 
+        # Afficher le tableau de la fenêtre principale
+        self.afficher_tableau(False)
+
+        # Oublier la recherche précédente
+        self.recherche_activite.annuler()
+
         # Vider le table widget
         self.table_widget.setRowCount(0)
 
@@ -586,11 +655,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         # Slots
         self.dock_widget.widget().btn_add.clicked.connect(self.nouvelle_activite)
-        self.dock_widget.widget().txt_search.textEdited.connect(self.update_liste_activite)
-        self.dock_widget.widget().cbx_sort.currentIndexChanged.connect(self.update_liste_activite)
-        self.dock_widget.widget().chk_desc.toggled.connect(self.update_liste_activite)
-        self.dock_widget.widget().ded_start.dateChanged.connect(self.update_liste_activite)
-        self.dock_widget.widget().ded_end.dateChanged.connect(self.update_liste_activite)
+        self.dock_widget.widget().txt_search.textEdited.connect(self.recherche_activite.demarrer)
+        self.dock_widget.widget().cbx_sort.currentIndexChanged.connect(self.recherche_activite.executer)
+        self.dock_widget.widget().chk_desc.toggled.connect(self.recherche_activite.executer)
+        self.dock_widget.widget().ded_start.dateChanged.connect(self.recherche_activite.executer)
+        self.dock_widget.widget().ded_end.dateChanged.connect(self.recherche_activite.executer)
         self.table_widget.clicked.connect(self.informations_activite)
 
         # Update GUI elements
@@ -601,6 +670,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog pour creer une nouvelle activité
         """
+        from guide.activite.activite import NouvelleActivite
         nouvelle_activite = NouvelleActivite(self.DATABASE)
         nouvelle_activite.accepted.connect(self.update_liste_activite)
         nouvelle_activite.exec()
@@ -613,6 +683,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             index : Index de la colonne
         """
         id_activite = self.table_widget.item(index.row(), 0).text()
+        from guide.activite.activite import AfficherActivite
         afficher = AfficherActivite(self.DATABASE, id_activite)
         afficher.accepted.connect(self.update_liste_activite)
         afficher.exec()
@@ -621,9 +692,6 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Met à jour la liste des activités lorsque les options de tri sont modifiées
         """
-        # Fetch data from database
-        query = QSqlQuery(self.DATABASE)
-
         sql = "SELECT "\
                 "activite.id_activite, "\
                 "activite.date, "\
@@ -639,27 +707,33 @@ class MainWindow(QMainWindow, Ui_MainWindow):
               "LEFT JOIN categorie_activite "\
                 "ON activite.id_categorie_activite = categorie_activite.id_categorie_activite " \
               "LEFT JOIN lieu ON "\
-                "categorie_activite.id_lieu = lieu.id_lieu "
+                "categorie_activite.id_lieu = lieu.id_lieu " \
+              "WHERE activite.date >= :date_debut " \
+                "AND activite.date <= :date_fin " \
+                "AND activite.status = 1 "
 
         # Ajout des options de recherche
+        colonne_recherche = None
+        valeur_recherche = None
+        recherche_texte = index_recherche.disponible(self.DATABASE)
         search = self.dock_widget.widget().txt_search.text()
         if search != "":
             if self.dock_widget.widget().cbx_search.currentText() == "Nom de l'activité":
-                sql = sql + "WHERE categorie_activite.nom LIKE '%{}%' ".format(search)
+                colonne_recherche = 5
+                colonne_sql, colonne_id, type_ligne = "categorie_activite.nom", \
+                    "categorie_activite.id_categorie_activite", index_recherche.TYPE_CATEGORIE_ACTIVITE
             else:
-                sql = sql + "WHERE lieu.nom LIKE '%{}%' ".format(search)
-
-            sql = sql + "AND strftime('%s', activite.date) >= " + \
-                        "strftime('%s', '" + str(self.dock_widget.widget().ded_start.date().toString('yyyy-MM-dd')) + "')" + \
-                        " AND strftime('%s', activite.date) <= strftime('%s', '" + \
-                        "strftime('%s', '" + str(self.dock_widget.widget().ded_end.date().toString('yyyy-MM-dd')) + "') " + \
-                        " AND activite.status = 1 "
-        else:
-            sql = sql + "WHERE strftime('%s', activite.date) >= " + \
-                        "strftime('%s', '" + str(self.dock_widget.widget().ded_start.date().toString('yyyy-MM-dd')) + "')" + \
-                        " AND strftime('%s', activite.date) <= " + \
-                        "strftime('%s', '"+ str(self.dock_widget.widget().ded_end.date().toString('yyyy-MM-dd')) + "') " + \
-                        " AND activite.status = 1 "
+                colonne_recherche = 6
+                colonne_sql, colonne_id, type_ligne = "lieu.nom", "lieu.id_lieu", index_recherche.TYPE_LIEU
+
+            # Recherche dans l'index plein texte (sans accents)
+            if recherche_texte:
+                valeur_recherche = index_recherche.expression(search, ["nom"])
+                if valeur_recherche:
+                    sql = sql + "AND " + index_recherche.filtre(colonne_id, type_ligne)
+            else:
+                sql = sql + "AND " + colonne_sql + " LIKE :recherche "
+                valeur_recherche = "%" + search + "%"
 
         # Ajouter les options de tri
         if self.dock_widget.widget().cbx_sort.currentText() == "Nom de l'activité":
@@ -678,41 +752,69 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             sql = sql + "DESC "
         else:
             sql = sql + "ASC "
-        print(sql)
-        query.exec_(sql)
 
-        # Affichage d'un message d'erreur si la requete echoue
-        database_error.sql_error_handler(query.lastError())
+        # Options de la liste affichée
+        date_debut = self.dock_widget.widget().ded_start.date().toString('yyyy-MM-dd')
+        date_fin = self.dock_widget.widget().ded_end.date().toString('yyyy-MM-dd')
+        options = (self.dock_widget.widget().cbx_search.currentText(),
+                   self.dock_widget.widget().cbx_sort.currentText(),
+                   self.dock_widget.widget().chk_desc.isChecked(),
+                   date_debut, date_fin)
+
+        # Filtrer la liste précédente en mémoire si la recherche prolonge la recherche précédente
+        if self.recherche_activite.peut_filtrer(search, options):
+            if recherche_texte:
+                self.LIGNES_ACTIVITE = [ligne for ligne in self.LIGNES_ACTIVITE
+                                        if index_recherche.correspond(ligne[colonne_recherche], search)]
+            else:
+                self.LIGNES_ACTIVITE = [ligne for ligne in self.LIGNES_ACTIVITE
+                                        if like(ligne[colonne_recherche], search, prefixe=False)]
+        else:
+            # Fetch data from database
+            query = QSqlQuery(self.DATABASE)
+            query.prepare(sql)
+            query.bindValue(':date_debut', date_debut)
+            query.bindValue(':date_fin', date_fin)
+            if valeur_recherche:
+                query.bindValue(':recherche', valeur_recherche)
+            query.exec_()
+
+            # Affichage d'un message d'erreur si la requete echoue
+            database_error.sql_error_handler(query.lastError())
+
+            self.LIGNES_ACTIVITE = list()
+            while query.next():
+                self.LIGNES_ACTIVITE.append(tuple(query.value(i) for i in range(10)))
+
+        self.recherche_activite.enregistrer(search, options)
 
         # Show data in table widget
         self.table_widget.setRowCount(0)
+        self.table_widget.setRowCount(len(self.LIGNES_ACTIVITE))
 
-        while query.next():
-            self.table_widget.insertRow(self.table_widget.rowCount())
-            r = self.table_widget.rowCount() - 1
-
-            self.table_widget.setItem(r, 0, QTableWidgetItem(str(query.value(0))))
+        for r, ligne in enumerate(self.LIGNES_ACTIVITE):
+            self.table_widget.setItem(r, 0, QTableWidgetItem(str(ligne[0])))
 
-            nom_activite = str(query.value(9))
+            nom_activite = ligne[9]
             if nom_activite:
-                self.table_widget.setItem(r, 1, QTableWidgetItem(str(query.value(5) + " - " + nom_activite)))
+                self.table_widget.setItem(r, 1, QTableWidgetItem(str(ligne[5]) + " - " + str(nom_activite)))
             else:
-                self.table_widget.setItem(r, 1, QTableWidgetItem(str(query.value(5))))
-            self.table_widget.setItem(r, 2, QTableWidgetItem(str(query.value(6))))
+                self.table_widget.setItem(r, 1, QTableWidgetItem(str(ligne[5])))
+            self.table_widget.setItem(r, 2, QTableWidgetItem(str(ligne[6])))
 
-            prix = "Membre : {0:.2f}$".format(query.value(7)) + "\n" \
-                   + "Régulier : {0:.2f}$".format(query.value(8))
+            prix = "Membre : {0:.2f}$".format(ligne[7]) + "\n" \
+                   + "Régulier : {0:.2f}$".format(ligne[8])
             self.table_widget.setItem(r, 3, QTableWidgetItem(prix))
 
-            date_activite = QDate.fromString(query.value(1), 'yyyy-MM-dd').toString('dd MMM yyyy')
+            date_activite = QDate.fromString(ligne[1], 'yyyy-MM-dd').toString('dd MMM yyyy')
             self.table_widget.setItem(r, 4, QTableWidgetItem(date_activite))
 
-            heure_debut = QTime.fromString(query.value(2), 'HH:mm').toString('hh:mm')
-            heure_fin = QTime.fromString(query.value(3), 'HH:mm').toString('hh:mm')
+            heure_debut = QTime.fromString(ligne[2], 'HH:mm').toString('hh:mm')
+            heure_fin = QTime.fromString(ligne[3], 'HH:mm').toString('hh:mm')
             heure = heure_debut + " à " + heure_fin
             self.table_widget.setItem(r, 5, QTableWidgetItem(heure))
 
-            date_limite = QDate.fromString(query.value(4), 'yyyy-MM-dd').toString('dd MMM yyyy')
+            date_limite = QDate.fromString(ligne[4], 'yyyy-MM-dd').toString('dd MMM yyyy')
             self.table_widget.setItem(r, 6, QTableWidgetItem(date_limite))
 
     def afficher_categorie_activite(self):
@@ -725,6 +827,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Deconnection des signaux existants
         self.table_widget.disconnect()
 
+        # Afficher le tableau de la fenêtre principale
+        self.afficher_tableau(False)
+
         # Table widget parameters
         self.table_widget.setColumnCount(7)
         self.table_widget.setColumnHidden(0, True)
@@ -751,6 +856,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog pour créer une nouvelle catégorie d'activité
         """
+        from guide.activite.categorie_activite import NouvelleCategorieActivite
         categorie_activite = NouvelleCategorieActivite(self.DATABASE)
         categorie_activite.accepted.connect(self.update_liste_categorie_activite)
         categorie_activite.exec()
@@ -763,6 +869,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             index : Index de la colonne
         """
         id_categorie_activite = self.table_widget.item(index.row(), 0).text()
+        from guide.activite.categorie_activite import ModifierCategorieActivite
         modifier_categorie_activite = ModifierCategorieActivite(id_categorie_activite, 
                                                                 self.DATABASE)
         modifier_categorie_activite.accepted.connect(self.update_liste_categorie_activite)
@@ -795,15 +902,31 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 "ON categorie_activite.id_type_activite = type_activite.id_type_activite "
 
         # Ajout des options de recherche
+        valeur_recherche = None
         search = self.dock_widget.widget().txt_search.text()
         if search != "":
-            if self.dock_widget.widget().cbx_search.currentText() == "Nom de la catégorie":
-                sql = sql + "WHERE categorie_activite.nom LIKE '%{}%' ".format(search)
-            elif self.dock_widget.widget().cbx_search.currentText() == "Responsable":
-                sql = sql + "WHERE responsable.prenom LIKE '%{0}%' " \
-                            "OR responsable.nom LIKE '%{0}%' ".format(search)
+            # Recherche dans l'index plein texte (sans accents)
+            if index_recherche.disponible(self.DATABASE):
+                if self.dock_widget.widget().cbx_search.currentText() == "Nom de la catégorie":
+                    colonne_id, type_ligne = "categorie_activite.id_categorie_activite", \
+                        index_recherche.TYPE_CATEGORIE_ACTIVITE
+                elif self.dock_widget.widget().cbx_search.currentText() == "Responsable":
+                    colonne_id, type_ligne = "responsable.id_responsable", index_recherche.TYPE_RESPONSABLE
+                else:
+                    colonne_id, type_ligne = "lieu.id_lieu", index_recherche.TYPE_LIEU
+
+                valeur_recherche = index_recherche.expression(search, ["nom", "prenom"])
+                if valeur_recherche:
+                    sql = sql + "WHERE " + index_recherche.filtre(colonne_id, type_ligne)
             else:
-                sql = sql + "WHERE lieu.nom LIKE '%{}%' ".format(search)
+                if self.dock_widget.widget().cbx_search.currentText() == "Nom de la catégorie":
+                    sql = sql + "WHERE categorie_activite.nom LIKE :recherche "
+                elif self.dock_widget.widget().cbx_search.currentText() == "Responsable":
+                    sql = sql + "WHERE ifnull(responsable.prenom, '') || ' ' || ifnull(responsable.nom, '') " \
+                                "LIKE :recherche "
+                else:
+                    sql = sql + "WHERE lieu.nom LIKE :recherche "
+                valeur_recherche = "%" + search + "%"
 
         # Ajouter les options de tri
         if self.dock_widget.widget().cbx_sort.currentText() == "Nom de la catégorie":
@@ -822,7 +945,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             sql = sql + "DESC "
         else:
             sql = sql + "ASC "
-        query.exec_(sql)
+        query.prepare(sql)
+        if valeur_recherche:
+            query.bindValue(':recherche', valeur_recherche)
+        query.exec_()
 
         # Affichage d'un message d'erreur si la requete echoue
         database_error.sql_error_handler(query.lastError())
@@ -860,6 +986,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Deconnection des signaux existants
         self.table_widget.disconnect()
 
+        # Afficher le tableau de la fenêtre principale
+        self.afficher_tableau(False)
+
         # Table widget parameters
         self.table_widget.setColumnCount(5)
         self.table_widget.setColumnHidden(0, True)
@@ -885,6 +1014,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         Ouvre le dialog pour créer un nouveau lieu
         """
+        from guide.activite.lieu import NouveauLieu
         lieu = NouveauLieu(self.DATABASE)
         lieu.accepted.connect(self.update_liste_lieu)
         lieu.exec()
@@ -897,6 +1027,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             index : Index de la colonne
         """
         id_lieu = self.table_widget.item(index.row(), 0).text()
+        from guide.activite.lieu import ModifierLieu
         modifier_lieu = ModifierLieu(id_lieu, self.DATABASE)
         modifier_lieu.accepted.connect(self.update_liste_lieu)
         modifier_lieu.exec()
@@ -917,12 +1048,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 "lieu "
 
         # Ajout des options de recherche
+        valeur_recherche = None
         search = self.dock_widget.widget().txt_search.text()
         if search != "":
             if self.dock_widget.widget().cbx_search.currentText() == "Nom du lieu":
-                sql = sql + "WHERE nom LIKE '%{}%' ".format(search)
+                colonne_sql, colonne_index = "nom", "nom"
+            else:
+                colonne_sql, colonne_index = "ville", "ville"
+
+            # Recherche dans l'index plein texte (sans accents)
+            if index_recherche.disponible(self.DATABASE):
+                valeur_recherche = index_recherche.expression(search, [colonne_index])
+                if valeur_recherche:
+                    sql = sql + "WHERE " + index_recherche.filtre("id_lieu", index_recherche.TYPE_LIEU)
             else:
-                sql = sql + "WHERE ville LIKE '%{}%' ".format(search)
+                sql = sql + "WHERE " + colonne_sql + " LIKE :recherche "
+                valeur_recherche = "%" + search + "%"
 
         # Ajouter les options de tri
         if self.dock_widget.widget().cbx_sort.currentText() == "Nom du lieu":
@@ -935,7 +1076,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             sql = sql + "DESC "
         else:
             sql = sql + "ASC "
-        query.exec_(sql)
+        query.prepare(sql)
+        if valeur_recherche:
+            query.bindValue(':recherche', valeur_recherche)
+        query.exec_()
 
         # Affichage d'un message d'erreur si la requete echoue
         database_error.sql_error_handler(query.lastError())
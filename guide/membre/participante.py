@@ -40,6 +40,7 @@ from guide.script.interface import completer
 from guide.script.data import data_error
 from guide.script.data import parsing
 from guide.script.database import sqlite_query
+from guide.script.database import annuaire
 
 # Interface import
 from guide.interface.ui_participante import Ui_Participante
@@ -264,17 +265,16 @@ class _Participant(QDialog, Ui_Participante):
         Afficher les informations sur le membre
         """
         # Obtenir les informations de la base de données
-        successfull, query = sqlite_query.execute(":/member/participant/member/participant/member_informations.sql",
-                                                  {'id_participante': int(self.ID_PARTICIPANTE)}, self.DATABASE)
+        with sqlite_query.select(":/member/participant/member/participant/member_informations.sql",
+                                 {'id_participante': int(self.ID_PARTICIPANTE)}, self.DATABASE) as (successfull, query):
+            if successfull and query.first() and int(query.value('actif')):
+                self.add_member_ui_elements(bool(query.value('membre_honoraire')))
+                self.chk_honoraire.setChecked(bool(query.value('membre_honoraire')))
+                self.txt_numero_membre.setText(str(query.value('numero_membre')))
 
-        if successfull and query.first() and int(query.value('actif')):
-            self.add_member_ui_elements(bool(query.value('membre_honoraire')))
-            self.chk_honoraire.setChecked(bool(query.value('membre_honoraire')))
-            self.txt_numero_membre.setText(str(query.value('numero_membre')))
-
-            if not bool(query.value('membre_honoraire')):
-                date = QDate.fromString(query.value('date_renouvellement'), 'yyyy-MM-dd')
-                self.ded_renouvellement.setDate(date)
+                if not bool(query.value('membre_honoraire')):
+                    date = QDate.fromString(query.value('date_renouvellement'), 'yyyy-MM-dd')
+                    self.ded_renouvellement.setDate(date)
 
     def add_member_ui_elements(self, honorary=False):
         """
@@ -354,63 +354,62 @@ class _Participant(QDialog, Ui_Participante):
         """
         Show transactions made by the participant.
         """
-        successfull, query = sqlite_query.execute(":/member/participant/member/participant/participant_transactions.sql",
-                                                  {'id_participante': self.ID_PARTICIPANTE}, self.DATABASE)
-
-        if successfull:
-            while query.next():
-                self.tbl_transaction.insertRow(self.tbl_transaction.rowCount())
-                r = self.tbl_transaction.rowCount() - 1
+        with sqlite_query.select(":/member/participant/member/participant/participant_transactions.sql",
+                                 {'id_participante': self.ID_PARTICIPANTE}, self.DATABASE) as (successfull, query):
+            if successfull:
+                while query.next():
+                    self.tbl_transaction.insertRow(self.tbl_transaction.rowCount())
+                    r = self.tbl_transaction.rowCount() - 1
 
-                self.tbl_transaction.setItem(r, 0, QTableWidgetItem(str(query.value(1))))
+                    self.tbl_transaction.setItem(r, 0, QTableWidgetItem(str(query.value(1))))
 
-                prix = "{0:.2f}$".format(query.value(2))
-                self.tbl_transaction.setItem(r, 1, QTableWidgetItem(prix))
+                    prix = "{0:.2f}$".format(query.value(2))
+                    self.tbl_transaction.setItem(r, 1, QTableWidgetItem(prix))
 
-                date = QDateTime().fromString(query.value(0), 'yyyy-MM-dd hh:mm:ss').date().toString('dd MMM yyyy')
-                self.tbl_transaction.setItem(r, 2, QTableWidgetItem(date))
+                    date_transaction = QDateTime().fromString(query.value(0), 'yyyy-MM-dd hh:mm:ss').date()
+                    date = date_transaction.toString('dd MMM yyyy')
+                    self.tbl_transaction.setItem(r, 2, QTableWidgetItem(date))
 
     def show_participante_informations(self):
         """
         Affiche les informations de la participante
         """
-        successfull, query = sqlite_query.execute(":/member/participant/member/participant/participant_informations.sql",
-                                                  {'id_participante': int(self.ID_PARTICIPANTE)}, self.DATABASE)
-
-        query.first()
-
-        # Add informations to form
-        self.cbx_appelation.setCurrentText(query.value('appellation'))
-        self.txt_prenom.setText(query.value('prenom'))
-        self.txt_nom.setText(query.value('nom'))
-        self.txt_adresse1.setText(query.value('adresse_1'))
-        self.txt_adresse2.setText(query.value('adresse_2'))
-        self.txt_ville.setText(query.value('ville'))
-        self.cbx_province.setCurrentText(query.value('province'))
-        self.txt_code_postal.setText(query.value('code_postal'))
-        self.txt_email.setText(query.value('courriel'))
-
-        # Set phone number format
-        telephone1_str = str(query.value('telephone_1'))
-        telephone1 = telephone1_str[:3] + " " + telephone1_str[3:6] + "-" + telephone1_str[6:]
-
-        self.txt_telephone1.setText(telephone1)
-        self.txt_poste1.setText(str(query.value('poste_telephone_1')))
-
-        # Set phone number 2 format if the phone number exist only
-        if query.value('telephone_2'):
-            telephone2_str = str(query.value('telephone_2'))
-            telephone2 = telephone2_str[:3] + " " + telephone2_str[3:6] + "-" + telephone2_str[6:]
-            self.txt_telephone2.setText(telephone2)
-
-        self.txt_poste2.setText(str(query.value('poste_telephone_2')))
-        self.sbx_annee_naissance.setValue(int(query.value('date_naissance')))
-        self.sbx_personnes_nourries.setValue(int(query.value('personne_nourrie')))
-
-        if int(query.value('consentement_photo')):
-            self.cbx_photo.setChecked(True)
-        else:
-            self.cbx_photo.setChecked(False)
+        with sqlite_query.select(":/member/participant/member/participant/participant_informations.sql",
+                                 {'id_participante': int(self.ID_PARTICIPANTE)}, self.DATABASE) as (successfull, query):
+            query.first()
+
+            # Add informations to form
+            self.cbx_appelation.setCurrentText(query.value('appellation'))
+            self.txt_prenom.setText(query.value('prenom'))
+            self.txt_nom.setText(query.value('nom'))
+            self.txt_adresse1.setText(query.value('adresse_1'))
+            self.txt_adresse2.setText(query.value('adresse_2'))
+            self.txt_ville.setText(query.value('ville'))
+            self.cbx_province.setCurrentText(query.value('province'))
+            self.txt_code_postal.setText(query.value('code_postal'))
+            self.txt_email.setText(query.value('courriel'))
+
+            # Set phone number format
+            telephone1_str = str(query.value('telephone_1'))
+            telephone1 = telephone1_str[:3] + " " + telephone1_str[3:6] + "-" + telephone1_str[6:]
+
+            self.txt_telephone1.setText(telephone1)
+            self.txt_poste1.setText(str(query.value('poste_telephone_1')))
+
+            # Set phone number 2 format if the phone number exist only
+            if query.value('telephone_2'):
+                telephone2_str = str(query.value('telephone_2'))
+                telephone2 = telephone2_str[:3] + " " + telephone2_str[3:6] + "-" + telephone2_str[6:]
+                self.txt_telephone2.setText(telephone2)
+
+            self.txt_poste2.setText(str(query.value('poste_telephone_2')))
+            self.sbx_annee_naissance.setValue(int(query.value('date_naissance')))
+            self.sbx_personnes_nourries.setValue(int(query.value('personne_nourrie')))
+
+            if int(query.value('consentement_photo')):
+                self.cbx_photo.setChecked(True)
+            else:
+                self.cbx_photo.setChecked(False)
 
         self.show_member_informations()
 
@@ -423,22 +422,21 @@ class _Participant(QDialog, Ui_Participante):
             'current_date': QDate.currentDate().toString('yyyy-MM-dd'),
             'status': facturation.STATUS_INSCRIPTION
         }
-        successfull, query = sqlite_query.execute(":/member/participant/member/participant/participant_inscription.sql",
-                                                  prepared_data, self.DATABASE)
-
-        while query.next():
-            self.tbl_inscription.insertRow(self.tbl_inscription.rowCount())
-            r = self.tbl_inscription.rowCount() - 1
+        with sqlite_query.select(":/member/participant/member/participant/participant_inscription.sql",
+                                 prepared_data, self.DATABASE) as (successfull, query):
+            while query.next():
+                self.tbl_inscription.insertRow(self.tbl_inscription.rowCount())
+                r = self.tbl_inscription.rowCount() - 1
 
-            self.tbl_inscription.setItem(r, 0, QTableWidgetItem(str(query.value('categorie_activite.nom'))))
+                self.tbl_inscription.setItem(r, 0, QTableWidgetItem(str(query.value('categorie_activite.nom'))))
 
-            date = QDate().fromString(query.value('activite.date'), 'yyyy-MM-dd').toString('dd MMM yyyy')
-            self.tbl_inscription.setItem(r, 1, QTableWidgetItem(date))
+                date = QDate().fromString(query.value('activite.date'), 'yyyy-MM-dd').toString('dd MMM yyyy')
+                self.tbl_inscription.setItem(r, 1, QTableWidgetItem(date))
 
-            heure_debut = QTime.fromString(query.value('activite.heure_debut'), 'HH:mm').toString('hh:mm')
-            heure_fin = QTime.fromString(query.value('activite.heure_fin'), 'HH:mm').toString('hh:mm')
-            heure = heure_debut + " à " + heure_fin
-            self.tbl_inscription.setItem(r, 2, QTableWidgetItem(heure))
+                heure_debut = QTime.fromString(query.value('activite.heure_debut'), 'HH:mm').toString('hh:mm')
+                heure_fin = QTime.fromString(query.value('activite.heure_fin'), 'HH:mm').toString('hh:mm')
+                heure = heure_debut + " à " + heure_fin
+                self.tbl_inscription.setItem(r, 2, QTableWidgetItem(heure))
 
 
 class NewParticipant(_Participant):
@@ -467,14 +465,14 @@ class NewParticipant(_Participant):
         """
         if self.check_fields():
             self.process_data()
-            successfull, query = sqlite_query.execute(":/global/global/last_insert_rowid.sql", None, self.DATABASE)
-            query.first()
+            with sqlite_query.select(":/global/global/last_insert_rowid.sql", None,
+                                     self.DATABASE) as (successfull, query):
+                query.first()
+                self.ID_PARTICIPANTE = query.value(0)
 
             nom = self.txt_prenom.text() + " " + self.txt_nom.text()
             phone = self.txt_telephone1.text()
 
-            self.ID_PARTICIPANTE = query.value(0)
-
             inscription_membre = NouvelleInscription(nom, phone, self.ID_PARTICIPANTE, self.DATABASE)
             inscription_membre.accepted.connect(self.show_member_informations)
             inscription_membre.rejected.connect(self.member_inscription_canceled)
@@ -502,6 +500,10 @@ class NewParticipant(_Participant):
             else:
                 successfull = sqlite_query.execute(":/member/participant/member/participant/create_participant.sql",
                                                    prepared_data, self.DATABASE)
+
+            # Les numéros de téléphone de la participante ont changé
+            annuaire.invalider()
+
             if successfull:
                 if self.sender() == self.btn_add:
                     self.accept()
@@ -536,6 +538,10 @@ class UpdateParticipant(_Participant):
         if prepared_data is not None:
             successfull = sqlite_query.execute(":/member/participant/member/participant/update_participant.sql",
                                                prepared_data, self.DATABASE)
+
+            # Les numéros de téléphone de la participante ont changé
+            annuaire.invalider()
+
             if successfull:
                 if self.sender() == self.btn_add:
                     self.accept()
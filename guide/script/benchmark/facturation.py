@@ -0,0 +1,223 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Mesure de la performance de la facturation et des inscriptions
+
+Une base de données temporaire est générée avec guide.script.benchmark.generateur ou copiée à partir d'une base de
+données générée précédemment (--base). Les opérations du module guide.facturation.service sont ensuite exécutées sans interface
+graphique et leur durée est mesurée.
+
+Les mesures enregistrées et comparées sont faites par pytest-benchmark (tests/benchmark/test_facturation.py), qui
+utilise les opérations de ce module. La ligne de commande affiche seulement une mesure rapide :
+    python -m guide.script.benchmark.facturation [--base fichier.guide] [--participantes N] [--operations N]
+
+Methodes :
+    creer_base_donnees : Créer une base de données temporaire
+    dimensions : Obtenir le nombre de participantes, d'activités et d'inscriptions de la base de données
+    chronometrer : Mesurer la durée d'une opération
+    operations : Obtenir les opérations mesurées
+    mesurer : Mesurer la durée de chaque opération
+"""
+
+# Python import
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+# PyQt import
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+
+# Project import
+from guide.facturation import service
+from guide.facturation import places
+from guide.script.benchmark import generateur as generateur_donnees
+
+# Nom de la connexion utilisée pour la mesure
+CONNEXION = "benchmark"
+
+# Valeurs par défaut
+PARTICIPANTES = 2000
+CATEGORIES = 20
+SEMAINES = 15
+INSCRIPTIONS = 5
+OPERATIONS = 200
+
+
+def creer_base_donnees(dossier, generateur, participantes, categories, semaines, inscriptions, base=None):
+    """
+    Créer une base de données temporaire
+
+    La base de données est générée avec guide.script.benchmark.generateur ou copiée à partir d'une base de données
+    existante, puis ouverte avec le pilote QSQLITE.
+
+    :param dossier: Dossier de la base de données
+    :param generateur: random.Random
+    :param participantes: Nombre de participantes
+    :param categories: Nombre de catégories d'activité
+    :param semaines: Nombre de semaines d'activités
+    :param inscriptions: Nombre moyen d'inscriptions par participante
+    :param base: Base de données existante à copier ou None pour générer une base de données
+    :return: Base de données
+    """
+    fichier = os.path.join(dossier, "benchmark.guide")
+    if base is not None:
+        shutil.copyfile(base, fichier)
+    else:
+        connexion = sqlite3.connect(fichier, isolation_level=None)
+        connexion.execute("BEGIN")
+        generateur_donnees.creer_tables(connexion)
+        generateur_donnees.generer(connexion, generateur, participantes, categories, semaines, inscriptions)
+        generateur_donnees.terminer_schema(connexion)
+        connexion.execute("COMMIT")
+        connexion.close()
+
+    database = QSqlDatabase.addDatabase('QSQLITE', CONNEXION)
+    database.setDatabaseName(fichier)
+    if not database.open():
+        raise RuntimeError(database.lastError().text())
+    return database
+
+
+def dimensions(database):
+    """
+    Obtenir le nombre de participantes, d'activités et d'inscriptions de la base de données
+
+    :param database: Base de données
+    :return: (Participantes, Activités, Inscriptions)
+    """
+    query = QSqlQuery(database)
+    query.exec_("SELECT (SELECT max(id_participante) FROM participante), (SELECT max(id_activite) FROM activite), "
+                "(SELECT max(id_inscription) FROM inscription)")
+    query.first()
+    return int(query.value(0)), int(query.value(1)), int(query.value(2))
+
+
+def chronometrer(operation, repetitions):
+    """
+    Mesurer la durée d'une opération
+
+    :param operation: Fonction appelée avec le numéro de la répétition. Doit retourner une valeur vraie.
+    :param repetitions: Nombre de répétitions
+    :return: Durée totale en secondes
+    """
+    debut = time.perf_counter()
+    for i in range(repetitions):
+        if not operation(i):
+            raise RuntimeError("L'opération {} a échoué".format(operation.__name__))
+    return time.perf_counter() - debut
+
+
+def operations(database, generateur, repetitions):
+    """
+    Obtenir les opérations mesurées
+
+    Chaque opération est appelée avec le numéro de la répétition et retourne une valeur vraie si elle réussit. Les
+    participantes et les activités de chaque répétition sont tirées à l'avance.
+
+    :param database: Base de données
+    :param generateur: random.Random
+    :param repetitions: Nombre de répétitions de chaque opération
+    :return: Dictionnaire {Nom: Opération} dans l'ordre d'exécution
+    """
+    participantes, activites, nombre_inscription = dimensions(database)
+    moteur_facturation = service.MoteurFacturation(database)
+    moteur_inscription = service.MoteurInscription(database)
+    moteur_presence = service.MoteurPresence(database)
+    tirages = [(generateur.randint(1, participantes), generateur.sample(range(1, activites + 1), 3))
+               for _ in range(repetitions)]
+
+    def inscrire(i):
+        id_participante, liste_activite = tirages[i]
+        return moteur_inscription.enregistrer(id_participante, liste_activite[:2], liste_activite[2:])
+
+    def facturer(i):
+        id_participante, liste_activite = tirages[i]
+        articles = [service.creer_article(id_activite, "Activité", "", 10.0) for id_activite in liste_activite]
+        facture = service.creer_facture(id_participante, None, articles)
+        return moteur_facturation.enregistrer(facture) is not None
+
+    def rang(i):
+        return places.rangs(database, tirages[i][0]) is not None
+
+    def disponibilite(i):
+        return places.places(database, tirages[i][1][0]) is not None
+
+    def presence(i):
+        debut = (i * 60) % max(nombre_inscription - 60, 1) + 1
+        return moteur_presence.enregistrer(list(range(debut, debut + 30)), list(range(debut + 30, debut + 60)))
+
+    return {operation.__name__: operation for operation in (inscrire, facturer, rang, disponibilite, presence)}
+
+
+def mesurer(database, generateur, repetitions):
+    """
+    Mesurer la durée de chaque opération
+
+    :param database: Base de données
+    :param generateur: random.Random
+    :param repetitions: Nombre de répétitions de chaque opération
+    :return: Dictionnaire {Opération: Durée moyenne en millisecondes}
+    """
+    resultat = dict()
+    for nom, operation in operations(database, generateur, repetitions).items():
+        resultat[nom] = chronometrer(operation, repetitions) * 1000 / repetitions
+    return resultat
+
+
+def main(arguments=None):
+    """
+    Exécuter la mesure à partir de la ligne de commande
+
+    :param arguments: Arguments de la ligne de commande ou None pour sys.argv
+    :return: Code de sortie
+    """
+    parser = argparse.ArgumentParser(description="Mesure de la performance de la facturation et des inscriptions")
+    parser.add_argument("--base", help="Utiliser une copie d'une base de données existante")
+    parser.add_argument("--participantes", type=int, default=PARTICIPANTES)
+    parser.add_argument("--categories", type=int, default=CATEGORIES, help="Nombre de catégories d'activité")
+    parser.add_argument("--semaines", type=int, default=SEMAINES, help="Nombre de semaines d'activités")
+    parser.add_argument("--inscriptions", type=int, default=INSCRIPTIONS,
+                        help="Nombre moyen d'inscriptions par participante")
+    parser.add_argument("--operations", type=int, default=OPERATIONS, help="Nombre de répétitions de chaque opération")
+    parser.add_argument("--graine", type=int, default=0, help="Graine du générateur de données")
+    options = parser.parse_args(arguments)
+
+    # Le pilote QSQLITE est chargé par l'application
+    application = QCoreApplication(sys.argv[:1])
+    generateur = random.Random(options.graine)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        database = creer_base_donnees(dossier, generateur, options.participantes, options.categories,
+                                      options.semaines, options.inscriptions, options.base)
+        resultat = mesurer(database, generateur, options.operations)
+        database.close()
+    del database
+    QSqlDatabase.removeDatabase(CONNEXION)
+
+    print("{:<20} {:>12}".format("Opération", "ms / opération"))
+    for operation, duree in resultat.items():
+        print("{:<20} {:>12.3f}".format(operation, duree))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
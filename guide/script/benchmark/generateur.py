@@ -0,0 +1,352 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Génération d'une grande base de données pour les tests de charge
+
+La base de données est créée avec les définitions des tables du module guide.script.database.schema puis remplie avec
+des données générées : participantes, membres, catégories d'activité, activités hebdomadaires, inscriptions, factures et
+articles. Les mêmes paramètres et la même graine produisent toujours la même base de données.
+
+Les tables sont remplies avant la création des index et des modules dépendants (recherche, compteur des inscriptions,
+séquences), dont les migrations calculent leurs données à partir des tables existantes. Toutes les lignes sont
+ajoutées avec executemany dans une seule transaction, sans journal.
+
+Ce script utilise le module sqlite3 de Python et ne nécessite pas PyQt.
+
+Utilisation :
+    python -m guide.script.benchmark.generateur fichier.guide [--participantes N] [--categories N] [--semaines N]
+                                                [--inscriptions N] [--graine N] [--remplacer]
+
+Methodes :
+    creer_tables : Créer les tables des modules
+    terminer_schema : Créer les index, les modules dépendants et enregistrer la version des modules
+    generer : Remplir la base de données avec des données générées
+"""
+
+# Python import
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Project import
+from guide.script.database.schema import LISTE_MODULE, LISTE_MODULE_DEPENDANT
+
+# Status des inscriptions (voir guide.facturation.service)
+STATUS_INSCRIPTION_ANNULEE = 0
+STATUS_INSCRIPTION = 1
+STATUS_FACTURE = 2
+STATUS_REMBOURSE = 3
+
+# Proportion de chaque status parmi les inscriptions
+REPARTITION_STATUS = ((STATUS_FACTURE, 0.55), (STATUS_INSCRIPTION, 0.25), (STATUS_INSCRIPTION_ANNULEE, 0.12),
+                      (STATUS_REMBOURSE, 0.08))
+
+# Valeurs par défaut
+PARTICIPANTES = 10000
+CATEGORIES = 40
+SEMAINES = 52
+INSCRIPTIONS = 8
+PROPORTION_MEMBRE = 0.4
+ARTICLES_PAR_FACTURE = 3
+DEBUT = date(2019, 1, 7)
+
+# Nombre de lignes conservées en mémoire avant l'écriture d'une table
+TAILLE_LOT = 20000
+
+# Valeurs utilisées pour générer les participantes
+PRENOMS = ["Marie", "Julie", "Sophie", "Catherine", "Isabelle", "Nathalie", "Chantal", "Louise", "Émilie", "Geneviève",
+           "Annie", "Mélanie", "Josée", "Sylvie", "Manon", "Line", "Diane", "Lucie", "Karine", "Valérie"]
+NOMS = ["Tremblay", "Gagnon", "Roy", "Côté", "Bouchard", "Gauthier", "Morin", "Lavoie", "Fortin", "Gagné", "Ouellet",
+        "Pelletier", "Bélanger", "Lévesque", "Bergeron", "Leblanc", "Paquette", "Girard", "Simard", "Boucher"]
+VILLES = ["Saint-Jean-sur-Richelieu", "Iberville", "Saint-Luc", "Chambly", "Carignan", "Lacolle", "Napierville",
+          "Marieville"]
+APPELLATIONS = ["Mme.", "Mme.", "Mme.", "M.", "Autre"]
+
+# Requêtes d'insertion de chaque table
+INSERTION = {
+    'participante': "INSERT INTO participante (id_participante, appellation, prenom, nom, ville, province, "
+                    "telephone_1, telephone_2, date_naissance, personne_nourrie, consentement_photo) "
+                    "VALUES (?, ?, ?, ?, ?, 'QC', ?, ?, ?, ?, ?)",
+    'membre': "INSERT INTO membre (actif, id_participante, numero_membre, membre_honoraire, date_renouvellement) "
+              "VALUES (?, ?, ?, ?, ?)",
+    'inscription': "INSERT INTO inscription (id_participante, id_activite, status, present, time) "
+                   "VALUES (?, ?, ?, ?, ?)",
+    'facture': "INSERT INTO facture (id_facture, date, numero_recu, id_participante, total) VALUES (?, ?, ?, ?, ?)",
+    'article': "INSERT INTO article (id_facture, id_activite, prix, description) VALUES (?, ?, ?, ?)"
+}
+
+
+def creer_tables(connexion):
+    """
+    Créer les tables des modules
+
+    :param connexion: sqlite3.Connection
+    """
+    for table in LISTE_MODULE:
+        connexion.execute(table['query'])
+
+
+def terminer_schema(connexion):
+    """
+    Créer les index, les modules dépendants et enregistrer la version des modules
+
+    :param connexion: sqlite3.Connection
+    :return: Liste des modules installés
+    """
+    liste_table = list(LISTE_MODULE)
+
+    # Les modules dépendants sont ajoutés lorsque SQLite supporte leur option de compilation
+    for table in LISTE_MODULE_DEPENDANT:
+        option = table.get('option')
+        if option and not connexion.execute("SELECT sqlite_compileoption_used(?)", (option,)).fetchone()[0]:
+            continue
+        connexion.execute(table['query'])
+        liste_table.append(table)
+
+    for table in liste_table:
+        migration = table.get('migration', dict())
+        for version in sorted(migration):
+            for requete in migration[version]:
+                connexion.execute(requete)
+
+    connexion.executemany("INSERT INTO guide (module, version) VALUES (?, ?)",
+                          [(table['module'], table['version']) for table in liste_table])
+    return liste_table
+
+
+class Lots:
+    """
+    Lignes à ajouter dans chaque table
+
+    Les lignes d'une table sont écrites avec executemany lorsque leur nombre atteint la taille d'un lot.
+    """
+
+    def __init__(self, connexion, taille=TAILLE_LOT):
+        self.CONNEXION = connexion
+        self.TAILLE = taille
+        self.LIGNES = {table: list() for table in INSERTION}
+        self.COMPTE = {table: 0 for table in INSERTION}
+
+    def ajouter(self, table, ligne):
+        """
+        Ajouter une ligne à une table
+
+        :param table: Nom de la table
+        :param ligne: Tuple des valeurs
+        """
+        lignes = self.LIGNES[table]
+        lignes.append(ligne)
+        if len(lignes) >= self.TAILLE:
+            self.ecrire(table)
+
+    def ecrire(self, table=None):
+        """
+        Écrire les lignes en attente
+
+        :param table: Nom de la table ou None pour toutes les tables
+        """
+        for nom in [table] if table else list(self.LIGNES):
+            self.CONNEXION.executemany(INSERTION[nom], self.LIGNES[nom])
+            self.COMPTE[nom] += len(self.LIGNES[nom])
+            self.LIGNES[nom] = list()
+
+
+def generer(connexion, generateur, participantes=PARTICIPANTES, categories=CATEGORIES, semaines=SEMAINES,
+            inscriptions=INSCRIPTIONS, debut=DEBUT):
+    """
+    Remplir la base de données avec des données générées
+
+    Chaque catégorie d'activité a une activité par semaine. Les inscriptions d'une participante sont réparties entre
+    les status selon REPARTITION_STATUS. Les inscriptions facturées et remboursées ont une facture. Les présences sont
+    enregistrées pour les activités facturées qui ont eu lieu avant le milieu de la période.
+
+    :param connexion: sqlite3.Connection
+    :param generateur: random.Random
+    :param participantes: Nombre de participantes
+    :param categories: Nombre de catégories d'activité
+    :param semaines: Nombre de semaines d'activités
+    :param inscriptions: Nombre moyen d'inscriptions par participante
+    :param debut: Date de la première semaine
+    :return: Dictionnaire {Table: Nombre de lignes}
+    """
+    connexion.execute("INSERT INTO informations (nom, adresse1, ville) VALUES ('Centre', 'Adresse', 'Ville')")
+    connexion.executemany("INSERT INTO responsable (id_responsable, prenom, nom) VALUES (?, ?, ?)",
+                          [(i, PRENOMS[i % len(PRENOMS)], NOMS[i % len(NOMS)] + " " + str(i)) for i in range(1, 11)])
+    connexion.executemany("INSERT INTO type_activite (id_type_activite, nom) VALUES (?, ?)",
+                          [(i, "Type " + str(i)) for i in range(1, 6)])
+    connexion.executemany("INSERT INTO lieu (id_lieu, nom, adresse_1, ville) VALUES (?, ?, ?, ?)",
+                          [(i, "Salle " + str(i), str(i) + " rue Principale", VILLES[i % len(VILLES)])
+                           for i in range(1, 11)])
+
+    # Catégories d'activité
+    prix_membre = [0.0] * (categories + 1)
+    prix_non_membre = [0.0] * (categories + 1)
+    liste_categorie = list()
+    for i in range(1, categories + 1):
+        prix_membre[i] = float(generateur.choice((0, 5, 10, 15, 20)))
+        prix_non_membre[i] = prix_membre[i] + float(generateur.choice((0, 5, 10)))
+        liste_categorie.append((i, "Catégorie " + str(i), prix_membre[i], prix_non_membre[i],
+                                generateur.randint(0, 5), generateur.randint(8, 40), generateur.randint(1, 10),
+                                generateur.randint(1, 5), generateur.randint(1, 10)))
+    connexion.executemany("INSERT INTO categorie_activite (id_categorie_activite, nom, prix_membre, prix_non_membre, "
+                          "participante_minimum, participante_maximum, id_responsable, id_type_activite, id_lieu) "
+                          "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", liste_categorie)
+
+    # Activités hebdomadaires
+    # L'identifiant de l'activité de la semaine s de la catégorie c est s * categories + c
+    date_activite = [None]
+    nom_activite = [None]
+    for semaine in range(semaines):
+        for categorie in range(1, categories + 1):
+            jour = debut + timedelta(days=semaine * 7 + categorie % 5)
+            date_activite.append(jour)
+            nom_activite.append("Catégorie " + str(categorie))
+    nombre_activite = len(date_activite) - 1
+    connexion.executemany("INSERT INTO activite (id_activite, id_categorie_activite, nom, date, heure_debut, heure_fin, "
+                          "date_limite_inscription) VALUES (?, ?, ?, ?, '13:00', '15:00', ?)",
+                          ((i, (i - 1) % categories + 1, nom_activite[i], date_activite[i].isoformat(),
+                            (date_activite[i] - timedelta(days=1)).isoformat())
+                           for i in range(1, nombre_activite + 1)))
+
+    # Les présences sont enregistrées pour les activités passées
+    aujourdhui = debut + timedelta(days=semaines * 7 // 2)
+
+    lots = Lots(connexion)
+    status = [valeur for valeur, _ in REPARTITION_STATUS]
+    poids = [proportion for _, proportion in REPARTITION_STATUS]
+    numero_membre = 0
+    id_facture = 0
+
+    for id_participante in range(1, participantes + 1):
+        lots.ajouter('participante', (
+            id_participante,
+            generateur.choice(APPELLATIONS),
+            generateur.choice(PRENOMS),
+            generateur.choice(NOMS),
+            generateur.choice(VILLES),
+            4500000000 + id_participante,
+            4500000000 + participantes + id_participante if generateur.random() < 0.2 else None,
+            generateur.randint(1930, 2005),
+            generateur.randint(1, 5),
+            int(generateur.random() < 0.8)))
+
+        # Membres
+        membre = generateur.random() < PROPORTION_MEMBRE
+        if membre:
+            numero_membre += 1
+            honoraire = generateur.random() < 0.02
+            renouvellement = 0 if honoraire else date(debut.year + generateur.randint(0, 2), 9, 1).isoformat()
+            lots.ajouter('membre', (1, id_participante, numero_membre, int(honoraire), renouvellement))
+
+        # Inscriptions
+        nombre = min(generateur.randint(0, 2 * inscriptions), nombre_activite)
+        factures = list()
+        for id_activite, status_inscription in zip(generateur.sample(range(1, nombre_activite + 1), nombre),
+                                                   generateur.choices(status, poids, k=nombre)):
+            jour = date_activite[id_activite]
+            moment = datetime.combine(jour - timedelta(days=generateur.randint(1, 30)), datetime.min.time()) + \
+                timedelta(seconds=generateur.randint(8 * 3600, 17 * 3600))
+
+            present = None
+            if status_inscription == STATUS_FACTURE and jour < aujourdhui:
+                present = int(generateur.random() < 0.85)
+
+            lots.ajouter('inscription', (id_participante, id_activite, status_inscription, present,
+                                         moment.strftime('%Y-%m-%d %H:%M:%S')))
+
+            if status_inscription in (STATUS_FACTURE, STATUS_REMBOURSE):
+                categorie = (id_activite - 1) % categories + 1
+                prix = prix_membre[categorie] if membre else prix_non_membre[categorie]
+                factures.append((id_activite, prix, moment, status_inscription == STATUS_REMBOURSE))
+
+        # Factures regroupant jusqu'à ARTICLES_PAR_FACTURE articles
+        for i in range(0, len(factures), ARTICLES_PAR_FACTURE):
+            groupe = factures[i:i + ARTICLES_PAR_FACTURE]
+            id_facture += 1
+            lots.ajouter('facture', (id_facture, min(article[2] for article in groupe).strftime('%Y-%m-%d %H:%M:%S'),
+                                     str(id_facture), id_participante, sum(article[1] for article in groupe)))
+            for id_activite, prix, _, _ in groupe:
+                lots.ajouter('article', (id_facture, id_activite, prix,
+                                         nom_activite[id_activite] + " (" + date_activite[id_activite].isoformat() + ")"))
+
+        # Remboursement des inscriptions remboursées
+        remboursements = [article for article in factures if article[3]]
+        if remboursements:
+            id_facture += 1
+            lots.ajouter('facture', (id_facture, max(article[2] for article in remboursements).strftime(
+                '%Y-%m-%d %H:%M:%S'), None, id_participante, -sum(article[1] for article in remboursements)))
+            for id_activite, prix, _, _ in remboursements:
+                lots.ajouter('article', (id_facture, id_activite, -prix,
+                                         nom_activite[id_activite] + " (" + date_activite[id_activite].isoformat() + ")"))
+
+    lots.ecrire()
+
+    compte = dict(lots.COMPTE)
+    compte['categorie_activite'] = categories
+    compte['activite'] = nombre_activite
+    return compte
+
+
+def main(arguments=None):
+    """
+    Générer une base de données à partir de la ligne de commande
+
+    :param arguments: Arguments de la ligne de commande ou None pour sys.argv
+    :return: Code de sortie
+    """
+    parser = argparse.ArgumentParser(description="Génération d'une grande base de données pour les tests de charge")
+    parser.add_argument("fichier", help="Fichier de la base de données à créer")
+    parser.add_argument("--participantes", type=int, default=PARTICIPANTES)
+    parser.add_argument("--categories", type=int, default=CATEGORIES, help="Nombre de catégories d'activité")
+    parser.add_argument("--semaines", type=int, default=SEMAINES, help="Nombre de semaines d'activités")
+    parser.add_argument("--inscriptions", type=int, default=INSCRIPTIONS,
+                        help="Nombre moyen d'inscriptions par participante")
+    parser.add_argument("--graine", type=int, default=0, help="Graine du générateur de données")
+    parser.add_argument("--remplacer", action="store_true", help="Remplacer le fichier s'il existe")
+    options = parser.parse_args(arguments)
+
+    if os.path.exists(options.fichier):
+        if not options.remplacer:
+            print("Le fichier {} existe déjà (utiliser --remplacer)".format(options.fichier), file=sys.stderr)
+            return 1
+        os.remove(options.fichier)
+
+    debut = time.perf_counter()
+    connexion = sqlite3.connect(options.fichier, isolation_level=None)
+    connexion.execute("PRAGMA journal_mode = OFF")
+    connexion.execute("PRAGMA synchronous = OFF")
+
+    connexion.execute("BEGIN")
+    creer_tables(connexion)
+    compte = generer(connexion, random.Random(options.graine), options.participantes, options.categories,
+                     options.semaines, options.inscriptions)
+    terminer_schema(connexion)
+    connexion.execute("COMMIT")
+    connexion.close()
+
+    for table, nombre in sorted(compte.items()):
+        print("{:<20} {:>12}".format(table, nombre))
+    print("{:<20} {:>12}".format("Total", sum(compte.values())))
+    print("Durée : {:.1f} s".format(time.perf_counter() - debut))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -35,6 +35,8 @@ Méthodes :
     activite_contingentee : Affiche un message d'erreur qui indique à l'utilisateur que l'activité est contingentee
     remboursement_impossible : Affiche un message d'erreur qui indique à l'utilisateur que le remboursement de
                                l'activité est impossible
+    rapport_impossible : Affiche un message d'erreur qui indique à l'utilisateur que le fichier d'une statistique
+                         n'a pas pu être créé
 """
 
 
@@ -76,6 +78,11 @@ ACTIVITE_CONTINGENTEE_INFORMATION = "En continuant l'annulation, vous allez reti
 REMBOURSEMENT_IMPOSSIBLE = "Remboursement impossible"
 REMBOURSEMENT_IMPOSSIBLE_INFORMATION = "Impossible de rembourser une activité qui n'a jamais été facturée"
 
+RAPPORT_IMPOSSIBLE = "Statistique impossible à créer"
+RAPPORT_IMPOSSIBLE_INFORMATION = "Le fichier de la statistique n'a pas pu être écrit : {}"
+
+JOINTURE_IMPOSSIBLE = "Tables impossibles à relier"
+
 
 def numero_telephone_inexistant():
     """
@@ -265,3 +272,44 @@ def remboursement_impossible():
     msgbox.setStandardButtons(QMessageBox.Ok)
     msgbox.setDefaultButton(QMessageBox.Ok)
     return msgbox.exec()
+
+
+def rapport_impossible(detail):
+    """
+    Affiche un message d'erreur qui indique à l'utilisateur que le fichier d'une statistique n'a pas pu être créé
+
+    Argument :
+        detail : Description de l'erreur
+
+    Return :
+        Sélection de l'utilisateur
+    """
+    msgbox = QMessageBox()
+    msgbox.setWindowTitle(RAPPORT_IMPOSSIBLE)
+    msgbox.setText(RAPPORT_IMPOSSIBLE)
+    msgbox.setInformativeText(RAPPORT_IMPOSSIBLE_INFORMATION.format(detail))
+    msgbox.setIcon(QMessageBox.Warning)
+    msgbox.setStandardButtons(QMessageBox.Ok)
+    msgbox.setDefaultButton(QMessageBox.Ok)
+    return msgbox.exec()
+
+
+def jointure_impossible(detail):
+    """
+    Affiche un message d'erreur qui indique à l'utilisateur que les tables de la statistique ne peuvent pas être
+    reliées sans ambiguïté
+
+    Argument :
+        detail : Description de l'erreur
+
+    Return :
+        Sélection de l'utilisateur
+    """
+    msgbox = QMessageBox()
+    msgbox.setWindowTitle(ERREUR_DONNEE)
+    msgbox.setText(JOINTURE_IMPOSSIBLE)
+    msgbox.setInformativeText(detail)
+    msgbox.setIcon(QMessageBox.Information)
+    msgbox.setStandardButtons(QMessageBox.Ok)
+    msgbox.setDefaultButton(QMessageBox.Ok)
+    return msgbox.exec()
@@ -0,0 +1,170 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Recherche des participantes par numéro de téléphone
+
+Le résultat de chaque numéro recherché est conservé en mémoire. Un numéro absent de la mémoire est recherché avec deux
+requêtes réunies par UNION pour que SQLite utilise les index idx_participante_telephone_1 et
+idx_participante_telephone_2 (une condition OR sur les deux colonnes force la lecture de toute la table). La mémoire est
+vidée chaque fois qu'une participante ou un membre est enregistré.
+
+Un autre poste peut modifier les participantes dans la même base de données. Avant d'utiliser la mémoire, la version
+des tables participante et membre (table version_table) est comparée à celle lue lors des recherches conservées. Une
+base de données qui n'a pas le module version_table utilise PRAGMA data_version, qui change lorsqu'une autre connection
+modifie la base de données. Un numéro qui n'appartient à aucune participante n'est pas conservé : il est habituellement
+recherché juste avant l'inscription de la participante.
+
+Methodes :
+    normaliser : Convertir un numéro de téléphone en nombre entier
+    marqueur : Obtenir le marqueur des modifications des participantes
+    rechercher : Obtenir les participantes qui ont un numéro de téléphone
+    invalider : Vider la mémoire des numéros recherchés
+
+Classes
+    Participante : Participante trouvée par son numéro de téléphone
+"""
+
+# Python import
+from collections import namedtuple
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database import database_error
+
+# Nombre de chiffres d'un numéro de téléphone
+LONGUEUR_TELEPHONE = 10
+
+# Participante trouvée par son numéro de téléphone
+# actif est None lorsque la participante n'est pas membre
+Participante = namedtuple('Participante', ['id_participante', 'prenom', 'nom', 'ville', 'actif'])
+
+# Tables dont les modifications invalident la mémoire
+TABLES_VERSION = ('membre', 'participante')
+
+# Participantes de chaque numéro recherché {Numéro: (Participante, ...)}
+_CACHE = dict()
+
+# Marqueur des modifications lors des recherches conservées
+_MARQUEUR = None
+
+
+def normaliser(numero_telephone):
+    """
+    Convertir un numéro de téléphone en nombre entier
+
+    Tous les caractères autres que les chiffres sont ignorés.
+
+    :param numero_telephone: Numéro de téléphone (string ou int)
+    :return: Numéro ou None si le numéro n'a pas 10 chiffres
+    """
+    chiffres = "".join(caractere for caractere in str(numero_telephone) if caractere.isdigit())
+    if len(chiffres) != LONGUEUR_TELEPHONE:
+        return None
+    return int(chiffres)
+
+
+def marqueur(database):
+    """
+    Obtenir le marqueur des modifications des participantes
+
+    :param database: Base de données
+    :return: Tuple qui change lorsque les participantes ou les membres sont modifiés ou None si la requête échoue
+    """
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+
+    # Version des tables si la base de données a le module version_table
+    if query.exec_("SELECT nom, version FROM version_table WHERE nom IN ('{}') ORDER BY nom"
+                   .format("', '".join(TABLES_VERSION))):
+        versions = list()
+        while query.next():
+            versions.append((query.value(0), query.value(1)))
+        return (database.databaseName(), 'version_table') + tuple(versions)
+
+    # Sinon, seules les modifications des autres connections sont détectées
+    if query.exec_("PRAGMA data_version") and query.next():
+        return database.databaseName(), 'data_version', query.value(0)
+    return None
+
+
+def rechercher(database, numero_telephone):
+    """
+    Obtenir les participantes qui ont un numéro de téléphone
+
+    :param database: Base de données
+    :param numero_telephone: Numéro de téléphone (string ou int)
+    :return: Tuple des Participante ou None si le numéro est invalide ou si la requête échoue
+    """
+    telephone = normaliser(numero_telephone)
+    if telephone is None:
+        return None
+
+    # Vider la mémoire si les participantes ont été modifiées depuis les recherches conservées
+    global _MARQUEUR
+    marqueur_actuel = marqueur(database)
+    if marqueur_actuel is None or marqueur_actuel != _MARQUEUR:
+        _CACHE.clear()
+        _MARQUEUR = marqueur_actuel
+
+    if telephone in _CACHE:
+        return _CACHE[telephone]
+
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare("SELECT "
+                    "participante.id_participante, "
+                    "participante.prenom, "
+                    "participante.nom, "
+                    "participante.ville, "
+                    "membre.actif "
+                  "FROM ("
+                    "SELECT id_participante FROM participante WHERE telephone_1 = :telephone_1 "
+                    "UNION "
+                    "SELECT id_participante FROM participante WHERE telephone_2 = :telephone_2"
+                  ") AS telephone "
+                  "INNER JOIN participante ON participante.id_participante = telephone.id_participante "
+                  "LEFT JOIN membre ON membre.id_participante = participante.id_participante "
+                  "ORDER BY participante.nom, participante.prenom")
+    query.bindValue(':telephone_1', telephone)
+    query.bindValue(':telephone_2', telephone)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    resultat = list()
+    while query.next():
+        resultat.append(Participante(int(query.value(0)), str(query.value(1)), str(query.value(2)),
+                                     str(query.value(3)), query.value(4)))
+
+    resultat = tuple(resultat)
+
+    # Un numéro sans participante n'est pas conservé, la participante est habituellement inscrite ensuite
+    if resultat and marqueur_actuel is not None:
+        _CACHE[telephone] = resultat
+    return resultat
+
+
+def invalider():
+    """
+    Vider la mémoire des numéros recherchés
+
+    Doit être appelée après l'enregistrement d'une participante ou d'un membre.
+    """
+    _CACHE.clear()
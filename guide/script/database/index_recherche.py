@@ -0,0 +1,185 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Recherche plein texte dans l'index recherche (FTS5)
+
+L'index contient les participantes, les lieux, les responsables et les catégories d'activité. Il est maintenu par des
+triggers. L'identifiant de chaque ligne de l'index est : id * 4 + type. La recherche ne tient pas compte de la casse
+et des accents et chaque mot recherché correspond au début d'un mot de la colonne.
+
+Lorsque l'index n'est pas installé (SQLite sans FTS5 ou modules manquants), les fonctions de recherche doivent être
+remplacées par une recherche LIKE.
+
+Methodes :
+    disponible : Vérifier si l'index de recherche est installé dans la base de données
+    expression : Convertir un texte de recherche en expression FTS5
+    filtre : Obtenir la condition SQL qui limite une table aux lignes correspondant à la recherche
+    rechercher : Obtenir les identifiants correspondant à une recherche triés par pertinence
+    normaliser : Retirer les accents et la casse d'un texte
+    correspond : Reproduire la recherche de l'index en mémoire
+"""
+
+# Python import
+import re
+import unicodedata
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database import database_error
+
+# Type des lignes de l'index
+TYPE_PARTICIPANTE = 0
+TYPE_LIEU = 1
+TYPE_RESPONSABLE = 2
+TYPE_CATEGORIE_ACTIVITE = 3
+
+# Disponibilité de l'index pour chaque base de données {(Connection, Base de données): Disponible}
+_DISPONIBLE = dict()
+
+
+def disponible(database):
+    """
+    Vérifier si l'index de recherche est installé dans la base de données
+
+    :param database: Base de données
+    :return: True si l'index est installé
+    """
+    cle = (database.connectionName(), database.databaseName())
+    if cle not in _DISPONIBLE:
+        query = QSqlQuery(database)
+        query.exec_("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='recherche'")
+
+        # Affichage d'un message d'erreur si la requete echoue
+        database_error.sql_error_handler(query.lastError())
+
+        _DISPONIBLE[cle] = bool(query.first() and query.value(0))
+    return _DISPONIBLE[cle]
+
+
+def normaliser(texte):
+    """
+    Retirer les accents et la casse d'un texte
+
+    :param texte: Texte
+    :return: Texte normalisé
+    """
+    texte = unicodedata.normalize('NFKD', str(texte))
+    return ''.join(c for c in texte if not unicodedata.combining(c)).lower()
+
+
+def mots(texte):
+    """
+    Séparer un texte en mots normalisés
+
+    :param texte: Texte
+    :return: Liste des mots
+    """
+    return re.findall(r'[^\W_]+', normaliser(texte))
+
+
+def expression(texte, colonnes=None):
+    """
+    Convertir un texte de recherche en expression FTS5
+
+    Chaque mot est recherché au début d'un mot de l'index. Tous les mots doivent correspondre.
+
+    :param texte: Texte de recherche de l'utilisateur
+    :param colonnes: Liste des colonnes de l'index (nom, prenom, ville) ou None pour toutes les colonnes
+    :return: Expression FTS5 ou None si le texte ne contient aucun mot
+    """
+    liste_mot = mots(texte)
+    if not liste_mot:
+        return None
+
+    expr = ' '.join('"{}"*'.format(mot) for mot in liste_mot)
+    if colonnes:
+        expr = '{{{}}} : ({})'.format(' '.join(colonnes), expr)
+    return expr
+
+
+def filtre(colonne, type_ligne, parametre='recherche'):
+    """
+    Obtenir la condition SQL qui limite une table aux lignes correspondant à la recherche
+
+    La valeur du paramètre doit être obtenue avec expression().
+
+    :param colonne: Colonne de l'identifiant de la table (ex. participante.id_participante)
+    :param type_ligne: Type des lignes de l'index
+    :param parametre: Nom du paramètre de l'expression FTS5
+    :return: Condition SQL
+    """
+    return "{} IN (SELECT rowid / 4 FROM recherche WHERE recherche MATCH :{} AND rowid % 4 = {}) ".format(
+        colonne, parametre, int(type_ligne))
+
+
+def rechercher(database, texte, type_ligne, colonnes=None, limite=-1):
+    """
+    Obtenir les identifiants correspondant à une recherche triés par pertinence
+
+    :param database: Base de données
+    :param texte: Texte de recherche de l'utilisateur
+    :param type_ligne: Type des lignes de l'index
+    :param colonnes: Liste des colonnes de l'index ou None pour toutes les colonnes
+    :param limite: Nombre maximal d'identifiants (-1 : aucune limite)
+    :return: Liste des identifiants
+    """
+    expr = expression(texte, colonnes)
+    if expr is None:
+        return list()
+
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare("SELECT rowid / 4 FROM recherche "
+                  "WHERE recherche MATCH :recherche AND rowid % 4 = :type "
+                  "ORDER BY rank "
+                  "LIMIT :limite")
+    query.bindValue(':recherche', expr)
+    query.bindValue(':type', int(type_ligne))
+    query.bindValue(':limite', limite)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return list()
+
+    identifiants = list()
+    while query.next():
+        identifiants.append(query.value(0))
+    return identifiants
+
+
+def correspond(valeurs, texte):
+    """
+    Reproduire la recherche de l'index en mémoire
+
+    :param valeurs: Valeur ou liste des valeurs des colonnes recherchées
+    :param texte: Texte de recherche de l'utilisateur
+    :return: True si chaque mot recherché correspond au début d'un mot des valeurs
+    """
+    if not isinstance(valeurs, (list, tuple)):
+        valeurs = [valeurs]
+
+    liste_mot = list()
+    for valeur in valeurs:
+        if valeur is not None:
+            liste_mot.extend(mots(valeur))
+
+    for recherche in mots(texte):
+        if not any(mot.startswith(recherche) for mot in liste_mot):
+            return False
+    return True
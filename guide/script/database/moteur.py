@@ -0,0 +1,76 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Base des classes qui enregistrent des données sans interface graphique
+
+Les classes dérivées n'accèdent à aucun widget et n'affichent aucun message. En cas d'erreur, la transaction est
+annulée et l'erreur est disponible avec lastError() pour être affichée par le dialog avec
+database_error.sql_error_handler.
+
+Classes
+    Moteur : Exécution des requêtes et conservation de l'erreur
+"""
+
+# PyQt import
+from PyQt5.QtSql import QSqlError
+
+
+class Moteur:
+    """
+    Exécution des requêtes et conservation de l'erreur
+
+    Methodes :
+        lastError : Erreur de la dernière opération
+        executer : Exécuter une requête
+        executer_lot : Exécuter une requête en lot
+    """
+
+    def __init__(self, database):
+        # Connection à la base de données
+        self.DATABASE = database
+        self.ERREUR = QSqlError()
+
+    def lastError(self):
+        """
+        Erreur de la dernière opération
+
+        :return: QSqlError
+        """
+        return self.ERREUR
+
+    def executer(self, query):
+        """
+        Exécuter une requête et conserver l'erreur
+
+        :param query: Requête préparée
+        :return: True si la requête est exécutée
+        """
+        if not query.exec_():
+            self.ERREUR = query.lastError()
+            return False
+        return True
+
+    def executer_lot(self, query):
+        """
+        Exécuter une requête en lot et conserver l'erreur
+
+        :param query: Requête préparée dont les valeurs sont des listes
+        :return: True si la requête est exécutée
+        """
+        if not query.execBatch():
+            self.ERREUR = query.lastError()
+            return False
+        return True
@@ -0,0 +1,117 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Données de référence affichées dans les combobox
+
+Les responsables, les types d'activité, les lieux et les catégories d'activité changent rarement. Chaque table est lue
+une seule fois dans un QStandardItemModel partagé par tous les combobox (QComboBox.setModel). L'identifiant de chaque
+ligne est conservé dans Qt.UserRole pour que itemData et findData fonctionnent comme avec addItem.
+
+Chaque table a une version qui est incrémentée par invalider lorsqu'un dialog ajoute ou modifie une ligne. Le modèle
+est lu de nouveau seulement lorsque sa version est différente de celle de la table. Il est rempli sur place pour que
+les combobox qui l'utilisent déjà restent attachés.
+
+Methodes :
+    modele : Obtenir le modèle d'une table de référence
+    attacher : Afficher une table de référence dans un combobox
+    invalider : Indiquer qu'une table de référence a été modifiée
+"""
+
+# PyQt import
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database import database_error
+
+# Tables de référence
+RESPONSABLE = 'responsable'
+TYPE_ACTIVITE = 'type_activite'
+LIEU = 'lieu'
+CATEGORIE_ACTIVITE = 'categorie_activite'
+
+# Requête de chaque table de référence (Identifiant, Texte affiché)
+REQUETES = {
+    RESPONSABLE: "SELECT id_responsable, ifnull(nom, '') || ', ' || ifnull(prenom, '') "
+                 "FROM responsable ORDER BY nom ASC",
+    TYPE_ACTIVITE: "SELECT id_type_activite, nom FROM type_activite ORDER BY nom ASC",
+    LIEU: "SELECT id_lieu, nom FROM lieu",
+    CATEGORIE_ACTIVITE: "SELECT id_categorie_activite, nom FROM categorie_activite"
+}
+
+# Version de chaque table {Table: Version}
+_VERSIONS = {table: 0 for table in REQUETES}
+
+# Modèle de chaque table et version de la table lors de sa lecture {Table: (QStandardItemModel, Version)}
+_MODELES = dict()
+
+
+def modele(database, table):
+    """
+    Obtenir le modèle d'une table de référence
+
+    La table est lue seulement si le modèle n'existe pas ou si la table a été modifiée depuis sa lecture.
+
+    :param database: Base de données
+    :param table: Table de référence (RESPONSABLE, TYPE_ACTIVITE, LIEU ou CATEGORIE_ACTIVITE)
+    :return: QStandardItemModel
+    """
+    if table in _MODELES:
+        model, version = _MODELES[table]
+        if version == _VERSIONS[table]:
+            return model
+    else:
+        model = QStandardItemModel()
+
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.exec_(REQUETES[table])
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return model  # Le modèle sera lu de nouveau à la prochaine utilisation
+
+    model.clear()
+    while query.next():
+        item = QStandardItem(str(query.value(1)))
+        item.setData(query.value(0), Qt.UserRole)
+        model.appendRow(item)
+
+    _MODELES[table] = (model, _VERSIONS[table])
+    return model
+
+
+def attacher(combobox, database, table):
+    """
+    Afficher une table de référence dans un combobox
+
+    :param combobox: QComboBox
+    :param database: Base de données
+    :param table: Table de référence
+    """
+    combobox.setModel(modele(database, table))
+
+
+def invalider(table):
+    """
+    Indiquer qu'une table de référence a été modifiée
+
+    Doit être appelée après l'ajout ou la modification d'une ligne de la table.
+
+    :param table: Table de référence
+    """
+    _VERSIONS[table] += 1
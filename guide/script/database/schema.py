@@ -0,0 +1,558 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Définition des tables de la base de données
+
+Chaque module est un dictionnaire qui contient la requête de création de sa table ('query'), sa version ('version') et
+son numéro ('module'). Un module peut aussi contenir ses migrations ('migration'), les modules dont il dépend
+('dependance') et l'option de compilation de SQLite qu'il nécessite ('option').
+
+Ce module n'utilise pas PyQt pour pouvoir être utilisé par les scripts en ligne de commande.
+"""
+
+# Définition des requêtes pour créer les tables
+QUERY_GUIDE = "\
+CREATE TABLE guide ( \
+    module  INTEGER NOT NULL \
+                    UNIQUE, \
+    version INTEGER NOT NULL \
+)"
+VERSION_GUIDE = 2
+MODULE_GUIDE = 0
+GUIDE = {'query': QUERY_GUIDE, 'version': VERSION_GUIDE, 'module': MODULE_GUIDE}
+
+QUERY_ACTIVITE = " \
+CREATE TABLE activite ( \
+    id_activite             INTEGER, \
+    id_categorie_activite   INTEGER NOT NULL, \
+    nom                     VARCHAR(255),\
+    date                    INTEGER NOT NULL, \
+    heure_debut             INTEGER NOT NULL, \
+    heure_fin               INTEGER NOT NULL, \
+    date_limite_inscription INTEGER NOT NULL, \
+    status                  INTEGER NOT NULL \
+                                    DEFAULT (1), \
+    PRIMARY KEY ( \
+        id_activite \
+    ) \
+)"
+MIGRATION_ACTIVITE = {
+    2: ["CREATE INDEX IF NOT EXISTS idx_activite_date ON activite (date)",
+        "CREATE INDEX IF NOT EXISTS idx_activite_date_limite_inscription ON activite (date_limite_inscription)"]
+}
+VERSION_ACTIVITE = 2
+MODULE_ACTIVITE = 1
+ACTIVITE = {'query': QUERY_ACTIVITE, 'version': VERSION_ACTIVITE, 'module': MODULE_ACTIVITE,
+            'migration': MIGRATION_ACTIVITE}
+
+QUERY_ARTICLE = "\
+CREATE TABLE article (\
+    id_article  INTEGER PRIMARY KEY AUTOINCREMENT,\
+    id_facture  INTEGER,\
+    id_activite INTEGER REFERENCES activite (id_activite) ON DELETE RESTRICT\
+                                                          ON UPDATE CASCADE\
+                        NOT NULL,\
+    prix        REAL,\
+    description TEXT,\
+    FOREIGN KEY (\
+        id_facture\
+    )\
+    REFERENCES facture (id_facture) \
+)"
+VERSION_ARTICLE = 1
+MODULE_ARTICLE = 2
+ARTICLE = {'query': QUERY_ARTICLE, 'version': VERSION_ARTICLE, 'module': MODULE_ARTICLE}
+
+QUERY_CATEGORIE_ACTIVITE = "\
+CREATE TABLE categorie_activite ( \
+    id_categorie_activite INTEGER PRIMARY KEY, \
+    nom                   TEXT    NOT NULL \
+                                  UNIQUE, \
+    prix_membre           REAL    DEFAULT (0) \
+                                  NOT NULL, \
+    prix_non_membre       REAL    DEFAULT (0) \
+                                  NOT NULL, \
+    participante_minimum  INTEGER DEFAULT (0) \
+                                  NOT NULL, \
+    participante_maximum  INTEGER NOT NULL \
+                                  DEFAULT (0), \
+    id_responsable        INTEGER NOT NULL \
+                                  REFERENCES responsable (id_responsable) ON DELETE RESTRICT \
+                                                                          ON UPDATE CASCADE, \
+    id_type_activite      INTEGER REFERENCES type_activite (id_type_activite) ON DELETE RESTRICT \
+                                                                              ON UPDATE CASCADE \
+                                  NOT NULL, \
+    id_lieu               INTEGER REFERENCES lieu (id_lieu) ON DELETE RESTRICT \
+                                                            ON UPDATE CASCADE \
+                                  NOT NULL \
+)"
+VERSION_CATEGORIE_ACTIVITE = 1
+MODULE_CATEGORIE_ACTIVITE = 3
+CATEGORIE_ACTIVITE = {'query': QUERY_CATEGORIE_ACTIVITE, 'version': VERSION_CATEGORIE_ACTIVITE,
+                      'module': MODULE_CATEGORIE_ACTIVITE}
+
+QUERY_FACTURE = "\
+CREATE TABLE facture ( \
+    id_facture      INTEGER  PRIMARY KEY AUTOINCREMENT, \
+    date            DATETIME DEFAULT (datetime('now', 'localtime') ), \
+    numero_recu     TEXT, \
+    id_participante INTEGER  NOT NULL, \
+    total           REAL, \
+    FOREIGN KEY ( \
+        id_participante \
+    ) \
+    REFERENCES participante (id_participante) ON DELETE RESTRICT \
+                                              ON UPDATE CASCADE \
+)"
+VERSION_FACTURE = 1
+MODULE_FACTURE = 4
+FACTURE = {'query': QUERY_FACTURE, 'version': VERSION_FACTURE, 'module': MODULE_FACTURE}
+
+QUERY_GROUPE = "\
+CREATE TABLE groupe ( \
+    id_groupe   INTEGER PRIMARY KEY, \
+    id_activite INTEGER REFERENCES activite (id_activite) ON DELETE RESTRICT \
+                                                          ON UPDATE CASCADE \
+                        NOT NULL \
+                        UNIQUE, \
+    f_0_4       INTEGER DEFAULT (0), \
+    f_5_11      INTEGER DEFAULT (0), \
+    f_12_17     INTEGER DEFAULT (0), \
+    f_18_34     INTEGER DEFAULT (0), \
+    f_35_64     INTEGER DEFAULT (0), \
+    f_65        INTEGER DEFAULT (0), \
+    h_0_4       INTEGER DEFAULT (0), \
+    h_5_11      INTEGER DEFAULT (0), \
+    h_12_17     INTEGER DEFAULT (0), \
+    h_18_34     INTEGER DEFAULT (0), \
+    h_35_64     INTEGER DEFAULT (0), \
+    h_65        INTEGER DEFAULT (0) \
+)"
+VERSION_GROUPE = 1
+MODULE_GROUPE = 5
+GROUPE = {'query': QUERY_GROUPE, 'version': VERSION_GROUPE, 'module': MODULE_GROUPE}
+
+QUERY_INSCRIPTION = "\
+CREATE TABLE inscription ( \
+    id_inscription  INTEGER  PRIMARY KEY AUTOINCREMENT, \
+    id_participante INTEGER  NOT NULL, \
+    id_activite     INTEGER  NOT NULL, \
+    status          INTEGER  NOT NULL, \
+    present         INTEGER, \
+    time            DATETIME DEFAULT (datetime('now', 'localtime') ), \
+    FOREIGN KEY ( \
+        id_participante \
+    ) \
+    REFERENCES participante (id_participante) ON DELETE RESTRICT \
+                                              ON UPDATE CASCADE, \
+    FOREIGN KEY ( \
+        id_activite \
+    ) \
+    REFERENCES activite (id_activite) ON DELETE RESTRICT \
+                                      ON UPDATE CASCADE \
+)"
+MIGRATION_INSCRIPTION = {
+    2: ["CREATE INDEX IF NOT EXISTS idx_inscription_activite_status ON inscription (id_activite, status)",
+        "CREATE INDEX IF NOT EXISTS idx_inscription_participante_activite "
+        "ON inscription (id_participante, id_activite)"],
+    3: ["DROP INDEX IF EXISTS idx_inscription_activite_status",
+        "CREATE INDEX IF NOT EXISTS idx_inscription_activite_status_time "
+        "ON inscription (id_activite, status, time)"]
+}
+VERSION_INSCRIPTION = 3
+MODULE_INSCRIPTION = 6
+INSCRIPTION = {'query': QUERY_INSCRIPTION, 'version': VERSION_INSCRIPTION, 'module': MODULE_INSCRIPTION,
+               'migration': MIGRATION_INSCRIPTION}
+
+QUERY_LIEU = "\
+CREATE TABLE lieu ( \
+    id_lieu     INTEGER PRIMARY KEY, \
+    nom         TEXT    NOT NULL, \
+    adresse_1   TEXT    NOT NULL, \
+    adresse_2   TEXT, \
+    ville       TEXT, \
+    province    TEXT, \
+    code_postal TEXT, \
+    UNIQUE ( \
+        nom, \
+        adresse_1 \
+    ) \
+    ON CONFLICT ABORT \
+)"
+VERSION_LIEU = 1
+MODULE_LIEU = 7
+LIEU = {'query': QUERY_LIEU, 'version': VERSION_LIEU, 'module': MODULE_LIEU}
+
+QUERY_MEMBRE = "\
+CREATE TABLE membre ( \
+    id_membre           INTEGER PRIMARY KEY, \
+    actif               BOOLEAN, \
+    id_participante     INTEGER REFERENCES participante (id_participante) ON DELETE RESTRICT \
+                                                                          ON UPDATE RESTRICT, \
+    numero_membre       INTEGER, \
+    membre_honoraire    BOOLEAN, \
+    date_renouvellement DATE \
+)"
+MIGRATION_MEMBRE = {
+    2: ["CREATE INDEX IF NOT EXISTS idx_membre_participante ON membre (id_participante)"],
+    3: ["CREATE TABLE IF NOT EXISTS inscription_membre ( "
+        "id_inscription_membre INTEGER PRIMARY KEY, "
+        "id_membre             INTEGER NOT NULL REFERENCES membre (id_membre) ON DELETE RESTRICT "
+        "                                                                     ON UPDATE CASCADE, "
+        "id_facture            INTEGER REFERENCES facture (id_facture) ON DELETE RESTRICT "
+        "                                                              ON UPDATE CASCADE, "
+        "date                  DATE, "
+        "article               TEXT, "
+        "prix                  REAL, "
+        "numero_recu           TEXT)",
+        "CREATE INDEX IF NOT EXISTS idx_inscription_membre_membre ON inscription_membre (id_membre)",
+        "CREATE INDEX IF NOT EXISTS idx_membre_renouvellement ON membre (date_renouvellement)"]
+}
+VERSION_MEMBRE = 3
+MODULE_MEMBRE = 8
+MEMBRE = {'query': QUERY_MEMBRE, 'version': VERSION_MEMBRE, 'module': MODULE_MEMBRE, 'migration': MIGRATION_MEMBRE}
+
+QUERY_PARTICIPANTE = "\
+CREATE TABLE participante ( \
+    id_participante    INTEGER PRIMARY KEY, \
+    appellation        TEXT, \
+    prenom             TEXT    NOT NULL, \
+    nom                TEXT, \
+    adresse_1          TEXT, \
+    adresse_2          TEXT, \
+    ville              TEXT, \
+    province           TEXT, \
+    code_postal        TEXT, \
+    courriel           TEXT, \
+    telephone_1        INTEGER NOT NULL, \
+    telephone_2        INTEGER, \
+    poste_telephone_1  INTEGER, \
+    poste_telephone_2  INTEGER, \
+    date_naissance     INTEGER, \
+    personne_nourrie   INTEGER, \
+    consentement_photo BOOLEAN, \
+    UNIQUE ( \
+        prenom, \
+        nom, \
+        telephone_1 \
+    ) \
+    ON CONFLICT ABORT \
+)"
+MIGRATION_PARTICIPANTE = {
+    2: ["CREATE INDEX IF NOT EXISTS idx_participante_telephone_1 ON participante (telephone_1)",
+        "CREATE INDEX IF NOT EXISTS idx_participante_telephone_2 ON participante (telephone_2)"]
+}
+VERSION_PARTICIPANTE = 2
+MODULE_PARTICIPANTE = 9
+PARTICIPANTE = {'query': QUERY_PARTICIPANTE, 'version': VERSION_PARTICIPANTE, 'module': MODULE_PARTICIPANTE,
+                'migration': MIGRATION_PARTICIPANTE}
+
+QUERY_RESPONSABLE = "\
+CREATE TABLE responsable ( \
+    id_responsable INTEGER PRIMARY KEY, \
+    prenom         TEXT    NOT NULL, \
+    nom            TEXT, \
+    UNIQUE ( \
+        prenom, \
+        nom \
+    ) \
+    ON CONFLICT ABORT \
+)"
+VERSION_RESPONSABLE = 1
+MODULE_RESPONSABLE = 10
+RESPONSABLE = {'query': QUERY_RESPONSABLE, 'version': VERSION_RESPONSABLE, 'module': MODULE_RESPONSABLE}
+
+QUERY_TYPE_ACTIVITE = "\
+CREATE TABLE type_activite ( \
+    id_type_activite INTEGER PRIMARY KEY, \
+    nom              TEXT    NOT NULL \
+                             UNIQUE \
+)"
+VERSION_TYPE_ACTIVITE = 1
+MODULE_TYPE_ACTIVITE = 11
+TYPE_ACTIVITE = {'query': QUERY_TYPE_ACTIVITE, 'version': VERSION_TYPE_ACTIVITE, 'module': MODULE_TYPE_ACTIVITE}
+
+QUERY_INFORMATIONS = "\
+CREATE TABLE informations ( \
+    nom         TEXT    NOT NULL, \
+    departement TEXT, \
+    adresse1    TEXT    NOT NULL, \
+    adresse2    TEXT, \
+    ville       TEXT    NOT NULL, \
+    code_postal TEXT, \
+    province    TEXT, \
+    pays        TEXT, \
+    telephone   INTEGER, \
+    poste       INTEGER, \
+    sf          INTEGER, \
+    sf_poste    INTEGER, \
+    fax         INTEGER, \
+    fax_poste   INTEGER, \
+    courriel    TEXT \
+)"
+VERSION_INFORMATIONS = 1
+MODULE_INFORMATIONS = 12
+INFORMATIONS = {'query': QUERY_INFORMATIONS, 'version': VERSION_INFORMATIONS, 'module': MODULE_INFORMATIONS}
+
+QUERY_RECHERCHE = "\
+CREATE VIRTUAL TABLE recherche USING fts5 ( \
+    nom, \
+    prenom, \
+    ville, \
+    tokenize = 'unicode61 remove_diacritics 1' \
+)"
+# L'identifiant de chaque ligne de l'index est : id * 4 + type (0 : participante, 1 : lieu, 2 : responsable,
+# 3 : catégorie d'activité)
+MIGRATION_RECHERCHE = {
+    1: ["CREATE TRIGGER recherche_participante_insert AFTER INSERT ON participante BEGIN "
+        "INSERT INTO recherche (rowid, nom, prenom, ville) "
+        "VALUES (new.id_participante * 4, new.nom, new.prenom, new.ville); END",
+        "CREATE TRIGGER recherche_participante_update AFTER UPDATE OF id_participante, nom, prenom, ville "
+        "ON participante BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_participante * 4; "
+        "INSERT INTO recherche (rowid, nom, prenom, ville) "
+        "VALUES (new.id_participante * 4, new.nom, new.prenom, new.ville); END",
+        "CREATE TRIGGER recherche_participante_delete AFTER DELETE ON participante BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_participante * 4; END",
+        "INSERT INTO recherche (rowid, nom, prenom, ville) "
+        "SELECT id_participante * 4, nom, prenom, ville FROM participante",
+
+        "CREATE TRIGGER recherche_lieu_insert AFTER INSERT ON lieu BEGIN "
+        "INSERT INTO recherche (rowid, nom, ville) VALUES (new.id_lieu * 4 + 1, new.nom, new.ville); END",
+        "CREATE TRIGGER recherche_lieu_update AFTER UPDATE OF id_lieu, nom, ville ON lieu BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_lieu * 4 + 1; "
+        "INSERT INTO recherche (rowid, nom, ville) VALUES (new.id_lieu * 4 + 1, new.nom, new.ville); END",
+        "CREATE TRIGGER recherche_lieu_delete AFTER DELETE ON lieu BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_lieu * 4 + 1; END",
+        "INSERT INTO recherche (rowid, nom, ville) SELECT id_lieu * 4 + 1, nom, ville FROM lieu",
+
+        "CREATE TRIGGER recherche_responsable_insert AFTER INSERT ON responsable BEGIN "
+        "INSERT INTO recherche (rowid, nom, prenom) "
+        "VALUES (new.id_responsable * 4 + 2, new.nom, new.prenom); END",
+        "CREATE TRIGGER recherche_responsable_update AFTER UPDATE OF id_responsable, nom, prenom "
+        "ON responsable BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_responsable * 4 + 2; "
+        "INSERT INTO recherche (rowid, nom, prenom) "
+        "VALUES (new.id_responsable * 4 + 2, new.nom, new.prenom); END",
+        "CREATE TRIGGER recherche_responsable_delete AFTER DELETE ON responsable BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_responsable * 4 + 2; END",
+        "INSERT INTO recherche (rowid, nom, prenom) "
+        "SELECT id_responsable * 4 + 2, nom, prenom FROM responsable",
+
+        "CREATE TRIGGER recherche_categorie_activite_insert AFTER INSERT ON categorie_activite BEGIN "
+        "INSERT INTO recherche (rowid, nom) VALUES (new.id_categorie_activite * 4 + 3, new.nom); END",
+        "CREATE TRIGGER recherche_categorie_activite_update AFTER UPDATE OF id_categorie_activite, nom "
+        "ON categorie_activite BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_categorie_activite * 4 + 3; "
+        "INSERT INTO recherche (rowid, nom) VALUES (new.id_categorie_activite * 4 + 3, new.nom); END",
+        "CREATE TRIGGER recherche_categorie_activite_delete AFTER DELETE ON categorie_activite BEGIN "
+        "DELETE FROM recherche WHERE rowid = old.id_categorie_activite * 4 + 3; END",
+        "INSERT INTO recherche (rowid, nom) "
+        "SELECT id_categorie_activite * 4 + 3, nom FROM categorie_activite"]
+}
+VERSION_RECHERCHE = 1
+MODULE_RECHERCHE = 13
+RECHERCHE = {'query': QUERY_RECHERCHE, 'version': VERSION_RECHERCHE, 'module': MODULE_RECHERCHE,
+             'migration': MIGRATION_RECHERCHE, 'option': 'ENABLE_FTS5',
+             'dependance': [PARTICIPANTE, LIEU, RESPONSABLE, CATEGORIE_ACTIVITE]}
+
+QUERY_COMPTEUR_ACTIVITE = "\
+CREATE TABLE compteur_activite ( \
+    id_activite INTEGER PRIMARY KEY \
+                        REFERENCES activite (id_activite) ON DELETE CASCADE \
+                                                          ON UPDATE CASCADE, \
+    inscription INTEGER NOT NULL \
+                        DEFAULT (0) \
+)"
+# Nombre d'inscriptions (status 1) de chaque activité maintenu par des triggers
+MIGRATION_COMPTEUR_ACTIVITE = {
+    1: ["CREATE TRIGGER compteur_inscription_insert AFTER INSERT ON inscription WHEN new.status = 1 BEGIN "
+        "INSERT OR IGNORE INTO compteur_activite (id_activite) VALUES (new.id_activite); "
+        "UPDATE compteur_activite SET inscription = inscription + 1 WHERE id_activite = new.id_activite; END",
+        "CREATE TRIGGER compteur_inscription_delete AFTER DELETE ON inscription WHEN old.status = 1 BEGIN "
+        "UPDATE compteur_activite SET inscription = inscription - 1 WHERE id_activite = old.id_activite; END",
+        "CREATE TRIGGER compteur_inscription_update_old AFTER UPDATE OF status, id_activite ON inscription "
+        "WHEN old.status = 1 BEGIN "
+        "UPDATE compteur_activite SET inscription = inscription - 1 WHERE id_activite = old.id_activite; END",
+        "CREATE TRIGGER compteur_inscription_update_new AFTER UPDATE OF status, id_activite ON inscription "
+        "WHEN new.status = 1 BEGIN "
+        "INSERT OR IGNORE INTO compteur_activite (id_activite) VALUES (new.id_activite); "
+        "UPDATE compteur_activite SET inscription = inscription + 1 WHERE id_activite = new.id_activite; END",
+        "INSERT INTO compteur_activite (id_activite, inscription) "
+        "SELECT id_activite, count(*) FROM inscription WHERE status = 1 GROUP BY id_activite"]
+}
+VERSION_COMPTEUR_ACTIVITE = 1
+MODULE_COMPTEUR_ACTIVITE = 14
+COMPTEUR_ACTIVITE = {'query': QUERY_COMPTEUR_ACTIVITE, 'version': VERSION_COMPTEUR_ACTIVITE,
+                     'module': MODULE_COMPTEUR_ACTIVITE, 'migration': MIGRATION_COMPTEUR_ACTIVITE,
+                     'dependance': [ACTIVITE, INSCRIPTION]}
+
+QUERY_SEQUENCE = "\
+CREATE TABLE sequence ( \
+    nom    TEXT    PRIMARY KEY, \
+    valeur INTEGER NOT NULL \
+                   DEFAULT (0) \
+)"
+# Blocs de numéros réservés par chaque poste de travail
+# Le premier numéro inutilisé du bloc est prochain. Le bloc est épuisé lorsque prochain est plus grand que fin.
+MIGRATION_SEQUENCE = {
+    1: ["CREATE TABLE bloc_sequence ( "
+        "id_bloc  INTEGER PRIMARY KEY, "
+        "nom      TEXT    NOT NULL REFERENCES sequence (nom), "
+        "poste    TEXT    NOT NULL, "
+        "debut    INTEGER NOT NULL, "
+        "fin      INTEGER NOT NULL, "
+        "prochain INTEGER NOT NULL, "
+        "time     DATETIME DEFAULT (datetime('now', 'localtime') ))",
+        "CREATE INDEX idx_bloc_sequence_poste ON bloc_sequence (nom, poste, prochain)",
+        "INSERT INTO sequence (nom, valeur) "
+        "SELECT 'facture', max(ifnull((SELECT max(id_facture) FROM facture), 0), "
+        "ifnull((SELECT seq FROM sqlite_sequence WHERE name = 'facture'), 0))",
+        "INSERT INTO sequence (nom, valeur) SELECT 'membre', ifnull(max(numero_membre), 0) FROM membre"]
+}
+VERSION_SEQUENCE = 1
+MODULE_SEQUENCE = 15
+SEQUENCE = {'query': QUERY_SEQUENCE, 'version': VERSION_SEQUENCE, 'module': MODULE_SEQUENCE,
+            'migration': MIGRATION_SEQUENCE, 'dependance': [FACTURE, MEMBRE]}
+
+# Colonnes des groupes par sexe et par tranche d'âge
+COLONNES_GROUPE = ['f_0_4', 'f_5_11', 'f_12_17', 'f_18_34', 'f_35_64', 'f_65',
+                   'h_0_4', 'h_5_11', 'h_12_17', 'h_18_34', 'h_35_64', 'h_65']
+
+QUERY_SOMMAIRE_GROUPE = "\
+CREATE TABLE sommaire_groupe ( \
+    mois             TEXT    NOT NULL, \
+    id_type_activite INTEGER NOT NULL, \
+    id_lieu          INTEGER NOT NULL, \
+    groupe           INTEGER NOT NULL DEFAULT (0), \
+    f_0_4            INTEGER NOT NULL DEFAULT (0), \
+    f_5_11           INTEGER NOT NULL DEFAULT (0), \
+    f_12_17          INTEGER NOT NULL DEFAULT (0), \
+    f_18_34          INTEGER NOT NULL DEFAULT (0), \
+    f_35_64          INTEGER NOT NULL DEFAULT (0), \
+    f_65             INTEGER NOT NULL DEFAULT (0), \
+    h_0_4            INTEGER NOT NULL DEFAULT (0), \
+    h_5_11           INTEGER NOT NULL DEFAULT (0), \
+    h_12_17          INTEGER NOT NULL DEFAULT (0), \
+    h_18_34          INTEGER NOT NULL DEFAULT (0), \
+    h_35_64          INTEGER NOT NULL DEFAULT (0), \
+    h_65             INTEGER NOT NULL DEFAULT (0), \
+    PRIMARY KEY (mois, id_type_activite, id_lieu) \
+)"
+
+# Mois (yyyy-MM), type d'activité et lieu de l'activité d'une ligne (new ou old)
+_CLE_GROUPE = "SELECT substr(activite.date, 1, 7), categorie_activite.id_type_activite, categorie_activite.id_lieu " \
+              "FROM activite INNER JOIN categorie_activite " \
+              "ON categorie_activite.id_categorie_activite = activite.id_categorie_activite " \
+              "WHERE activite.id_activite = {0}.id_activite"
+_CLE_ACTIVITE = "SELECT substr({0}.date, 1, 7), id_type_activite, id_lieu FROM categorie_activite " \
+                "WHERE id_categorie_activite = {0}.id_categorie_activite"
+
+# Valeur d'une colonne du groupe modifié ou du groupe de l'activité modifiée
+_VALEUR_GROUPE = "ifnull({ligne}.{colonne}, 0)"
+_VALEUR_ACTIVITE = "(SELECT ifnull({colonne}, 0) FROM groupe WHERE id_activite = {ligne}.id_activite)"
+
+
+def _sommaire_groupe(signe, ligne, cle, valeur):
+    """
+    Requêtes d'un trigger qui ajoute (+) ou retire (-) un groupe du sommaire
+
+    Une ligne vide du sommaire est supprimée.
+    """
+    cle = cle.format(ligne)
+    colonnes = ", ".join("{0} = {0} {1} ".format(colonne, signe) + valeur.format(ligne=ligne, colonne=colonne)
+                         for colonne in COLONNES_GROUPE)
+    requetes = "UPDATE sommaire_groupe SET groupe = groupe {} 1, {} " \
+               "WHERE (mois, id_type_activite, id_lieu) = ({}); ".format(signe, colonnes, cle)
+    if signe == '+':
+        return "INSERT OR IGNORE INTO sommaire_groupe (mois, id_type_activite, id_lieu) {}; ".format(cle) + requetes
+    return requetes + "DELETE FROM sommaire_groupe " \
+                      "WHERE groupe = 0 AND (mois, id_type_activite, id_lieu) = ({}); ".format(cle)
+
+
+_REMPLIR_SOMMAIRE_GROUPE = \
+    "INSERT INTO sommaire_groupe (mois, id_type_activite, id_lieu, groupe, {}) " \
+    "SELECT substr(activite.date, 1, 7), categorie_activite.id_type_activite, categorie_activite.id_lieu, count(*), " \
+    "{} FROM groupe " \
+    "INNER JOIN activite ON activite.id_activite = groupe.id_activite " \
+    "INNER JOIN categorie_activite ON categorie_activite.id_categorie_activite = activite.id_categorie_activite " \
+    "GROUP BY 1, 2, 3".format(", ".join(COLONNES_GROUPE),
+                              ", ".join("sum(ifnull(groupe.{}, 0))".format(colonne) for colonne in COLONNES_GROUPE))
+
+# Totaux des groupes par mois, type d'activité et lieu maintenus par des triggers
+# Le groupe est déplacé lorsque la date ou la catégorie de son activité change. Le sommaire est recalculé au complet
+# lorsque le type d'activité ou le lieu d'une catégorie change.
+MIGRATION_SOMMAIRE_GROUPE = {
+    1: ["CREATE TRIGGER sommaire_groupe_insert AFTER INSERT ON groupe BEGIN " +
+        _sommaire_groupe('+', 'new', _CLE_GROUPE, _VALEUR_GROUPE) + "END",
+        "CREATE TRIGGER sommaire_groupe_delete AFTER DELETE ON groupe BEGIN " +
+        _sommaire_groupe('-', 'old', _CLE_GROUPE, _VALEUR_GROUPE) + "END",
+        "CREATE TRIGGER sommaire_groupe_update AFTER UPDATE ON groupe BEGIN " +
+        _sommaire_groupe('-', 'old', _CLE_GROUPE, _VALEUR_GROUPE) +
+        _sommaire_groupe('+', 'new', _CLE_GROUPE, _VALEUR_GROUPE) + "END",
+        "CREATE TRIGGER sommaire_groupe_activite AFTER UPDATE OF date, id_categorie_activite ON activite "
+        "WHEN EXISTS (SELECT 1 FROM groupe WHERE id_activite = new.id_activite) BEGIN " +
+        _sommaire_groupe('-', 'old', _CLE_ACTIVITE, _VALEUR_ACTIVITE) +
+        _sommaire_groupe('+', 'new', _CLE_ACTIVITE, _VALEUR_ACTIVITE) + "END",
+        "CREATE TRIGGER sommaire_groupe_categorie_activite AFTER UPDATE OF id_type_activite, id_lieu "
+        "ON categorie_activite "
+        "WHEN old.id_type_activite != new.id_type_activite OR old.id_lieu != new.id_lieu BEGIN "
+        "DELETE FROM sommaire_groupe; " + _REMPLIR_SOMMAIRE_GROUPE + "; END",
+        _REMPLIR_SOMMAIRE_GROUPE]
+}
+VERSION_SOMMAIRE_GROUPE = 1
+MODULE_SOMMAIRE_GROUPE = 16
+SOMMAIRE_GROUPE = {'query': QUERY_SOMMAIRE_GROUPE, 'version': VERSION_SOMMAIRE_GROUPE,
+                   'module': MODULE_SOMMAIRE_GROUPE, 'migration': MIGRATION_SOMMAIRE_GROUPE,
+                   'dependance': [GROUPE, ACTIVITE, CATEGORIE_ACTIVITE]}
+
+# Tables dont les modifications sont comptées
+TABLES_VERSION = ['activite', 'article', 'categorie_activite', 'facture', 'groupe', 'inscription', 'lieu', 'membre',
+                  'participante', 'responsable', 'type_activite']
+
+QUERY_VERSION_TABLE = "\
+CREATE TABLE version_table ( \
+    nom     TEXT    PRIMARY KEY, \
+    version INTEGER NOT NULL \
+                    DEFAULT (0) \
+)"
+# Nombre de modifications de chaque table maintenu par des triggers
+# Un résultat enregistré est encore valide tant que la version des tables qu'il utilise n'a pas changé.
+MIGRATION_VERSION_TABLE = {
+    1: ["CREATE TRIGGER version_{0}_{1} AFTER {2} ON {0} BEGIN "
+        "UPDATE version_table SET version = version + 1 WHERE nom = '{0}'; END".format(table, evenement.lower(),
+                                                                                       evenement)
+        for table in TABLES_VERSION for evenement in ('INSERT', 'UPDATE', 'DELETE')] +
+       ["INSERT INTO version_table (nom) VALUES {}".format(", ".join("('{}')".format(table)
+                                                                     for table in TABLES_VERSION))]
+}
+VERSION_VERSION_TABLE = 1
+MODULE_VERSION_TABLE = 17
+VERSION_TABLE = {'query': QUERY_VERSION_TABLE, 'version': VERSION_VERSION_TABLE, 'module': MODULE_VERSION_TABLE,
+                 'migration': MIGRATION_VERSION_TABLE,
+                 'dependance': [ACTIVITE, ARTICLE, CATEGORIE_ACTIVITE, FACTURE, GROUPE, INSCRIPTION, LIEU, MEMBRE,
+                                PARTICIPANTE, RESPONSABLE, TYPE_ACTIVITE]}
+
+# Liste des modules dans l'ordre de création
+# Les migrations d'un module sont un dictionnaire {Version: [Requêtes]}. Elles sont appliquées dans l'ordre des versions
+# après la création de la table et lors de la mise à jour d'une base de données existante.
+LISTE_MODULE = [GUIDE, INFORMATIONS, ACTIVITE, CATEGORIE_ACTIVITE, LIEU, RESPONSABLE, TYPE_ACTIVITE, ARTICLE, FACTURE,
+                INSCRIPTION, GROUPE, MEMBRE, PARTICIPANTE]
+
+# Liste des modules ajoutés automatiquement lorsque tous les modules dont ils dépendent sont installés
+# Un module peut aussi nécessiter une option de compilation de SQLite ('option').
+LISTE_MODULE_DEPENDANT = [RECHERCHE, COMPTEUR_ACTIVITE, SEQUENCE, SOMMAIRE_GROUPE, VERSION_TABLE]
@@ -0,0 +1,377 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Attribution des numéros de facture et de membre
+
+Le dernier numéro réservé de chaque séquence est conservé dans la table sequence. Chaque poste de travail réserve un
+bloc de numéros dans une transaction BEGIN IMMEDIATE, ce qui empêche deux postes de réserver le même bloc. Les numéros
+sont ensuite attribués dans le bloc du poste sans jamais lire les tables facture ou membre. Les blocs sont conservés
+dans la table bloc_sequence pour permettre la vérification des numéros manquants.
+
+La vérification des séquences d'une base de données est affichée par :
+    python -m guide.script.database.sequence fichier.guide [--sequence facture|membre]
+
+Methodes :
+    poste : Obtenir l'identifiant du poste de travail
+    audit : Vérifier les numéros attribués d'une séquence
+    rapport : Obtenir le texte de la vérification d'une séquence
+
+Classes
+    Sequence : Attribution des numéros d'une séquence pour le poste de travail
+    Audit : Résultat de la vérification d'une séquence
+"""
+
+# Python import
+import argparse
+import sys
+import uuid
+from collections import namedtuple
+
+# PyQt import
+from PyQt5.QtCore import QSettings
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlError
+from PyQt5.QtWidgets import QApplication
+
+# Project import
+from guide.script.database import database_error
+
+# Séquences disponibles {Nom: (Table, Colonne)}
+SEQUENCE_FACTURE = 'facture'
+SEQUENCE_MEMBRE = 'membre'
+TABLE_SEQUENCE = {SEQUENCE_FACTURE: ('facture', 'id_facture'),
+                  SEQUENCE_MEMBRE: ('membre', 'numero_membre')}
+
+# Nombre de numéros réservés à la fois par défaut
+TAILLE_BLOC = 10
+
+# Nom de la connexion utilisée par la vérification en ligne de commande
+CONNEXION = "audit"
+
+# Résultat de la vérification d'une séquence
+# manquants : Numéros attribués qui ne sont pas dans la table
+# reserves : Numéros réservés par un poste et pas encore attribués [(Poste, Début, Fin)]
+Audit = namedtuple('Audit', ['attribues', 'manquants', 'reserves'])
+
+
+def poste():
+    """
+    Obtenir l'identifiant du poste de travail
+
+    L'identifiant est créé à la première utilisation et conservé dans les réglages.
+
+    :return: Identifiant du poste
+    """
+    settings = QSettings("SDR Soft", "PyGUIDE")
+    identifiant = settings.value("Sequence/Poste")
+    if not identifiant:
+        identifiant = str(uuid.uuid4())
+        settings.setValue("Sequence/Poste", identifiant)
+    return str(identifiant)
+
+
+class Sequence:
+    """
+    Attribution des numéros d'une séquence pour le poste de travail
+
+    Le numéro obtenu avec prochain() est seulement consommé par consommer(), qui doit être appelée dans la transaction
+    qui enregistre le numéro. Un numéro qui n'est pas consommé sera de nouveau proposé.
+
+    Methodes :
+        prochain : Obtenir le prochain numéro du poste
+        reserver : Réserver un nouveau bloc de numéros pour le poste
+        consommer : Marquer un ou plusieurs numéros comme attribués
+        lastError : Erreur de la dernière opération
+    """
+
+    def __init__(self, database, nom, taille_bloc=None):
+        # Connection à la base de données
+        self.DATABASE = database
+
+        self.NOM = nom
+        self.POSTE = poste()
+        self.ERREUR = QSqlError()
+
+        # Nombre de numéros réservés à la fois
+        if taille_bloc is None:
+            settings = QSettings("SDR Soft", "PyGUIDE")
+            taille_bloc = int(settings.value("Sequence/TailleBloc", TAILLE_BLOC))
+        self.TAILLE_BLOC = max(int(taille_bloc), 1)
+
+    def lastError(self):
+        """
+        Erreur de la dernière opération
+
+        :return: QSqlError
+        """
+        return self.ERREUR
+
+    def executer(self, query, sql=None):
+        """
+        Exécuter une requête et conserver l'erreur
+
+        :param query: Requête
+        :param sql: Requête SQL à exécuter ou None si la requête est préparée
+        :return: True si la requête est exécutée
+        """
+        resultat = query.exec_(sql) if sql is not None else query.exec_()
+        if not resultat:
+            self.ERREUR = query.lastError()
+        return resultat
+
+    def prochain(self):
+        """
+        Obtenir le prochain numéro du poste
+
+        Un nouveau bloc est réservé lorsque le poste n'a plus de numéro disponible. Ne doit pas être appelée pendant une
+        transaction.
+
+        :return: Numéro ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("SELECT prochain FROM bloc_sequence "
+                      "WHERE (nom = :nom) AND (poste = :poste) AND (prochain <= fin) "
+                      "ORDER BY prochain "
+                      "LIMIT 1")
+        query.bindValue(':nom', self.NOM)
+        query.bindValue(':poste', self.POSTE)
+        if not self.executer(query):
+            return None
+
+        if query.first():
+            return int(query.value(0))
+        return self.reserver()
+
+    def reserver(self, taille=None):
+        """
+        Réserver un nouveau bloc de numéros pour le poste
+
+        BEGIN IMMEDIATE obtient le verrou d'écriture avant de lire la séquence. Un autre poste qui réserve un bloc au
+        même moment attend la fin de la transaction. Ne doit pas être appelée pendant une transaction.
+
+        :param taille: Nombre de numéros du bloc ou None pour la taille par défaut
+        :return: Premier numéro du bloc ou None en cas d'erreur
+        """
+        self.ERREUR = QSqlError()
+        taille = self.TAILLE_BLOC if taille is None else int(taille)
+
+        query = QSqlQuery(self.DATABASE)
+        if not self.executer(query, "BEGIN IMMEDIATE"):
+            return None
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("UPDATE sequence SET valeur = valeur + ? WHERE nom = ?")
+        query.addBindValue(taille)
+        query.addBindValue(self.NOM)
+        if not self.executer(query):
+            QSqlQuery(self.DATABASE).exec_("ROLLBACK")  # Annuler la transaction
+            return None
+
+        # La séquence n'existe pas
+        if query.numRowsAffected() != 1:
+            self.ERREUR = QSqlError("Séquence {} inexistante".format(self.NOM), "", QSqlError.StatementError)
+            QSqlQuery(self.DATABASE).exec_("ROLLBACK")  # Annuler la transaction
+            return None
+
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("INSERT INTO bloc_sequence (nom, poste, debut, fin, prochain) "
+                      "SELECT nom, ?, valeur - ? + 1, valeur, valeur - ? + 1 FROM sequence WHERE nom = ?")
+        query.addBindValue(self.POSTE)
+        query.addBindValue(taille)
+        query.addBindValue(taille)
+        query.addBindValue(self.NOM)
+        if not self.executer(query):
+            QSqlQuery(self.DATABASE).exec_("ROLLBACK")  # Annuler la transaction
+            return None
+
+        # Premier numéro du bloc
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("SELECT valeur - ? + 1 FROM sequence WHERE nom = ?")
+        query.addBindValue(taille)
+        query.addBindValue(self.NOM)
+        if not self.executer(query) or not query.first():
+            QSqlQuery(self.DATABASE).exec_("ROLLBACK")  # Annuler la transaction
+            return None
+        debut = int(query.value(0))
+
+        # Terminer la transaction
+        query = QSqlQuery(self.DATABASE)
+        if not self.executer(query, "COMMIT"):
+            QSqlQuery(self.DATABASE).exec_("ROLLBACK")  # Annuler la transaction
+            return None
+
+        return debut
+
+    def consommer(self, numero, nombre=1):
+        """
+        Marquer un ou plusieurs numéros comme attribués
+
+        Doit être appelée dans la transaction qui enregistre les numéros pour que les numéros ne soient pas consommés si
+        l'enregistrement est annulé. Les numéros doivent se suivre dans un même bloc.
+
+        :param numero: Premier numéro obtenu avec prochain() ou reserver()
+        :param nombre: Nombre de numéros consécutifs
+        :return: True si les numéros sont consommés
+        """
+        query = QSqlQuery(self.DATABASE)
+        query.prepare("UPDATE bloc_sequence SET prochain = prochain + ? "
+                      "WHERE (nom = ?) AND (poste = ?) AND (prochain = ?) AND (prochain + ? - 1 <= fin)")
+        query.addBindValue(int(nombre))
+        query.addBindValue(self.NOM)
+        query.addBindValue(self.POSTE)
+        query.addBindValue(int(numero))
+        query.addBindValue(int(nombre))
+        if not self.executer(query):
+            return False
+
+        # Le numéro n'est pas le prochain numéro du poste
+        if query.numRowsAffected() != 1:
+            self.ERREUR = QSqlError("Le numéro {} n'est plus disponible".format(numero), "",
+                                    QSqlError.TransactionError)
+            return False
+        return True
+
+
+def audit(database, nom):
+    """
+    Vérifier les numéros attribués d'une séquence
+
+    :param database: Base de données
+    :param nom: Nom de la séquence
+    :return: Audit ou None si la requête échoue
+    """
+    table, colonne = TABLE_SEQUENCE[nom]
+
+    # Nombre de numéros attribués
+    query = QSqlQuery(database)
+    query.prepare("SELECT ifnull(sum(prochain - debut), 0) FROM bloc_sequence WHERE nom = :nom")
+    query.bindValue(':nom', nom)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+    query.first()
+    attribues = int(query.value(0))
+
+    # Numéros attribués qui ne sont pas dans la table
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare("WITH RECURSIVE numero (n, fin) AS ("
+                    "SELECT debut, prochain - 1 FROM bloc_sequence WHERE (nom = :nom) AND (prochain > debut) "
+                    "UNION ALL "
+                    "SELECT n + 1, fin FROM numero WHERE n < fin"
+                  ") "
+                  "SELECT n FROM numero "
+                  "WHERE NOT EXISTS (SELECT 1 FROM {0} WHERE {0}.{1} = numero.n) "
+                  "ORDER BY n".format(table, colonne))
+    query.bindValue(':nom', nom)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    manquants = list()
+    while query.next():
+        manquants.append(int(query.value(0)))
+
+    # Numéros réservés qui ne sont pas encore attribués
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare("SELECT poste, prochain, fin FROM bloc_sequence "
+                  "WHERE (nom = :nom) AND (prochain <= fin) "
+                  "ORDER BY prochain")
+    query.bindValue(':nom', nom)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    reserves = list()
+    while query.next():
+        reserves.append((str(query.value(0)), int(query.value(1)), int(query.value(2))))
+
+    return Audit(attribues, manquants, reserves)
+
+
+def rapport(nom, resultat):
+    """
+    Obtenir le texte de la vérification d'une séquence
+
+    :param nom: Nom de la séquence
+    :param resultat: Audit
+    :return: Texte du rapport
+    """
+    lignes = ["Séquence {}".format(nom),
+              "  Numéros attribués : {}".format(resultat.attribues),
+              "  Numéros manquants : {}".format(len(resultat.manquants))]
+    if resultat.manquants:
+        lignes.append("    " + ", ".join(str(numero) for numero in resultat.manquants))
+
+    lignes.append("  Numéros réservés par poste :")
+    if not resultat.reserves:
+        lignes.append("    Aucun")
+    for poste_travail, debut, fin in resultat.reserves:
+        lignes.append("    {} : {} à {} ({} numéros)".format(poste_travail, debut, fin, fin - debut + 1))
+    return "\n".join(lignes)
+
+
+def main(arguments=None):
+    """
+    Afficher la vérification des séquences d'une base de données à partir de la ligne de commande
+
+    :param arguments: Arguments de la ligne de commande ou None pour sys.argv
+    :return: Code de sortie : 1 s'il y a des numéros manquants, 2 si la vérification échoue
+    """
+    parser = argparse.ArgumentParser(description="Vérification des numéros de facture et de membre")
+    parser.add_argument("base", help="Base de données")
+    parser.add_argument("--sequence", choices=sorted(TABLE_SEQUENCE), action='append',
+                        help="Séquence à vérifier (toutes par défaut)")
+    options = parser.parse_args(arguments)
+
+    # Les erreurs de la base de données sont affichées dans un message
+    application = QApplication(sys.argv[:1])
+
+    # La vérification ne modifie pas la base de données
+    database = QSqlDatabase.addDatabase('QSQLITE', CONNEXION)
+    database.setDatabaseName(options.base)
+    database.setConnectOptions("QSQLITE_OPEN_READONLY")
+
+    code = 0
+    if not database.open():
+        database_error.sql_error_handler(database.lastError())
+        code = 2
+    else:
+        for nom in options.sequence or sorted(TABLE_SEQUENCE):
+            resultat = audit(database, nom)
+            if resultat is None:
+                code = 2
+                break
+            print(rapport(nom, resultat))
+            if resultat.manquants:
+                code = max(code, 1)
+        database.close()
+
+    del database
+    QSqlDatabase.removeDatabase(CONNEXION)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
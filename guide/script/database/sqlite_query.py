@@ -15,8 +15,26 @@
 
 """
 This module contains the function that execute all SQLite query
+
+The queries read from the resources are kept in a per-connection statement cache. The cache holds the decoded SQL
+text and the prepared QSqlQuery so that a query executed many times (e.g. each time a participant dialog opens) skips
+both the resource I/O and the SQLite statement compilation.
+
+A QSqlQuery returned by execute is shared with the cache, it is not destroyed (and its statement is not finalized) when
+the caller is done with it. An active SELECT keeps a SHARED lock on the database file and prevents the other
+workstations from writing. A SELECT is therefore read inside select, which finishes the query once its result is
+consumed. The other statements are finished by execute.
+
+The bound values of a QSqlQuery are kept after it is finished. Every placeholder of the SQL is bound again each time
+the query is reused, with None (NULL) for the values that are not given, so that a value never leaks from a previous
+execution.
 """
 
+# Python import
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+
 # PyQt import
 from PyQt5.QtCore import QFile, QIODevice, QTextStream
 from PyQt5.QtSql import QSqlQuery
@@ -26,32 +44,230 @@ import guide.rc_query
 from guide.script.database import database_error
 
 
-def execute(q_file, q_values, database):
+# Maximum number of prepared statements kept for each connection
+CACHE_SIZE = 32
+
+# Named placeholder (:name). The string literals and the comments are matched first so that their content is ignored.
+PLACEHOLDER = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/|(?<!:):(\w+)", re.DOTALL)
+
+
+def placeholders(query_str):
     """
-    Execute the given query with the optionals values
+    Get the named placeholders of a SQL string
 
-    :param query_file: Query file (from the resources)
-    :param query_values: Dict of the query values {Identifier: Value}
-    :return: Query output
+    :param query_str: SQL string
+    :return: List of the placeholder names in order of first appearance
+    """
+    names = list()
+    for match in PLACEHOLDER.finditer(query_str):
+        name = match.group(1)
+        if name is not None and name not in names:
+            names.append(name)
+    return names
+
+
+class StatementCache:
+    """
+    LRU cache of the prepared statements of a database connection
+
+    The cache is keyed by query file path. Each entry holds the decoded SQL text, its placeholder names and the
+    prepared QSqlQuery.
+
+    Methods :
+        query : Get the prepared query for a query file
+        prepare : Get the prepared query for a SQL string
+        clear : Remove all the prepared queries from the cache
+        statistics : Cache hit/miss counters
+    """
+
+    def __init__(self, database, size=CACHE_SIZE):
+        self.database = database
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def query(self, q_file, q_values=None):
+        """
+        Get the prepared query for a query file
+
+        :param q_file: Query file (from the resources)
+        :param q_values: Dict of the query values {Identifier: Value}
+        :return: Prepared QSqlQuery with all its placeholders bound
+        """
+        return self.prepare(q_file, None, q_values)
+
+    def prepare(self, key, query_str, q_values=None):
+        """
+        Get the prepared query for a key. The SQL is read from the resources if no string is given.
+
+        The returned query is shared with the cache : its result must be consumed before the same key is prepared
+        again. Every placeholder is bound on each call, None is bound for the missing values.
+
+        :param key: Cache key (query file path for the queries from the resources)
+        :param query_str: SQL string or None to read the query file
+        :param q_values: Dict of the query values {Identifier: Value}
+        :return: Prepared QSqlQuery with all its placeholders bound
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+            query = entry['query']
+            query.finish()  # Release the previous result before the statement is reused
+        else:
+            self.misses += 1
+
+            if query_str is None:
+                query_str = read_query(key)
+
+            query = QSqlQuery(self.database)
+            query.prepare(query_str)
+            entry = {'sql': query_str, 'placeholders': placeholders(query_str), 'query': query}
+
+            # Only keep the statements that compiled successfully
+            if not query.lastError().isValid():
+                self._entries[key] = entry
+
+                # Evict the least recently used statement
+                if len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+
+        # The values bound by the previous execution are kept by the query
+        values = q_values or dict()
+        for name in entry['placeholders']:
+            query.bindValue(':{}'.format(name), values.get(name))
+
+        return query
+
+    def sql(self, key):
+        """
+        Get the cached SQL text for a key
+
+        :param key: Cache key
+        :return: SQL text or None if the key is not cached
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry['sql']
+        return None
+
+    def clear(self):
+        """
+        Remove all the prepared queries from the cache
+        """
+        for entry in self._entries.values():
+            entry['query'].finish()
+        self._entries.clear()
+
+    def statistics(self):
+        """
+        Cache hit/miss counters
+
+        :return: Dict of the counters {'hits', 'misses', 'size'}
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+# Statement cache of each connection {Connection name: StatementCache}
+_CACHES = dict()
+
+
+def statement_cache(database):
+    """
+    Get the statement cache of a database connection
+
+    :param database: Database connection
+    :return: StatementCache
+    """
+    name = database.connectionName()
+    cache = _CACHES.get(name)
+
+    # Create a new cache if the connection changed (e.g. a new database is opened under the same name)
+    if cache is None or cache.database.databaseName() != database.databaseName():
+        cache = StatementCache(database)
+        _CACHES[name] = cache
+    return cache
+
+
+def clear_cache(database=None):
+    """
+    Remove the prepared statements of a connection or of all the connections
+
+    Called before a connection is replaced so that no statement prepared on the previous database is reused.
+
+    :param database: Database connection (all the connections if None)
     """
+    if database is None:
+        for cache in _CACHES.values():
+            cache.clear()
+        _CACHES.clear()
+    else:
+        cache = _CACHES.pop(database.connectionName(), None)
+        if cache is not None:
+            cache.clear()
 
-    # Read the query
+
+def read_query(q_file):
+    """
+    Read a query file from the resources
+
+    :param q_file: Query file (from the resources)
+    :return: SQL text
+    """
     file = QFile(q_file)
     file.open(QIODevice.ReadOnly | QFile.Text)
     query_str = QTextStream(file).readAll()
     file.close()
+    return query_str
 
-    # Prepare the query
-    query = QSqlQuery(database)
-    query.prepare(query_str)
 
-    if q_values:
-        for key, value in q_values.items():
-            query.bindValue(':{}'.format(key), value)
+def execute(q_file, q_values, database):
+    """
+    Execute the given query with the optionals values
+
+    The returned query is shared with the statement cache. A statement that does not return rows is finished
+    immediately. The result of a SELECT must be read with select, which finishes the query.
+
+    :param query_file: Query file (from the resources)
+    :param query_values: Dict of the query values {Identifier: Value}. None is bound for the missing values.
+    :return: Query output
+    """
+
+    # Get the prepared query with its values
+    query = statement_cache(database).query(q_file, q_values)
 
     # Execute the query
     query.exec_()
 
-    if not database_error.sql_error_handler(query.lastError()):
-        return True, query
-    return False, query
+    successfull = not database_error.sql_error_handler(query.lastError())
+
+    # Release the statement as soon as possible when there is no result to read
+    if not query.isSelect():
+        query.finish()
+
+    return successfull, query
+
+
+@contextmanager
+def select(q_file, q_values, database):
+    """
+    Execute the given SELECT query and finish it once its result is consumed
+
+    Usage :
+        with sqlite_query.select(q_file, q_values, database) as (successfull, query):
+            while query.next():
+                ...
+
+    :param query_file: Query file (from the resources)
+    :param query_values: Dict of the query values {Identifier: Value}. None is bound for the missing values.
+    :return: Context manager of the query output
+    """
+    successfull, query = execute(q_file, q_values, database)
+    try:
+        yield successfull, query
+    finally:
+        # The statement keeps its SHARED lock until it is finished
+        query.finish()
@@ -0,0 +1,141 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Recherche incrémentale différée des listes de la fenêtre principale
+
+Les modifications du texte de recherche démarrent un délai. Chaque nouvelle touche annule la recherche en attente, de
+sorte qu'une seule requête est exécutée lorsque l'utilisateur arrête d'écrire. Lorsque le nouveau texte prolonge le
+texte précédent avec les mêmes options, la liste précédente peut être filtrée en mémoire au lieu d'exécuter une
+nouvelle requête.
+
+Le délai est enregistré dans les réglages (Recherche/Delai, en millisecondes).
+
+Classes
+    RechercheIncrementale : Pipeline de recherche différée
+
+Methodes
+    like : Reproduire la comparaison LIKE de SQLite en mémoire
+"""
+
+# PyQt import
+from PyQt5.QtCore import QObject, QTimer, QSettings
+
+# Délai par défaut avant l'exécution d'une recherche (ms)
+DELAI_DEFAUT = 250
+
+# SQLite ne tient pas compte de la casse des caractères ASCII seulement avec LIKE
+_ASCII_MINUSCULE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def like(valeur, texte, prefixe=True):
+    """
+    Reproduire la comparaison LIKE de SQLite en mémoire
+
+    :param valeur: Valeur de la base de données
+    :param texte: Texte recherché (sans caractère %)
+    :param prefixe: Recherche au début de la valeur ('texte%') ou n'importe où ('%texte%')
+    :return: True si la valeur correspond
+    """
+    if valeur is None:
+        return False
+    valeur = str(valeur).translate(_ASCII_MINUSCULE)
+    texte = texte.translate(_ASCII_MINUSCULE)
+    if prefixe:
+        return valeur.startswith(texte)
+    return texte in valeur
+
+
+class RechercheIncrementale(QObject):
+    """
+    Pipeline de recherche différée
+
+    La fonction de mise à jour est appelée à la fin du délai.
+
+    Methodes :
+        demarrer : Démarrer ou redémarrer le délai de recherche
+        annuler : Annuler la recherche en attente
+        executer : Exécuter immédiatement la fonction de mise à jour
+        peut_filtrer : Vérifier si la liste précédente peut être filtrée en mémoire
+        enregistrer : Enregistrer le texte et les options de la liste affichée
+    """
+
+    def __init__(self, fonction, parent=None, delai=None):
+        super(RechercheIncrementale, self).__init__(parent)
+
+        self.FONCTION = fonction
+
+        # Délai de la recherche
+        if delai is None:
+            settings = QSettings("SDR Soft", "PyGUIDE")
+            delai = int(settings.value("Recherche/Delai", DELAI_DEFAUT))
+
+        self.TIMER = QTimer(self)
+        self.TIMER.setSingleShot(True)
+        self.TIMER.setInterval(delai)
+        self.TIMER.timeout.connect(self.FONCTION)
+
+        # Texte et options de la liste affichée
+        self.TEXTE = None
+        self.OPTIONS = None
+
+    def demarrer(self, *args):
+        """
+        Démarrer ou redémarrer le délai de recherche. La recherche en attente est annulée.
+        """
+        self.TIMER.start()
+
+    def annuler(self):
+        """
+        Annuler la recherche en attente et oublier la liste affichée
+        """
+        self.TIMER.stop()
+        self.TEXTE = None
+        self.OPTIONS = None
+
+    def executer(self, *args):
+        """
+        Exécuter immédiatement la fonction de mise à jour (modification des options de tri)
+
+        La recherche en attente est annulée puisqu'elle serait exécutée avec le même texte.
+        """
+        self.TIMER.stop()
+        self.FONCTION()
+
+    def peut_filtrer(self, texte, options, complet=True):
+        """
+        Vérifier si la liste précédente peut être filtrée en mémoire
+
+        :param texte: Nouveau texte de recherche
+        :param options: Options de la liste (colonne de recherche, tri, etc.)
+        :param complet: La liste précédente contient toutes les lignes de la requête
+        :return: True si le nouveau texte prolonge le texte précédent avec les mêmes options
+        """
+        # Les caractères spéciaux de LIKE ne sont pas reproduits en mémoire
+        if '%' in texte or '_' in texte:
+            return False
+
+        return bool(complet and self.TEXTE and texte != self.TEXTE and texte.startswith(self.TEXTE) and
+                    options == self.OPTIONS)
+
+    def enregistrer(self, texte, options):
+        """
+        Enregistrer le texte et les options de la liste affichée
+
+        :param texte: Texte de recherche
+        :param options: Options de la liste
+        """
+        self.TEXTE = texte
+        self.OPTIONS = options
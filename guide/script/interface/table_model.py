@@ -0,0 +1,232 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Modèles de tableau chargés par page depuis la base de données
+
+Les lignes sont obtenues par page (LIMIT/OFFSET) lorsque la vue en a besoin (canFetchMore/fetchMore). Seules les
+valeurs brutes de la requête sont conservées en mémoire. Le texte affiché est formaté dans data() pour les cellules
+visibles seulement.
+
+Classes
+    ModeleSqlPagine : Modèle de tableau générique chargé par page
+    ModeleParticipante : Modèle de la liste des participantes de la fenêtre principale
+"""
+
+# PyQt import
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database import database_error
+
+# Nombre de lignes obtenues par page
+TAILLE_PAGE = 256
+
+
+class ModeleSqlPagine(QAbstractTableModel):
+    """
+    Modèle de tableau générique chargé par page
+
+    La requête ne doit pas contenir de clause LIMIT. Les classes dérivées définissent HEADERS et formater().
+
+    Methodes :
+        set_requete : Modifier la requête du modèle et recharger le tableau
+        rafraichir : Recharger le tableau avec la requête actuelle
+        filtrer : Remplacer la requête par une requête plus restrictive en filtrant les lignes en mémoire
+        valeur : Obtenir la valeur brute d'une colonne de la requête
+        formater : Formater une cellule pour l'affichage
+    """
+    HEADERS = []
+
+    def __init__(self, database, taille_page=TAILLE_PAGE):
+        super(ModeleSqlPagine, self).__init__()
+
+        # Connection à la base de données
+        self.DATABASE = database
+
+        self.TAILLE_PAGE = taille_page
+        self.SQL = None
+        self.VALEURS = dict()
+        self.LIGNES = list()
+        self.COMPLET = True
+
+    def set_requete(self, sql, valeurs=None):
+        """
+        Modifier la requête du modèle et recharger le tableau
+
+        :param sql: Requête SQL sans clause LIMIT
+        :param valeurs: Dictionnaire des valeurs de la requête {Identifiant: Valeur}
+        """
+        self.SQL = sql
+        self.VALEURS = valeurs or dict()
+        self.rafraichir()
+
+    def rafraichir(self):
+        """
+        Recharger le tableau avec la requête actuelle
+        """
+        self.beginResetModel()
+        self.LIGNES = list()
+        self.COMPLET = self.SQL is None
+        self.endResetModel()
+
+        # Charger la première page
+        if not self.COMPLET:
+            self.fetchMore(QModelIndex())
+
+    def filtrer(self, sql, valeurs, fonction):
+        """
+        Remplacer la requête par une requête plus restrictive en filtrant les lignes en mémoire
+
+        Toutes les lignes de la requête précédente doivent être chargées (COMPLET). Les lignes conservées doivent être
+        exactement celles que retournerait la nouvelle requête.
+
+        :param sql: Nouvelle requête SQL sans clause LIMIT
+        :param valeurs: Dictionnaire des valeurs de la requête {Identifiant: Valeur}
+        :param fonction: Fonction qui reçoit les valeurs brutes d'une ligne et retourne True pour la conserver
+        """
+        self.beginResetModel()
+        self.SQL = sql
+        self.VALEURS = valeurs or dict()
+        self.LIGNES = [ligne for ligne in self.LIGNES if fonction(ligne)]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.LIGNES)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super(ModeleSqlPagine, self).headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self.formater(self.LIGNES[index.row()], index.column())
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self.COMPLET
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.COMPLET:
+            return
+
+        # Obtenir la page suivante
+        query = QSqlQuery(self.DATABASE)
+        query.setForwardOnly(True)
+        query.prepare(self.SQL + " LIMIT :limite_page OFFSET :offset_page")
+        for identifiant, valeur in self.VALEURS.items():
+            query.bindValue(':{}'.format(identifiant), valeur)
+        query.bindValue(':limite_page', self.TAILLE_PAGE)
+        query.bindValue(':offset_page', len(self.LIGNES))
+        query.exec_()
+
+        # Affichage d'un message d'erreur si la requete echoue
+        if database_error.sql_error_handler(query.lastError()):
+            self.COMPLET = True
+            return
+
+        nombre_colonne = query.record().count()
+        page = list()
+        while query.next():
+            page.append(tuple(query.value(i) for i in range(nombre_colonne)))
+
+        # La dernière page est atteinte si elle n'est pas pleine
+        self.COMPLET = len(page) < self.TAILLE_PAGE
+
+        if page:
+            debut = len(self.LIGNES)
+            self.beginInsertRows(QModelIndex(), debut, debut + len(page) - 1)
+            self.LIGNES.extend(page)
+            self.endInsertRows()
+
+    def valeur(self, row, column):
+        """
+        Obtenir la valeur brute d'une colonne de la requête
+
+        :param row: Ligne du tableau
+        :param column: Colonne de la requête
+        :return: Valeur
+        """
+        return self.LIGNES[row][column]
+
+    def formater(self, ligne, column):
+        """
+        Formater une cellule pour l'affichage
+
+        :param ligne: Valeurs brutes de la ligne
+        :param column: Colonne du tableau
+        :return: Texte affiché
+        """
+        return str(ligne[column])
+
+
+class ModeleParticipante(ModeleSqlPagine):
+    """
+    Modèle de la liste des participantes de la fenêtre principale
+
+    Colonnes de la requête :
+        id_participante, prenom, nom, ville, courriel, telephone_1, poste_telephone_1, numero_membre
+    """
+    HEADERS = ["Index", "Nom", "Ville", "Courriel", "Téléphone", "Numéro \n de membre"]
+
+    def __init__(self, database, taille_page=TAILLE_PAGE):
+        super(ModeleParticipante, self).__init__(database, taille_page)
+
+        # Afficher le prénom avant le nom
+        self.PRENOM_NOM = False
+
+    def id_participante(self, row):
+        """
+        Obtenir l'identifiant de la participante d'une ligne
+
+        :param row: Ligne du tableau
+        :return: Identifiant de la participante
+        """
+        return self.valeur(row, 0)
+
+    def formater(self, ligne, column):
+        if column == 0:
+            return str(ligne[0])
+        elif column == 1:
+            prenom = ligne[1]
+            nom = ligne[2]
+            if not nom:
+                return str(prenom)
+            if self.PRENOM_NOM:
+                return str(prenom) + " " + str(nom)
+            return str(nom) + ", " + str(prenom)
+        elif column == 2:
+            return str(ligne[3] or "")
+        elif column == 3:
+            return str(ligne[4] or "")
+        elif column == 4:
+            phone_number_string = str(ligne[5])
+            phone_number = phone_number_string[:3] + " " + phone_number_string[3:6] + "-" + phone_number_string[6:]
+            if ligne[6]:
+                phone_number = phone_number + " p. " + str(ligne[6])
+            return phone_number
+        else:
+            return str(ligne[7] or "")
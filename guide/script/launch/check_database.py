@@ -23,7 +23,7 @@ Methode :
     check_database_created : Vérifie qu'une base de donnée est enregistrée dans les réglages
     check_database_exist : Vérifie si la base de donnée enregistrée existe
     check_database_open : Vérifie si la base de données peut ouvrir
-    check_table_module : Vérifier si la base de données contient la table de modules installés
+    check_table_module : Vérifier si la base de données contient la table de modules installés et la mettre à jour
     preparation_wizard : Ouvre l'assistant de préparation du programme GUIDE
 """
 
@@ -38,7 +38,9 @@ from PyQt5.QtSql import QSqlDatabase, QSqlQuery
 
 # Project import
 from guide.script.launch.preparation_wizard import PreparationWizard
+from guide.script.launch.update_database import update_database
 from guide.script.database import database_error
+from guide.script.database import sqlite_query
 
 
 def check_database_created():
@@ -84,6 +86,9 @@ def check_database_open(database):
     Vérifie si la base de données peut ouvrir
     """
 
+    # Les requêtes préparées sur la connection remplacée ne doivent plus être utilisées
+    sqlite_query.clear_cache(QSqlDatabase.database(open=False))
+
     # Préparation de la connection à la base de donnée
     db = QSqlDatabase.addDatabase("QSQLITE")
     db.setDatabaseName(database)
@@ -118,8 +123,8 @@ def check_table_module(db):
 
     # Vérifier si la table des modules installés existe
     if count:
-        # Retourner la base de données
-        return db
+        # Mettre à jour les modules installés et retourner la base de données
+        return update_database(db)
     else:
         # Indique à l'utilisateur qu'il s'agit d'une ancienne version de la base de donnée
         ret = database_error.ancienne_version()
@@ -0,0 +1,79 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Mesure du temps de démarrage du programme
+
+Le chronomètre démarre à l'importation du module. Ce module doit donc être importé en premier par le script de
+lancement. Le rapport est affiché lorsque le programme est lancé avec l'option --temps-demarrage.
+
+Methodes :
+    etape : Enregistrer la fin d'une étape du démarrage
+    rapport : Obtenir le rapport du temps de chaque étape
+    afficher_rapport : Afficher le rapport dans la sortie d'erreur si l'option est demandée
+    terminer : Enregistrer l'affichage de la fenêtre principale et afficher le rapport
+"""
+
+# Python import
+import sys
+import time
+
+# Option de la ligne de commande qui active le rapport
+OPTION = "--temps-demarrage"
+
+# Début du démarrage
+_DEBUT = time.perf_counter()
+
+# Liste des étapes [(Nom, Temps depuis le début)]
+_ETAPES = list()
+
+
+def etape(nom):
+    """
+    Enregistrer la fin d'une étape du démarrage
+
+    :param nom: Nom de l'étape
+    """
+    _ETAPES.append((nom, time.perf_counter() - _DEBUT))
+
+
+def rapport():
+    """
+    Obtenir le rapport du temps de chaque étape
+
+    :return: Texte du rapport
+    """
+    lignes = ["Temps de démarrage :"]
+    precedent = 0.0
+    for nom, temps in _ETAPES:
+        lignes.append("  {:<30} {:8.1f} ms  (total {:8.1f} ms)".format(nom, (temps - precedent) * 1000, temps * 1000))
+        precedent = temps
+    return "\n".join(lignes)
+
+
+def afficher_rapport():
+    """
+    Afficher le rapport dans la sortie d'erreur si l'option est demandée
+    """
+    if OPTION in sys.argv:
+        print(rapport(), file=sys.stderr)
+
+
+def terminer():
+    """
+    Enregistrer l'affichage de la fenêtre principale et afficher le rapport
+    """
+    etape("Affichage de la fenêtre")
+    afficher_rapport()
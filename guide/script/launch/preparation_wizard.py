@@ -21,7 +21,7 @@ import errno
 
 # PyQt import
 from PyQt5.QtWidgets import QWizard, QGraphicsScene, QGraphicsPixmapItem, QFileDialog, QDialog
-from PyQt5.QtGui import QPixmap, QIcon
+from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, QSettings
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery
 
@@ -30,6 +30,9 @@ from guide.interface.ui_preparation_wizard import Ui_PreparationWizard
 from guide.script.interface import validator
 from guide.script.data import file_error
 from guide.script.database import database_error
+from guide.script.database import sqlite_query
+from guide.script.database.schema import GUIDE, INFORMATIONS, ACTIVITE, CATEGORIE_ACTIVITE, LIEU, RESPONSABLE, \
+    TYPE_ACTIVITE, ARTICLE, FACTURE, INSCRIPTION, GROUPE, MEMBRE, PARTICIPANTE, LISTE_MODULE_DEPENDANT
 
 # Définition des ID des pages
 PAGE_DESCRIPTION = 0
@@ -43,255 +46,30 @@ PAGE_FIN = 5
 PATH_STATS = str(os.path.join(Path.home(), 'Documents', 'GUIDE', 'Statistics'))
 PATH_DB = str(os.path.join(Path.home(), 'Documents', 'GUIDE', 'Database'))
 
-# Définition des requêtes pour créer les tables
-QUERY_GUIDE = "\
-CREATE TABLE guide ( \
-    module  INTEGER NOT NULL \
-                    UNIQUE, \
-    version INTEGER NOT NULL \
-)"
-VERSION_GUIDE = 2
-MODULE_GUIDE = 0
-GUIDE = {'query': QUERY_GUIDE, 'version': VERSION_GUIDE, 'module': MODULE_GUIDE}
-
-QUERY_ACTIVITE = " \
-CREATE TABLE activite ( \
-    id_activite             INTEGER, \
-    id_categorie_activite   INTEGER NOT NULL, \
-    nom                     VARCHAR(255),\
-    date                    INTEGER NOT NULL, \
-    heure_debut             INTEGER NOT NULL, \
-    heure_fin               INTEGER NOT NULL, \
-    date_limite_inscription INTEGER NOT NULL, \
-    status                  INTEGER NOT NULL \
-                                    DEFAULT (1), \
-    PRIMARY KEY ( \
-        id_activite \
-    ) \
-)"
-VERSION_ACTIVITE = 1
-MODULE_ACTIVITE = 1
-ACTIVITE = {'query': QUERY_ACTIVITE, 'version': VERSION_ACTIVITE, 'module': MODULE_ACTIVITE}
-
-QUERY_ARTICLE = "\
-CREATE TABLE article (\
-    id_article  INTEGER PRIMARY KEY AUTOINCREMENT,\
-    id_facture  INTEGER,\
-    id_activite INTEGER REFERENCES activite (id_activite) ON DELETE RESTRICT\
-                                                          ON UPDATE CASCADE\
-                        NOT NULL,\
-    prix        REAL,\
-    description TEXT,\
-    FOREIGN KEY (\
-        id_facture\
-    )\
-    REFERENCES facture (id_facture) \
-)"
-VERSION_ARTICLE = 1
-MODULE_ARTICLE = 2
-ARTICLE = {'query': QUERY_ARTICLE, 'version': VERSION_ARTICLE, 'module': MODULE_ARTICLE}
-
-QUERY_CATEGORIE_ACTIVITE = "\
-CREATE TABLE categorie_activite ( \
-    id_categorie_activite INTEGER PRIMARY KEY, \
-    nom                   TEXT    NOT NULL \
-                                  UNIQUE, \
-    prix_membre           REAL    DEFAULT (0) \
-                                  NOT NULL, \
-    prix_non_membre       REAL    DEFAULT (0) \
-                                  NOT NULL, \
-    participante_minimum  INTEGER DEFAULT (0) \
-                                  NOT NULL, \
-    participante_maximum  INTEGER NOT NULL \
-                                  DEFAULT (0), \
-    id_responsable        INTEGER NOT NULL \
-                                  REFERENCES responsable (id_responsable) ON DELETE RESTRICT \
-                                                                          ON UPDATE CASCADE, \
-    id_type_activite      INTEGER REFERENCES type_activite (id_type_activite) ON DELETE RESTRICT \
-                                                                              ON UPDATE CASCADE \
-                                  NOT NULL, \
-    id_lieu               INTEGER REFERENCES lieu (id_lieu) ON DELETE RESTRICT \
-                                                            ON UPDATE CASCADE \
-                                  NOT NULL \
-)"
-VERSION_CATEGORIE_ACTIVITE = 1
-MODULE_CATEGORIE_ACTIVITE = 3
-CATEGORIE_ACTIVITE = {'query': QUERY_CATEGORIE_ACTIVITE, 'version': VERSION_CATEGORIE_ACTIVITE,
-                      'module': MODULE_CATEGORIE_ACTIVITE}
-
-QUERY_FACTURE = "\
-CREATE TABLE facture ( \
-    id_facture      INTEGER  PRIMARY KEY AUTOINCREMENT, \
-    date            DATETIME DEFAULT (datetime('now', 'localtime') ), \
-    numero_recu     TEXT, \
-    id_participante INTEGER  NOT NULL, \
-    total           REAL, \
-    FOREIGN KEY ( \
-        id_participante \
-    ) \
-    REFERENCES participante (id_participante) ON DELETE RESTRICT \
-                                              ON UPDATE CASCADE \
-)"
-VERSION_FACTURE = 1
-MODULE_FACTURE = 4
-FACTURE = {'query': QUERY_FACTURE, 'version': VERSION_FACTURE, 'module': MODULE_FACTURE}
-
-QUERY_GROUPE = "\
-CREATE TABLE groupe ( \
-    id_groupe   INTEGER PRIMARY KEY, \
-    id_activite INTEGER REFERENCES activite (id_activite) ON DELETE RESTRICT \
-                                                          ON UPDATE CASCADE \
-                        NOT NULL \
-                        UNIQUE, \
-    f_0_4       INTEGER DEFAULT (0), \
-    f_5_11      INTEGER DEFAULT (0), \
-    f_12_17     INTEGER DEFAULT (0), \
-    f_18_34     INTEGER DEFAULT (0), \
-    f_35_64     INTEGER DEFAULT (0), \
-    f_65        INTEGER DEFAULT (0), \
-    h_0_4       INTEGER DEFAULT (0), \
-    h_5_11      INTEGER DEFAULT (0), \
-    h_12_17     INTEGER DEFAULT (0), \
-    h_18_34     INTEGER DEFAULT (0), \
-    h_35_64     INTEGER DEFAULT (0), \
-    h_65        INTEGER DEFAULT (0) \
-)"
-VERSION_GROUPE = 1
-MODULE_GROUPE = 5
-GROUPE = {'query': QUERY_GROUPE, 'version': VERSION_GROUPE, 'module': MODULE_GROUPE}
-
-QUERY_INSCRIPTION = "\
-CREATE TABLE inscription ( \
-    id_inscription  INTEGER  PRIMARY KEY AUTOINCREMENT, \
-    id_participante INTEGER  NOT NULL, \
-    id_activite     INTEGER  NOT NULL, \
-    status          INTEGER  NOT NULL, \
-    present         INTEGER, \
-    time            DATETIME DEFAULT (datetime('now', 'localtime') ), \
-    FOREIGN KEY ( \
-        id_participante \
-    ) \
-    REFERENCES participante (id_participante) ON DELETE RESTRICT \
-                                              ON UPDATE CASCADE, \
-    FOREIGN KEY ( \
-        id_activite \
-    ) \
-    REFERENCES activite (id_activite) ON DELETE RESTRICT \
-                                      ON UPDATE CASCADE \
-)"
-VERSION_INSCRIPTION = 1
-MODULE_INSCRIPTION = 6
-INSCRIPTION = {'query': QUERY_INSCRIPTION, 'version': VERSION_INSCRIPTION, 'module': MODULE_INSCRIPTION}
-
-QUERY_LIEU = "\
-CREATE TABLE lieu ( \
-    id_lieu     INTEGER PRIMARY KEY, \
-    nom         TEXT    NOT NULL, \
-    adresse_1   TEXT    NOT NULL, \
-    adresse_2   TEXT, \
-    ville       TEXT, \
-    province    TEXT, \
-    code_postal TEXT, \
-    UNIQUE ( \
-        nom, \
-        adresse_1 \
-    ) \
-    ON CONFLICT ABORT \
-)"
-VERSION_LIEU = 1
-MODULE_LIEU = 7
-LIEU = {'query': QUERY_LIEU, 'version': VERSION_LIEU, 'module': MODULE_LIEU}
-
-QUERY_MEMBRE = "\
-CREATE TABLE membre ( \
-    id_membre           INTEGER PRIMARY KEY, \
-    actif               BOOLEAN, \
-    id_participante     INTEGER REFERENCES participante (id_participante) ON DELETE RESTRICT \
-                                                                          ON UPDATE RESTRICT, \
-    numero_membre       INTEGER, \
-    membre_honoraire    BOOLEAN, \
-    date_renouvellement DATE \
-)"
-VERSION_MEMBRE = 1
-MODULE_MEMBRE = 8
-MEMBRE = {'query': QUERY_MEMBRE, 'version': VERSION_MEMBRE, 'module': MODULE_MEMBRE}
-
-QUERY_PARTICIPANTE = "\
-CREATE TABLE participante ( \
-    id_participante    INTEGER PRIMARY KEY, \
-    appellation        TEXT, \
-    prenom             TEXT    NOT NULL, \
-    nom                TEXT, \
-    adresse_1          TEXT, \
-    adresse_2          TEXT, \
-    ville              TEXT, \
-    province           TEXT, \
-    code_postal        TEXT, \
-    courriel           TEXT, \
-    telephone_1        INTEGER NOT NULL, \
-    telephone_2        INTEGER, \
-    poste_telephone_1  INTEGER, \
-    poste_telephone_2  INTEGER, \
-    date_naissance     INTEGER, \
-    personne_nourrie   INTEGER, \
-    consentement_photo BOOLEAN, \
-    UNIQUE ( \
-        prenom, \
-        nom, \
-        telephone_1 \
-    ) \
-    ON CONFLICT ABORT \
-)"
-VERSION_PARTICIPANTE = 1
-MODULE_PARTICIPANTE = 9
-PARTICIPANTE = {'query': QUERY_PARTICIPANTE, 'version': VERSION_PARTICIPANTE, 'module': MODULE_PARTICIPANTE}
-
-QUERY_RESPONSABLE = "\
-CREATE TABLE responsable ( \
-    id_responsable INTEGER PRIMARY KEY, \
-    prenom         TEXT    NOT NULL, \
-    nom            TEXT, \
-    UNIQUE ( \
-        prenom, \
-        nom \
-    ) \
-    ON CONFLICT ABORT \
-)"
-VERSION_RESPONSABLE = 1
-MODULE_RESPONSABLE = 10
-RESPONSABLE = {'query': QUERY_RESPONSABLE, 'version': VERSION_RESPONSABLE, 'module': MODULE_RESPONSABLE}
-
-QUERY_TYPE_ACTIVITE = "\
-CREATE TABLE type_activite ( \
-    id_type_activite INTEGER PRIMARY KEY, \
-    nom              TEXT    NOT NULL \
-                             UNIQUE \
-)"
-VERSION_TYPE_ACTIVITE = 1
-MODULE_TYPE_ACTIVITE = 11
-TYPE_ACTIVITE = {'query': QUERY_TYPE_ACTIVITE, 'version': VERSION_TYPE_ACTIVITE, 'module': MODULE_TYPE_ACTIVITE}
-
-QUERY_INFORMATIONS = "\
-CREATE TABLE informations ( \
-    nom         TEXT    NOT NULL, \
-    departement TEXT, \
-    adresse1    TEXT    NOT NULL, \
-    adresse2    TEXT, \
-    ville       TEXT    NOT NULL, \
-    code_postal TEXT, \
-    province    TEXT, \
-    pays        TEXT, \
-    telephone   INTEGER, \
-    poste       INTEGER, \
-    sf          INTEGER, \
-    sf_poste    INTEGER, \
-    fax         INTEGER, \
-    fax_poste   INTEGER, \
-    courriel    TEXT \
-)"
-VERSION_INFORMATIONS = 1
-MODULE_INFORMATIONS = 12
-INFORMATIONS = {'query': QUERY_INFORMATIONS, 'version': VERSION_INFORMATIONS, 'module': MODULE_INFORMATIONS}
+
+def module_disponible(table, modules, db):
+    """
+    Vérifier si un module dépendant peut être installé
+
+    :param table: Module dépendant
+    :param modules: Liste des numéros des modules installés
+    :param db: Base de données
+    :return: True si les dépendances sont installées et que SQLite supporte le module
+    """
+    for dependance in table.get('dependance', list()):
+        if dependance['module'] not in modules:
+            return False
+
+    option = table.get('option')
+    if option:
+        query = QSqlQuery(db)
+        query.prepare("SELECT sqlite_compileoption_used(:option)")
+        query.bindValue(':option', option)
+        query.exec_()
+        if not query.first() or not query.value(0):
+            return False
+
+    return True
 
 
 class PreparationWizard(QWizard, Ui_PreparationWizard):
@@ -589,6 +367,8 @@ class PreparationWizard(QWizard, Ui_PreparationWizard):
             # Créer la base de données
             filename = nom + '.guide'
             db_dir = str(os.path.join(db_dir, filename))
+            # Les requêtes préparées sur la connection remplacée ne doivent plus être utilisées
+            sqlite_query.clear_cache(QSqlDatabase.database(open=False))
             db = QSqlDatabase.addDatabase('QSQLITE')
             db.setDatabaseName(db_dir)
 
@@ -653,15 +433,34 @@ class PreparationWizard(QWizard, Ui_PreparationWizard):
             if participante:
                 liste_table.append(PARTICIPANTE)
 
+            # Ajouter les modules qui dépendent des modules sélectionnés
+            modules = [table['module'] for table in liste_table]
+            for table in LISTE_MODULE_DEPENDANT:
+                if module_disponible(table, modules, db):
+                    liste_table.append(table)
+
             # Ajouter les autres tables à la base de données
             for table in liste_table:
-                QSqlQuery().exec_(table['query'])
+                query = QSqlQuery()
+                query.exec_(table['query'])
 
                 # Affichage d'un message d'erreur si la requete echoue
                 if database_error.sql_error_handler(query.lastError()):
                     db.rollback()  # Annuler la transaction
                     return  # Empêche de continuer la création de la base de données
 
+                # Appliquer les migrations du module (index, triggers, etc.)
+                migration = table.get('migration', dict())
+                for version in sorted(migration):
+                    for requete in migration[version]:
+                        query = QSqlQuery()
+                        query.exec_(requete)
+
+                        # Affichage d'un message d'erreur si la requete echoue
+                        if database_error.sql_error_handler(query.lastError()):
+                            db.rollback()  # Annuler la transaction
+                            return  # Empêche de continuer la création de la base de données
+
                 # Ajouter le numéro de version
                 query = QSqlQuery()
                 query.prepare("INSERT INTO guide (module, version) \
@@ -0,0 +1,153 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Module responsable de la mise à jour d'une base de données existante.
+
+Les modules installés sont lus dans la table guide. Pour chaque module dont la version enregistrée est inférieure à
+la version du programme, les migrations des versions manquantes sont appliquées dans l'ordre et le numéro de version
+est mis à jour. Les modules dépendants qui ne sont pas installés sont ajoutés lorsque tous les modules dont ils
+dépendent sont installés. Toutes les modifications sont effectuées dans une seule transaction.
+
+Methode :
+    update_database : Mettre à jour les modules installés dans la base de données
+    modules_installes : Obtenir la version des modules installés
+"""
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database.schema import LISTE_MODULE, LISTE_MODULE_DEPENDANT
+from guide.script.launch.preparation_wizard import module_disponible
+from guide.script.database import database_error
+
+
+def modules_installes(db):
+    """
+    Obtenir la version des modules installés
+
+    :param db: Base de données
+    :return: Dictionnaire {Module: Version} ou None si la requête échoue
+    """
+    query = QSqlQuery(db)
+    query.exec_("SELECT module, version FROM guide")
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    modules = dict()
+    while query.next():
+        modules[query.value(0)] = query.value(1)
+    return modules
+
+
+def update_database(db):
+    """
+    Mettre à jour les modules installés dans la base de données
+
+    :param db: Base de données
+    :return: Base de données
+    """
+    modules = modules_installes(db)
+    if modules is None:
+        return db
+
+    # Déterminer les migrations à appliquer
+    liste_migration = list()
+    for table in LISTE_MODULE:
+        version = modules.get(table['module'])
+
+        # Le module n'est pas installé ou est à jour
+        if version is None or version >= table['version']:
+            continue
+
+        migration = table.get('migration', dict())
+        requetes = list()
+        for version_migration in sorted(migration):
+            if version < version_migration <= table['version']:
+                requetes.extend(migration[version_migration])
+        liste_migration.append((table, requetes))
+
+    # Déterminer les modules dépendants à installer
+    liste_nouveau_module = list()
+    for table in LISTE_MODULE_DEPENDANT:
+        if table['module'] not in modules and module_disponible(table, modules, db):
+            migration = table.get('migration', dict())
+            requetes = [table['query']]
+            for version_migration in sorted(migration):
+                requetes.extend(migration[version_migration])
+            liste_nouveau_module.append((table, requetes))
+
+    # La base de données est à jour
+    if not liste_migration and not liste_nouveau_module:
+        return db
+
+    # Commencer une transaction
+    db.transaction()
+
+    for table, requetes in liste_migration:
+        for requete in requetes:
+            query = QSqlQuery(db)
+            query.exec_(requete)
+
+            # Affichage d'un message d'erreur si la requete echoue
+            if database_error.sql_error_handler(query.lastError()):
+                db.rollback()  # Annuler la transaction
+                return db  # La base de données reste utilisable dans sa version précédente
+
+        # Mettre à jour le numéro de version du module
+        query = QSqlQuery(db)
+        query.prepare("UPDATE guide SET version = :version WHERE module = :module")
+        query.bindValue(':version', table['version'])
+        query.bindValue(':module', table['module'])
+        query.exec_()
+
+        # Affichage d'un message d'erreur si la requete echoue
+        if database_error.sql_error_handler(query.lastError()):
+            db.rollback()  # Annuler la transaction
+            return db
+
+    for table, requetes in liste_nouveau_module:
+        for requete in requetes:
+            query = QSqlQuery(db)
+            query.exec_(requete)
+
+            # Affichage d'un message d'erreur si la requete echoue
+            if database_error.sql_error_handler(query.lastError()):
+                db.rollback()  # Annuler la transaction
+                return db
+
+        # Ajouter le numéro de version du module
+        query = QSqlQuery(db)
+        query.prepare("INSERT INTO guide (module, version) VALUES (:module, :version)")
+        query.bindValue(':module', table['module'])
+        query.bindValue(':version', table['version'])
+        query.exec_()
+
+        # Affichage d'un message d'erreur si la requete echoue
+        if database_error.sql_error_handler(query.lastError()):
+            db.rollback()  # Annuler la transaction
+            return db
+
+    # Terminer la transaction
+    db.commit()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(db.lastError()):
+        db.rollback()  # Annuler la transaction
+
+    return db
@@ -0,0 +1,240 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Génération des documents PDF
+
+Chaque document remplit un gabarit HTML du dossier gabarit. Le HTML est mis en page par QTextDocument et écrit dans un
+fichier PDF par QPdfWriter, directement dans le processus de l'application. Aucune distribution LaTeX n'est nécessaire.
+Les gabarits sont lus une seule fois puis conservés en mémoire.
+
+QTextDocument répète l'entête des tableaux (thead) sur chaque page et numérote les pages.
+
+Methodes :
+    gabarit : Obtenir un gabarit
+    texte : Convertir une valeur en texte HTML
+    ligne : Créer une ligne de tableau HTML
+
+Classes
+    Document : Classe de base des documents
+    ListePresence : Liste de présences d'une activité
+    Tableau : Tableau de résultats d'une requête
+    Recu : Reçu d'une facture
+"""
+
+# Python import
+import os
+import tempfile
+import uuid
+from html import escape
+from string import Template
+
+# PyQt import
+from PyQt5.QtCore import QMarginsF
+from PyQt5.QtGui import QTextDocument, QPdfWriter, QPageSize, QPageLayout, QFont
+
+# Nom de l'organisme affiché dans l'entête des documents
+ORGANISME = "Centre femmes du Haut-Richelieu"
+
+# Dossier des gabarits
+DOSSIER_GABARIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gabarit")
+
+# Marges des pages en millimètres
+MARGE = 25.4
+
+# Taille du texte en points
+TAILLE_TEXTE = 10
+
+# Gabarits lus {Nom: Template}
+_GABARITS = dict()
+
+
+def gabarit(nom):
+    """
+    Obtenir un gabarit
+
+    Le fichier est lu lors de la première utilisation seulement.
+
+    :param nom: Nom du fichier du gabarit sans l'extension .html
+    :return: string.Template
+    """
+    if nom not in _GABARITS:
+        with open(os.path.join(DOSSIER_GABARIT, nom + ".html"), encoding='utf-8') as fichier:
+            _GABARITS[nom] = Template(fichier.read())
+    return _GABARITS[nom]
+
+
+def texte(valeur):
+    """
+    Convertir une valeur en texte HTML
+
+    :param valeur: Valeur à afficher
+    :return: Texte dont les caractères spéciaux sont remplacés. Une valeur nulle est remplacée par un texte vide.
+    """
+    if valeur is None:
+        return ""
+    return escape(str(valeur))
+
+
+def ligne(valeurs, balise='td'):
+    """
+    Créer une ligne de tableau HTML
+
+    :param valeurs: Valeurs de chaque colonne
+    :param balise: Balise des cellules (td ou th)
+    :return: Ligne HTML
+    """
+    return "<tr>" + "".join("<{0} align=\"left\">{1}</{0}>".format(balise, texte(valeur)) for valeur in valeurs) + \
+           "</tr>"
+
+
+class Document:
+    """
+    Classe de base des documents
+
+    Les sous-classes définissent le nom de leur gabarit (GABARIT) et les valeurs à y insérer (valeurs).
+
+    Methodes :
+        valeurs : Obtenir les valeurs à insérer dans le gabarit
+        html : Obtenir le HTML du document
+        enregistrer : Enregistrer le document dans un fichier PDF
+        afficher : Enregistrer le document dans un fichier temporaire et l'ouvrir
+    """
+    GABARIT = None
+
+    def __init__(self, titre):
+        # Titre du document
+        self.TITRE = titre
+
+    def valeurs(self):
+        """
+        Obtenir les valeurs à insérer dans le gabarit
+        Implanter dans les sous classes
+
+        :return: Dictionnaire {Nom: HTML}
+        """
+        return dict()
+
+    def html(self):
+        """
+        Obtenir le HTML du document
+
+        :return: HTML
+        """
+        return gabarit(self.GABARIT).substitute(organisme=texte(ORGANISME), titre=texte(self.TITRE),
+                                                **self.valeurs())
+
+    def enregistrer(self, fichier):
+        """
+        Enregistrer le document dans un fichier PDF
+
+        :param fichier: Chemin du fichier PDF
+        :return: Chemin du fichier PDF
+        """
+        document = QTextDocument()
+        document.setDefaultFont(QFont(document.defaultFont().family(), TAILLE_TEXTE))
+        document.setHtml(self.html())
+
+        writer = QPdfWriter(fichier)
+        writer.setTitle(self.TITRE)
+        writer.setCreator("PyGuide")
+        writer.setPageSize(QPageSize(QPageSize.Letter))
+        writer.setPageMargins(QMarginsF(MARGE, MARGE, MARGE, MARGE), QPageLayout.Millimeter)
+
+        document.print_(writer)
+        return fichier
+
+    def afficher(self):
+        """
+        Enregistrer le document dans un fichier temporaire et l'ouvrir avec le lecteur PDF par défaut
+        """
+        fichier = os.path.join(tempfile.mkdtemp(), str(uuid.uuid4()) + ".pdf")
+        os.startfile(os.path.normpath(self.enregistrer(fichier)))
+
+
+class ListePresence(Document):
+    """Liste de présences d'une activité"""
+    GABARIT = "presence"
+
+    def __init__(self, activite, date, participantes):
+        """
+        :param activite: Nom de l'activité
+        :param date: Date de l'activité affichée
+        :param participantes: Liste des noms des participantes
+        """
+        super(ListePresence, self).__init__("Liste de présences")
+        self.ACTIVITE = activite
+        self.DATE = date
+        self.PARTICIPANTES = participantes
+
+    def valeurs(self):
+        """Obtenir les valeurs à insérer dans le gabarit"""
+        return {'activite': texte(self.ACTIVITE),
+                'date': texte(self.DATE),
+                'lignes': "\n".join(ligne([participante, ""]) for participante in self.PARTICIPANTES)}
+
+
+class Tableau(Document):
+    """Tableau de résultats d'une requête"""
+    GABARIT = "tableau"
+
+    def __init__(self, titre, entetes, lignes, sous_titre=""):
+        """
+        :param titre: Titre du document
+        :param entetes: Entête de chaque colonne
+        :param lignes: Itérable des lignes. Chaque ligne est une liste de valeurs.
+        :param sous_titre: Texte affiché sous le titre
+        """
+        super(Tableau, self).__init__(titre)
+        self.ENTETES = entetes
+        self.LIGNES = lignes
+        self.SOUS_TITRE = sous_titre
+
+    def valeurs(self):
+        """Obtenir les valeurs à insérer dans le gabarit"""
+        return {'sous_titre': texte(self.SOUS_TITRE),
+                'entetes': "".join("<th align=\"left\">{}</th>".format(texte(entete)) for entete in self.ENTETES),
+                'lignes': "\n".join(ligne(valeurs) for valeurs in self.LIGNES)}
+
+
+class Recu(Document):
+    """Reçu d'une facture"""
+    GABARIT = "facture"
+
+    def __init__(self, facture, id_facture, participante, date):
+        """
+        :param facture: guide.facturation.service.DescriptionFacture
+        :param id_facture: Numéro de la facture
+        :param participante: Nom de la participante
+        :param date: Date de la facture affichée
+        """
+        super(Recu, self).__init__("Reçu")
+        self.FACTURE = facture
+        self.ID_FACTURE = id_facture
+        self.PARTICIPANTE = participante
+        self.DATE = date
+
+    def valeurs(self):
+        """Obtenir les valeurs à insérer dans le gabarit"""
+        lignes = list()
+        for article in self.FACTURE.articles:
+            lignes.append("<tr><td>{}</td><td align=\"right\">{:.2f} $</td></tr>".format(texte(article.description),
+                                                                                        article.prix))
+        return {'participante': texte(self.PARTICIPANTE),
+                'numero_facture': texte(self.ID_FACTURE),
+                'numero_recu': texte(self.FACTURE.numero_recu),
+                'date': texte(self.DATE),
+                'lignes': "\n".join(lignes),
+                'total': "{:.2f} $".format(self.FACTURE.total)}
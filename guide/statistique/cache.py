@@ -0,0 +1,284 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cache des résultats des statistiques
+
+Le résultat d'une requête est enregistré dans un fichier identifié par le SQL normalisé et les valeurs des paramètres.
+Le fichier contient aussi la version des tables utilisées par la requête (table version_table). Le résultat est encore
+valide tant qu'aucune de ces tables n'a été modifiée.
+
+Les résultats sont enregistrés dans un fichier compressé par gzip. La première ligne est un entête JSON (SQL, versions
+et colonnes). Chaque ligne suivante est un bloc de TAILLE_BLOC lignes du résultat enregistré par colonne. Le fichier
+est écrit et lu un bloc à la fois : seul le bloc en cours est conservé en mémoire, comme pour l'exportation CSV.
+
+La taille totale du cache est limitée : les résultats utilisés le moins récemment sont supprimés en premier. La date
+de modification d'un fichier est mise à jour chaque fois qu'il est lu.
+
+Ce module n'utilise pas PyQt.
+
+Methodes :
+    normaliser : Normaliser le SQL d'une requête
+    tables : Obtenir les tables utilisées par une requête
+    cle : Obtenir la clé d'une requête
+    lire : Lire un résultat enregistré
+    lire_blocs : Lire les lignes d'un résultat enregistré un bloc à la fois
+    supprimer : Supprimer un fichier du cache
+    ecrire : Enregistrer un résultat
+    conserver : Enregistrer les lignes d'un résultat à mesure qu'elles sont lues
+    evincer : Supprimer les résultats les moins récemment utilisés
+"""
+
+# Python import
+import gzip
+import hashlib
+import json
+import os
+import re
+import uuid
+
+# Extension des fichiers du cache
+EXTENSION = ".json.gz"
+
+# Version du format des fichiers du cache
+FORMAT = 2
+
+# Nombre de lignes de chaque bloc
+TAILLE_BLOC = 1000
+
+# Taille maximale du cache en octets
+TAILLE_MAXIMALE = 50 * 1024 * 1024
+
+# Nombre maximal de lignes d'un résultat enregistré
+# Le fichier d'un résultat plus grand est abandonné pendant son écriture, le résultat est seulement exporté
+LIGNES_MAXIMUM = 200000
+
+
+def normaliser(sql):
+    """
+    Normaliser le SQL d'une requête
+
+    Les espaces consécutifs sont remplacés par un seul espace.
+
+    :param sql: SQL
+    :return: SQL normalisé
+    """
+    return " ".join(sql.split())
+
+
+def tables(sql, noms):
+    """
+    Obtenir les tables utilisées par une requête
+
+    :param sql: SQL
+    :param noms: Noms des tables dont la version est connue
+    :return: Liste triée des tables mentionnées dans le SQL
+    """
+    return sorted(nom for nom in noms if re.search(r"\b{}\b".format(re.escape(nom)), sql))
+
+
+def cle(sql, parametres):
+    """
+    Obtenir la clé d'une requête
+
+    :param sql: SQL
+    :param parametres: Valeurs des paramètres
+    :return: Empreinte SHA-1 du SQL normalisé et des paramètres
+    """
+    contenu = json.dumps([normaliser(sql), list(parametres)], ensure_ascii=False, default=str)
+    return hashlib.sha1(contenu.encode('utf-8')).hexdigest()
+
+
+def lire(dossier, sql, parametres, versions):
+    """
+    Lire un résultat enregistré
+
+    Seul l'entête est lu immédiatement. Les lignes sont lues avec lire_blocs à mesure qu'elles sont utilisées. Le
+    fichier retourné doit être fermé par l'appelant, même si ses lignes ne sont pas lues.
+    Un résultat dont une table a été modifiée est supprimé.
+
+    :param dossier: Dossier du cache
+    :param sql: SQL
+    :param parametres: Valeurs des paramètres
+    :param versions: Dictionnaire {Table: Version} des tables utilisées
+    :return: (Liste des colonnes (Table, Nom), Fichier ouvert) ou None si le résultat n'est pas enregistré
+    """
+    chemin = os.path.join(dossier, cle(sql, parametres) + EXTENSION)
+    try:
+        fichier = gzip.open(chemin, 'rt', encoding='utf-8')
+    except OSError:
+        return None
+
+    try:
+        entete = json.loads(fichier.readline())
+    except (OSError, ValueError, EOFError):
+        fichier.close()
+        supprimer(chemin)
+        return None
+
+    if not isinstance(entete, dict) or entete.get('format') != FORMAT or entete.get('sql') != normaliser(sql) or \
+            entete.get('versions') != versions:
+        fichier.close()
+        supprimer(chemin)
+        return None
+
+    # Le résultat est maintenant le plus récemment utilisé
+    os.utime(chemin)
+
+    colonnes = [tuple(colonne) for colonne in entete['colonnes']]
+    return colonnes, fichier
+
+
+def lire_blocs(fichier):
+    """
+    Lire les lignes d'un résultat enregistré un bloc à la fois
+
+    :param fichier: Fichier du cache ouvert par lire
+    :return: Générateur des lignes
+    """
+    for bloc in fichier:
+        for ligne in zip(*json.loads(bloc)):
+            yield list(ligne)
+
+
+def supprimer(chemin):
+    """
+    Supprimer un fichier du cache
+
+    :param chemin: Chemin du fichier
+    """
+    try:
+        os.remove(chemin)
+    except OSError:
+        pass  # Le fichier sera remplacé par le prochain résultat
+
+
+def ecrire(dossier, sql, parametres, versions, colonnes, lignes, taille_maximale=TAILLE_MAXIMALE):
+    """
+    Enregistrer un résultat
+
+    :param dossier: Dossier du cache
+    :param sql: SQL
+    :param parametres: Valeurs des paramètres
+    :param versions: Dictionnaire {Table: Version} des tables utilisées
+    :param colonnes: Liste des colonnes (Table, Nom)
+    :param lignes: Itérable des lignes
+    :param taille_maximale: Taille maximale du cache en octets
+    """
+    for _ in conserver(dossier, sql, parametres, versions, colonnes, lignes, taille_maximale):
+        pass
+
+
+def conserver(dossier, sql, parametres, versions, colonnes, lignes, taille_maximale=TAILLE_MAXIMALE):
+    """
+    Enregistrer les lignes d'un résultat à mesure qu'elles sont lues
+
+    Les lignes sont retournées à mesure qu'elles sont lues et écrites dans un fichier temporaire par bloc. Le fichier
+    remplace le résultat enregistré seulement si toutes les lignes sont lues. Il est supprimé si la lecture est
+    interrompue (annulation ou erreur), si une écriture échoue ou si le résultat dépasse LIGNES_MAXIMUM.
+
+    :param dossier: Dossier du cache
+    :param sql: SQL
+    :param parametres: Valeurs des paramètres
+    :param versions: Dictionnaire {Table: Version} des tables utilisées
+    :param colonnes: Liste des colonnes (Table, Nom)
+    :param lignes: Itérable des lignes
+    :param taille_maximale: Taille maximale du cache en octets
+    :return: Générateur des lignes
+    """
+    chemin = os.path.join(dossier, cle(sql, parametres) + EXTENSION)
+    temporaire = "{}.{}.tmp".format(chemin, uuid.uuid4().hex)
+    entete = {'format': FORMAT,
+              'sql': normaliser(sql),
+              'versions': versions,
+              'colonnes': [list(colonne) for colonne in colonnes]}
+
+    def ecrire_ligne(contenu):
+        fichier.write(json.dumps(contenu, ensure_ascii=False, separators=(',', ':'), default=str) + "\n")
+
+    def ecrire_bloc(bloc):
+        ecrire_ligne([[ligne[i] for ligne in bloc] for i in range(len(colonnes))])
+
+    # Le résultat est seulement exporté si le fichier ne peut pas être créé
+    try:
+        os.makedirs(dossier, exist_ok=True)
+        fichier = gzip.open(temporaire, 'wt', encoding='utf-8')
+        ecrire_ligne(entete)
+    except OSError:
+        fichier = None
+
+    complet = False
+    nombre_ligne = 0
+    bloc = list()
+    try:
+        for ligne in lignes:
+            if fichier is not None:
+                bloc.append(ligne)
+                nombre_ligne = nombre_ligne + 1
+                try:
+                    if nombre_ligne > LIGNES_MAXIMUM:
+                        raise OSError("Résultat trop grand pour le cache")
+                    if len(bloc) >= TAILLE_BLOC:
+                        ecrire_bloc(bloc)
+                        bloc = list()
+                except OSError:
+                    fichier.close()
+                    supprimer(temporaire)
+                    fichier = None
+                    bloc = list()
+            yield ligne
+
+        if fichier is not None:
+            try:
+                if bloc:
+                    ecrire_bloc(bloc)
+                fichier.close()
+                os.replace(temporaire, chemin)
+                complet = True
+            except OSError:
+                pass
+    finally:
+        # Lecture interrompue ou écriture impossible
+        if fichier is not None and not complet:
+            fichier.close()
+            supprimer(temporaire)
+
+    if complet:
+        evincer(dossier, taille_maximale)
+
+
+def evincer(dossier, taille_maximale=TAILLE_MAXIMALE):
+    """
+    Supprimer les résultats les moins récemment utilisés
+
+    :param dossier: Dossier du cache
+    :param taille_maximale: Taille maximale du cache en octets
+    """
+    fichiers = list()
+    with os.scandir(dossier) as entrees:
+        for entree in entrees:
+            if entree.is_file() and entree.name.endswith(EXTENSION):
+                etat = entree.stat()
+                fichiers.append((etat.st_mtime, etat.st_size, entree.path))
+
+    taille = sum(fichier[1] for fichier in fichiers)
+    for _, taille_fichier, chemin in sorted(fichiers):
+        if taille <= taille_maximale:
+            break
+        try:
+            os.remove(chemin)
+        except OSError:
+            continue
+        taille = taille - taille_fichier
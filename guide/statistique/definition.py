@@ -0,0 +1,208 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Format des statistiques enregistrées
+
+Une statistique est enregistrée dans un fichier JSON (.gstat) qui contient :
+    - sa définition : table principale, champs, filtres, tri et jointures choisis dans le dialog des statistiques
+    - ses paramètres nommés : la valeur de chaque filtre, qui peut être modifiée lors de l'ouverture
+    - sa requête compilée : le SQL généré par le planificateur et le nom du paramètre de chaque ?
+
+La requête est compilée une seule fois lors de l'enregistrement. Les valeurs des filtres ne sont jamais écrites dans
+le SQL, elles sont liées aux paramètres lors de l'exécution.
+
+Les fichiers .gxml enregistrés par les versions précédentes (SQL seulement) sont encore lus. Leurs valeurs deviennent
+des paramètres nommés parametre_1, parametre_2...
+
+Ce module n'utilise pas PyQt.
+
+Methodes :
+    compiler : Compiler la définition d'une statistique
+    en_dictionnaire : Convertir une statistique en dictionnaire JSON
+    de_dictionnaire : Créer une statistique à partir d'un dictionnaire JSON
+    ecrire : Enregistrer une statistique dans un fichier
+    lire : Lire une statistique enregistrée
+    requete : Obtenir la requête d'une statistique avec les valeurs de ses paramètres
+
+Classes
+    Parametre : Paramètre nommé d'une statistique
+    Statistique : Statistique enregistrée
+"""
+
+# Python import
+import json
+import os
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+# Project import
+from guide.statistique import planificateur
+
+# Version du format des fichiers
+FORMAT = 1
+
+# Extension des fichiers
+EXTENSION = ".gstat"
+EXTENSION_ANCIENNE = ".gxml"
+
+# Types des paramètres
+TYPE_TEXTE = 'texte'
+TYPE_ENTIER = 'entier'
+TYPE_DATE = 'date'
+TYPE_HEURE = 'heure'
+TYPE_BOOLEEN = 'booleen'
+TYPE_DATE_HEURE = 'date_heure'
+TYPE_PRIX = 'prix'
+TYPE_STATUS = 'status'
+
+# Paramètre nommé d'une statistique
+# La valeur est celle choisie lors de l'enregistrement
+Parametre = namedtuple('Parametre', ['nom', 'libelle', 'type', 'valeur'])
+
+# Statistique enregistrée
+# definition est None pour une statistique de l'ancien format
+# requete est une planificateur.Requete dont les paramètres sont les noms des Parametre
+Statistique = namedtuple('Statistique', ['titre', 'sortie', 'definition', 'parametres', 'requete'])
+
+
+def compiler(titre, sortie, racine, champs, filtres, ordre, jointures, parametres, dict_table, dict_reference):
+    """
+    Compiler la définition d'une statistique
+
+    :param titre: Titre de la statistique
+    :param sortie: Type de fichier produit (csv ou pdf)
+    :param racine: Table principale
+    :param champs: Liste des planificateur.Champ
+    :param filtres: Liste des planificateur.Filtre dont la valeur est le nom d'un paramètre
+    :param ordre: planificateur.Champ du tri ou None
+    :param jointures: Dictionnaire {Table: Type de jointure}
+    :param parametres: Liste des Parametre
+    :param dict_table: Dictionnaire des tables
+    :param dict_reference: Dictionnaire des références
+    :return: Statistique
+    """
+    definition = {'racine': racine,
+                  'champs': [list(champ) for champ in champs],
+                  'filtres': [filtre._asdict() for filtre in filtres],
+                  'ordre': list(ordre) if ordre is not None else None,
+                  'jointures': dict(jointures)}
+    requete_compilee = planificateur.planifier(racine, champs, filtres, ordre, jointures, dict_table, dict_reference)
+    return Statistique(titre, sortie, definition, list(parametres), requete_compilee)
+
+
+def en_dictionnaire(statistique):
+    """
+    Convertir une statistique en dictionnaire JSON
+
+    :param statistique: Statistique
+    :return: Dictionnaire
+    """
+    return {'format': FORMAT,
+            'titre': statistique.titre,
+            'sortie': statistique.sortie,
+            'definition': statistique.definition,
+            'parametres': [parametre._asdict() for parametre in statistique.parametres],
+            'requete': {'sql': statistique.requete.sql, 'parametres': statistique.requete.parametres}}
+
+
+def de_dictionnaire(dictionnaire):
+    """
+    Créer une statistique à partir d'un dictionnaire JSON
+
+    :param dictionnaire: Dictionnaire créé par en_dictionnaire
+    :return: Statistique
+    :raise ValueError: Le format est plus récent que celui de cette version
+    """
+    if dictionnaire.get('format', FORMAT) > FORMAT:
+        raise ValueError("Format de statistique inconnu : {}".format(dictionnaire['format']))
+
+    return Statistique(dictionnaire['titre'],
+                       dictionnaire['sortie'],
+                       dictionnaire.get('definition'),
+                       [Parametre(**parametre) for parametre in dictionnaire['parametres']],
+                       planificateur.Requete(dictionnaire['requete']['sql'], dictionnaire['requete']['parametres']))
+
+
+def ecrire(statistique, chemin):
+    """
+    Enregistrer une statistique dans un fichier
+
+    :param statistique: Statistique
+    :param chemin: Chemin du fichier
+    """
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        json.dump(en_dictionnaire(statistique), fichier, ensure_ascii=False, indent=2)
+
+
+def lire_ancienne(chemin):
+    """
+    Lire une statistique enregistrée dans l'ancien format XML
+
+    :param chemin: Chemin du fichier .gxml
+    :return: Statistique
+    """
+    stat = ET.parse(chemin).getroot()
+
+    # Les statistiques enregistrées avant les requêtes avec paramètres n'en contiennent pas
+    element = stat.find('parametres')
+    valeurs = json.loads(element.text) if element is not None and element.text else []
+
+    parametres = list()
+    for i, valeur in enumerate(valeurs, 1):
+        if isinstance(valeur, bool):
+            type_parametre = TYPE_BOOLEEN
+        elif isinstance(valeur, int):
+            type_parametre = TYPE_ENTIER
+        elif isinstance(valeur, float):
+            type_parametre = TYPE_PRIX
+        else:
+            type_parametre = TYPE_TEXTE
+        parametres.append(Parametre("parametre_{}".format(i), "Paramètre {}".format(i), type_parametre, valeur))
+
+    titre = os.path.splitext(os.path.basename(chemin))[0]
+    return Statistique(titre, stat.find('output').text, None, parametres,
+                       planificateur.Requete(stat.find('sql').text, [parametre.nom for parametre in parametres]))
+
+
+def lire(chemin):
+    """
+    Lire une statistique enregistrée
+
+    :param chemin: Chemin du fichier .gstat ou .gxml
+    :return: Statistique
+    :raise ValueError: Le fichier n'est pas une statistique valide
+    """
+    try:
+        if chemin.endswith(EXTENSION_ANCIENNE):
+            return lire_ancienne(chemin)
+        with open(chemin, encoding='utf-8') as fichier:
+            return de_dictionnaire(json.load(fichier))
+    except (OSError, ET.ParseError, AttributeError, KeyError, TypeError, json.JSONDecodeError) as erreur:
+        raise ValueError("Statistique invalide : {} ({})".format(chemin, erreur))
+
+
+def requete(statistique, valeurs=None):
+    """
+    Obtenir la requête d'une statistique avec les valeurs de ses paramètres
+
+    :param statistique: Statistique
+    :param valeurs: Dictionnaire {Nom: Valeur}. La valeur enregistrée est utilisée pour les paramètres absents.
+    :return: planificateur.Requete dont les paramètres sont les valeurs
+    """
+    valeurs = dict(valeurs or dict())
+    for parametre in statistique.parametres:
+        valeurs.setdefault(parametre.nom, parametre.valeur)
+    return planificateur.Requete(statistique.requete.sql, [valeurs[nom] for nom in statistique.requete.parametres])
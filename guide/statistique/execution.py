@@ -0,0 +1,467 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Exécution des statistiques en arrière-plan
+
+Une statistique est exécutée par un Rapport dans le QThreadPool du module. Le pool n'a qu'un seul fil d'exécution qui
+n'expire jamais. Ce fil a sa propre connexion à la base de données (CONNEXION), ouverte en lecture seule, et conserve
+les requêtes qu'il a préparées. Les statistiques demandées pendant qu'une autre est en cours attendent leur tour.
+
+Les lignes sont lues une à la fois et écrites directement dans le fichier CSV. Le Rapport signale l'étape en cours, le
+nombre de lignes lues et le nombre d'octets écrits. L'annulation est vérifiée entre chaque bloc de lignes. Le fichier
+produit est ouvert par le fil principal lorsque le Rapport est terminé.
+
+Methodes :
+    pool : Obtenir le pool des statistiques
+    connexion : Obtenir la connexion du fil d'exécution des statistiques
+    executer : Exécuter la requête d'une statistique
+    versions : Obtenir la version des tables utilisées par une requête
+    dossier_cache : Obtenir le dossier du cache des résultats d'une base de données
+    texte_progression : Obtenir le texte affiché dans le dialog de progression
+    lancer : Exécuter une statistique en arrière-plan et afficher sa progression
+
+Classes
+    Annulation : Exception levée lorsque le rapport est annulé
+    Signaux : Signaux émis par un rapport
+    Rapport : Exécution d'une statistique et écriture de son fichier
+"""
+
+# Python import
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+
+# PyQt import
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QStandardPaths, QDate, Qt, pyqtSignal
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlError
+from PyQt5.QtWidgets import QProgressDialog
+
+# Project import
+from guide.script.database import database_error
+from guide.script.data import data_error
+from guide.script.rapport import document
+from guide.statistique import cache
+from guide.statistique import export_csv
+
+# Nom de la connexion du fil d'exécution des statistiques
+CONNEXION = "statistique"
+
+# Nombre de lignes lues entre chaque signal de progression
+LIGNES_PROGRESSION = 500
+
+# Étapes d'un rapport
+ETAPE_ATTENTE = "En attente"
+ETAPE_CACHE = "Lecture du cache"
+ETAPE_REQUETE = "Exécution de la requête"
+ETAPE_LECTURE = "Lecture des lignes"
+ETAPE_PDF = "Mise en page du PDF"
+
+# Nombre maximal de colonnes d'un PDF
+COLONNES_PDF = 4
+
+# Requêtes préparées {(Connexion, SQL): QSqlQuery}
+_REQUETES_PREPAREES = dict()
+
+# Pool des statistiques
+_POOL = None
+
+# Rapports en cours et leur dialog de progression
+# Les références sont conservées jusqu'à la fin du rapport
+_EN_COURS = set()
+
+
+class Annulation(Exception):
+    """Exception levée lorsque le rapport est annulé"""
+    pass
+
+
+def pool():
+    """
+    Obtenir le pool des statistiques
+
+    :return: QThreadPool avec un seul fil d'exécution qui n'expire jamais
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = QThreadPool()
+        _POOL.setMaxThreadCount(1)
+        _POOL.setExpiryTimeout(-1)
+    return _POOL
+
+
+def connexion(fichier):
+    """
+    Obtenir la connexion du fil d'exécution des statistiques
+
+    Doit être appelée dans le fil d'exécution des statistiques. La connexion est ouverte de nouveau lorsque le fichier
+    de la base de données change.
+
+    :param fichier: Chemin de la base de données
+    :return: QSqlDatabase ouverte ou dont lastError contient l'erreur
+    """
+    if QSqlDatabase.contains(CONNEXION):
+        database = QSqlDatabase.database(CONNEXION, False)
+        if database.isOpen() and database.databaseName() == fichier:
+            return database
+
+        # Les requêtes préparées avec l'ancienne base de données ne sont plus valides
+        for cle in [cle for cle in _REQUETES_PREPAREES if cle[0] == CONNEXION]:
+            del _REQUETES_PREPAREES[cle]
+        database.close()
+    else:
+        database = QSqlDatabase.addDatabase('QSQLITE', CONNEXION)
+
+    database.setDatabaseName(fichier)
+    database.setConnectOptions("QSQLITE_OPEN_READONLY;QSQLITE_BUSY_TIMEOUT=5000")
+    database.open()
+    return database
+
+
+def executer(database, requete):
+    """
+    Exécuter la requête d'une statistique
+
+    La requête est préparée une seule fois par connexion. Les exécutions suivantes lient seulement les valeurs des
+    paramètres. Les lignes sont lues une seule fois dans l'ordre.
+
+    :param database: Base de données
+    :param requete: planificateur.Requete
+    :return: QSqlQuery exécutée
+    """
+    cle = (database.connectionName(), requete.sql)
+    query = _REQUETES_PREPAREES.get(cle)
+    if query is None:
+        query = QSqlQuery(database)
+        query.setForwardOnly(True)
+        if not query.prepare(requete.sql):
+            return query  # L'erreur est affichée par l'appelant
+        _REQUETES_PREPAREES[cle] = query
+    else:
+        # Libérer les résultats de l'exécution précédente
+        query.finish()
+
+    for i, parametre in enumerate(requete.parametres):
+        query.bindValue(i, parametre)
+    query.exec_()
+    return query
+
+
+def versions(database, sql):
+    """
+    Obtenir la version des tables utilisées par une requête
+
+    :param database: Base de données
+    :param sql: SQL de la requête
+    :return: Dictionnaire {Table: Version} ou None si une table utilisée n'a pas de compteur de modifications
+    """
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+
+    # Une base de données qui n'a pas le module version_table n'utilise pas le cache
+    if not query.exec_("SELECT nom, version FROM version_table"):
+        return None
+
+    liste_version = dict()
+    while query.next():
+        liste_version[query.value(0)] = query.value(1)
+
+    # Le résultat d'une requête qui utilise une table sans compteur (ex. inscription_membre dans une statistique de
+    # l'ancien format) ne serait jamais invalidé
+    if not query.exec_("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"):
+        return None
+    liste_table = list()
+    while query.next():
+        liste_table.append(query.value(0))
+    if any(table not in liste_version for table in cache.tables(sql, liste_table)):
+        return None
+
+    return {table: liste_version[table] for table in cache.tables(sql, liste_version)}
+
+
+def dossier_cache(fichier):
+    """
+    Obtenir le dossier du cache des résultats d'une base de données
+
+    Chaque base de données a son propre dossier.
+
+    :param fichier: Chemin de la base de données
+    :return: Chemin du dossier
+    """
+    base = hashlib.sha1(os.path.abspath(fichier).encode('utf-8')).hexdigest()
+    return os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation),
+                        "PyGUIDE", "statistiques", base)
+
+
+class Signaux(QObject):
+    """
+    Signaux émis par un rapport
+
+    Le QObject appartient au fil principal. Les signaux émis par le fil des statistiques y sont donc reçus.
+    """
+    # Étape, nombre de lignes lues, nombre d'octets écrits
+    progression = pyqtSignal(str, int, int)
+    # Chemin du fichier produit
+    termine = pyqtSignal(str)
+    # QSqlError ou description de l'erreur
+    echec = pyqtSignal(object)
+    # Le PDF contient trop de colonnes
+    trop_champs = pyqtSignal()
+    # Le rapport a été annulé
+    annule = pyqtSignal()
+
+
+class Rapport(QRunnable):
+    """
+    Exécution d'une statistique et écriture de son fichier
+
+    Methodes :
+        annuler : Demander l'annulation du rapport
+        signaler : Signaler la progression du rapport
+        run : Exécuter le rapport dans le fil des statistiques
+        produire : Produire le fichier du rapport
+        suivre : Compter les lignes lues et vérifier l'annulation
+        ecrit : Conserver le nombre d'octets écrits dans le fichier CSV
+    """
+    def __init__(self, fichier_base, requete, sortie, titre, dictionnaire_colonne):
+        """
+        :param fichier_base: Chemin de la base de données
+        :param requete: planificateur.Requete
+        :param sortie: Type de fichier produit (csv ou pdf)
+        :param titre: Titre du PDF
+        :param dictionnaire_colonne: Fonction qui retourne le dictionnaire des colonnes d'une table
+        """
+        super(Rapport, self).__init__()
+        # Le rapport est conservé par _EN_COURS et non supprimé par le pool
+        self.setAutoDelete(False)
+
+        self.FICHIER_BASE = fichier_base
+        self.REQUETE = requete
+        self.SORTIE = sortie
+        self.TITRE = titre
+        self.DICTIONNAIRE_COLONNE = dictionnaire_colonne
+
+        self.SIGNAUX = Signaux()
+        self.ANNULATION = threading.Event()
+        self.ETAPE = ETAPE_ATTENTE
+        self.LIGNES = 0
+        self.OCTETS = 0
+
+    def annuler(self):
+        """
+        Demander l'annulation du rapport
+
+        Le rapport s'arrête au prochain bloc de lignes.
+        """
+        self.ANNULATION.set()
+
+    def signaler(self, etape=None):
+        """
+        Signaler la progression du rapport
+
+        :param etape: Nouvelle étape. L'étape ne change pas si elle est None.
+        :raise Annulation: L'annulation a été demandée
+        """
+        if self.ANNULATION.is_set():
+            raise Annulation()
+        if etape:
+            self.ETAPE = etape
+        self.SIGNAUX.progression.emit(self.ETAPE, self.LIGNES, self.OCTETS)
+
+    def run(self):
+        """
+        Exécuter le rapport dans le fil des statistiques
+
+        Chaque rapport émet exactement un signal de fin (termine, echec, trop_champs ou annule) pour que son dialog de
+        progression soit fermé. Une exception ne doit pas sortir de run : PyQt arrêterait l'application.
+        """
+        try:
+            fichier = self.produire()
+        except Annulation:
+            self.SIGNAUX.annule.emit()
+        except OSError as erreur:
+            self.SIGNAUX.echec.emit(str(erreur))
+        except Exception as erreur:
+            self.SIGNAUX.echec.emit(str(erreur) or type(erreur).__name__)
+        else:
+            if fichier:
+                self.SIGNAUX.termine.emit(fichier)
+
+    def produire(self):
+        """
+        Produire le fichier du rapport
+
+        :return: Chemin du fichier ou None si le rapport a échoué
+        :raise Annulation: L'annulation a été demandée
+        """
+        database = connexion(self.FICHIER_BASE)
+        if not database.isOpen():
+            self.SIGNAUX.echec.emit(QSqlError(database.lastError()))
+            return None
+
+        # Lire le résultat enregistré
+        self.signaler(ETAPE_CACHE)
+        dossier = dossier_cache(self.FICHIER_BASE)
+        liste_version = versions(database, self.REQUETE.sql)
+        resultat = None
+        if liste_version is not None:
+            resultat = cache.lire(dossier, self.REQUETE.sql, self.REQUETE.parametres, liste_version)
+
+        query = None
+        fichier_cache = None
+        try:
+            if resultat:
+                liste_colonne, fichier_cache = resultat
+                lignes = cache.lire_blocs(fichier_cache)
+            else:
+                self.signaler(ETAPE_REQUETE)
+                query = executer(database, self.REQUETE)
+
+                # S'il y a une erreur lors de l'exécution de la requête
+                if query.lastError().type() != QSqlError.NoError:
+                    self.SIGNAUX.echec.emit(QSqlError(query.lastError()))
+                    return None
+
+                liste_colonne = export_csv.colonnes(query.record())
+                lignes = export_csv.lignes(query, len(liste_colonne))
+
+                # Le résultat est enregistré seulement s'il est lu au complet
+                if liste_version is not None:
+                    lignes = cache.conserver(dossier, self.REQUETE.sql, self.REQUETE.parametres, liste_version,
+                                             liste_colonne, lignes)
+
+            if self.SORTIE == "pdf" and len(liste_colonne) > COLONNES_PDF:
+                self.SIGNAUX.trop_champs.emit()
+                return None
+
+            self.signaler(ETAPE_LECTURE)
+            liste_entete = export_csv.entetes(liste_colonne, self.DICTIONNAIRE_COLONNE)
+            fichier = os.path.join(tempfile.mkdtemp(), str(uuid.uuid4()) + "." + self.SORTIE)
+
+            if self.SORTIE == "csv":
+                export_csv.exporter(self.suivre(lignes), fichier, liste_entete, progression=self.ecrit)
+            else:
+                liste_ligne = list(self.suivre(lignes))
+                self.signaler(ETAPE_PDF)
+                sous_titre = "Générée le : {}".format(QDate.currentDate().toString('dd MMMM yyyy'))
+                document.Tableau(self.TITRE, liste_entete, liste_ligne, sous_titre).enregistrer(fichier)
+                self.OCTETS = os.path.getsize(fichier)
+                self.signaler()
+        finally:
+            # Une requête annulée garde sa transaction de lecture ouverte tant qu'elle n'est pas terminée
+            if query is not None:
+                query.finish()
+            # Le fichier du cache est lu à mesure que les lignes sont utilisées, il reste ouvert si elles ne le sont pas
+            if fichier_cache is not None:
+                fichier_cache.close()
+
+        return fichier
+
+    def suivre(self, lignes):
+        """
+        Compter les lignes lues et vérifier l'annulation
+
+        :param lignes: Itérable des lignes
+        :return: Générateur des lignes
+        :raise Annulation: L'annulation a été demandée
+        """
+        for ligne in lignes:
+            self.LIGNES = self.LIGNES + 1
+            if self.LIGNES % LIGNES_PROGRESSION == 0:
+                self.signaler()
+            yield ligne
+        self.signaler()
+
+    def ecrit(self, nombre_ligne, octets):
+        """
+        Conserver le nombre d'octets écrits dans le fichier CSV
+
+        :param nombre_ligne: Nombre de lignes écrites
+        :param octets: Nombre d'octets écrits
+        """
+        self.OCTETS = octets
+
+
+def texte_progression(etape, lignes, octets):
+    """
+    Obtenir le texte affiché dans le dialog de progression
+
+    :param etape: Étape du rapport
+    :param lignes: Nombre de lignes lues
+    :param octets: Nombre d'octets écrits
+    :return: Texte
+    """
+    return "{}\n{} lignes lues, {} Ko écrits".format(etape, lignes, octets // 1024)
+
+
+def lancer(database, requete, sortie, titre, dictionnaire_colonne, parent=None):
+    """
+    Exécuter une statistique en arrière-plan et afficher sa progression
+
+    Le dialog de progression n'est pas modal : les autres fenêtres restent utilisables pendant le rapport. Le fichier
+    produit est ouvert avec le programme par défaut lorsque le rapport est terminé.
+
+    :param database: Base de données de l'application. Seul le chemin du fichier est utilisé.
+    :param requete: planificateur.Requete
+    :param sortie: Type de fichier produit (csv ou pdf)
+    :param titre: Titre du rapport
+    :param dictionnaire_colonne: Fonction qui retourne le dictionnaire des colonnes d'une table
+    :param parent: Fenêtre du dialog de progression
+    :return: Rapport lancé
+    """
+    rapport = Rapport(database.databaseName(), requete, sortie, titre, dictionnaire_colonne)
+
+    dialog = QProgressDialog(texte_progression(ETAPE_ATTENTE, 0, 0), "Annuler", 0, 0, parent)
+    dialog.setWindowTitle(titre or "Statistique")
+    dialog.setWindowModality(Qt.NonModal)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+    dialog.setMinimumDuration(500)
+
+    element = (rapport, dialog, parent)
+    _EN_COURS.add(element)
+
+    def terminer():
+        dialog.close()
+        _EN_COURS.discard(element)
+
+    def ouvrir(fichier):
+        terminer()
+        os.startfile(os.path.normpath(fichier))
+
+    def echouer(erreur):
+        terminer()
+        if isinstance(erreur, QSqlError):
+            database_error.sql_error_handler(erreur)
+        else:
+            data_error.rapport_impossible(erreur)
+
+    def refuser():
+        terminer()
+        data_error.trop_champs()
+
+    # Slots
+    rapport.SIGNAUX.progression.connect(lambda etape, lignes, octets:
+                                        dialog.setLabelText(texte_progression(etape, lignes, octets)))
+    rapport.SIGNAUX.termine.connect(ouvrir)
+    rapport.SIGNAUX.echec.connect(echouer)
+    rapport.SIGNAUX.trop_champs.connect(refuser)
+    rapport.SIGNAUX.annule.connect(terminer)
+    dialog.canceled.connect(rapport.annuler)
+
+    pool().start(rapport)
+    return rapport
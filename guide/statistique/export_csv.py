@@ -0,0 +1,125 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Exportation du résultat d'une requête dans un fichier CSV
+
+Les lignes sont lues avec une requête forward-only et écrites par bloc avec le module csv. Seul le bloc en cours est
+conservé en mémoire, peu importe le nombre de lignes du résultat.
+
+Methodes :
+    colonnes : Obtenir la table et le nom de chaque colonne d'une requête
+    lignes : Lire les lignes d'une requête
+    entetes : Obtenir le nom affiché de chaque colonne d'une requête
+    exporter : Écrire le résultat d'une requête dans un fichier CSV
+"""
+
+# Python import
+import csv
+
+# Project import
+from guide.statistique import planificateur
+
+# Nombre de lignes écrites à la fois
+TAILLE_BLOC = 1000
+
+
+def colonnes(record):
+    """
+    Obtenir la table et le nom de chaque colonne d'une requête
+
+    :param record: QSqlRecord de la requête
+    :return: Liste des (Table, Nom)
+    """
+    return [(record.field(i).tableName(), record.field(i).name()) for i in range(record.count())]
+
+
+def lignes(query, nombre_colonne):
+    """
+    Lire les lignes d'une requête
+
+    La requête doit être forward-only et déjà exécutée. Une valeur nulle est remplacée par None.
+
+    :param query: QSqlQuery exécutée
+    :param nombre_colonne: Nombre de colonnes de la requête
+    :return: Générateur des lignes. Chaque ligne est une liste de valeurs.
+    """
+    index = range(nombre_colonne)
+    while query.next():
+        yield [None if query.isNull(i) else query.value(i) for i in index]
+
+
+def entetes(liste_colonne, dictionnaire_colonne):
+    """
+    Obtenir le nom affiché de chaque colonne d'une requête
+
+    Le nom de la colonne est utilisé lorsqu'elle n'est pas dans le dictionnaire des colonnes de sa table. Le nom d'un
+    champ calculé est suivi du nom de son calcul.
+
+    :param liste_colonne: Liste des (Table, Nom) de chaque colonne
+    :param dictionnaire_colonne: Fonction qui retourne le dictionnaire des colonnes d'une table
+    :return: Liste des noms
+    """
+    liste_entete = list()
+    for table, colonne in liste_colonne:
+        # Un champ calculé n'a pas de table, son nom est son alias
+        champ = planificateur.decomposer(colonne)
+        if champ is not None:
+            table, colonne = champ.table, champ.colonne
+
+        dict_colonne = dictionnaire_colonne(table) or dict()
+        nom = dict_colonne.get(colonne, {'nom': colonne})['nom']
+        if champ is not None:
+            nom = "{} ({})".format(nom, planificateur.CALCULS[champ.calcul]['nom'])
+        liste_entete.append(nom)
+    return liste_entete
+
+
+def exporter(liste_ligne, filename, liste_entete, taille_bloc=TAILLE_BLOC, progression=None):
+    """
+    Écrire le résultat d'une requête dans un fichier CSV
+
+    Une valeur None est écrite comme une cellule vide.
+
+    :param liste_ligne: Itérable des lignes (voir lignes)
+    :param filename: Chemin du fichier
+    :param liste_entete: Nom affiché de chaque colonne
+    :param taille_bloc: Nombre de lignes écrites à la fois
+    :param progression: Fonction appelée avec le nombre de lignes et d'octets écrits après chaque bloc
+    :return: Nombre de lignes écrites
+    """
+    nombre_ligne = 0
+
+    # utf-8-sig permet à MS Excel de détecter l'encodage
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as file:
+        writer = csv.writer(file)
+        writer.writerow(liste_entete)
+
+        bloc = list()
+        for ligne in liste_ligne:
+            bloc.append(ligne)
+            if len(bloc) >= taille_bloc:
+                writer.writerows(bloc)
+                nombre_ligne = nombre_ligne + len(bloc)
+                bloc = list()
+                if progression:
+                    progression(nombre_ligne, file.tell())
+
+        writer.writerows(bloc)
+        nombre_ligne = nombre_ligne + len(bloc)
+        if progression:
+            progression(nombre_ligne, file.tell())
+
+    return nombre_ligne
@@ -0,0 +1,387 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Planification des requêtes des statistiques
+
+Les tables et leurs références (DICT_TABLE et DICT_REFERENCE_TABLE de Statistiques) forment un graphe dont les arêtes
+sont les clés étrangères. Les tables nécessaires pour relier toutes les tables utilisées par une statistique sont
+l'arbre de Steiner minimal de ce graphe : le plus petit ensemble de tables connexe qui contient toutes les tables
+utilisées. Le graphe ne contient qu'une dizaine de tables, l'arbre est donc trouvé exactement en essayant les
+ensembles de tables intermédiaires du plus petit au plus grand.
+
+Le graphe contient un cycle (participante, facture, article, activite, inscription) : plusieurs ensembles de même
+taille peuvent relier les mêmes tables, mais ils ne retournent pas les mêmes lignes. Par exemple, à partir de
+participante, article peut être joint par facture (les articles achetés par la participante) ou par activite (les
+articles de toutes les participantes inscrites aux mêmes activités). L'ensemble choisi est celui où chaque table est
+la plus proche de la table principale, donc celui qui suit les clés étrangères à partir de la table principale. Si
+plusieurs ensembles restent possibles, la sélection est ambiguë et refusée : une des tables intermédiaires doit être
+ajoutée aux champs ou aux filtres.
+
+Chaque table est jointe à la table déjà jointe qui la référence ou qu'elle référence. Lorsque plusieurs tables déjà
+jointes sont reliées à une table, toutes les clés sont ajoutées à la clause ON pour éviter un produit cartésien.
+
+Les valeurs des filtres sont passées en paramètres (?). Lorsque les filtres ne contiennent aucun OU, le filtre d'une
+table jointe par INNER JOIN est placé dans la clause ON de sa jointure.
+
+Un champ peut avoir un calcul : une fonction d'agrégation (COUNT, SUM, AVG, MIN, MAX) ou le regroupement d'une date par
+mois, trimestre ou année. Lorsqu'un champ est agrégé, les autres champs forment le GROUP BY. La base de données
+retourne alors une ligne par groupe. Le nom de la colonne d'un champ calculé est son alias (voir alias).
+
+Ce module n'utilise pas PyQt.
+
+Methodes :
+    graphe : Construire le graphe des clés étrangères
+    condition : Obtenir la condition de jointure de deux tables voisines
+    profondeurs : Obtenir la distance de chaque table à la table principale
+    tables_reliees : Obtenir le plus petit ensemble de tables qui relie des tables
+    arbre : Obtenir l'ordre des jointures et les conditions de chaque jointure
+    types_jointure : Obtenir le type de jointure de chaque table
+    predicat : Obtenir le prédicat SQL d'un filtre et ses paramètres
+    alias : Obtenir le nom de la colonne d'un champ calculé
+    decomposer : Obtenir le champ d'un nom de colonne créé par alias
+    expression : Obtenir l'expression SQL d'un champ
+    planifier : Générer la requête d'une statistique
+
+Classes
+    Champ : Colonne affichée dans le résultat
+    Filtre : Filtre appliqué aux lignes
+    Requete : Requête SQL et valeurs de ses paramètres
+"""
+
+# Python import
+from collections import namedtuple, deque
+from itertools import combinations
+
+# Types de jointure
+INNER_JOIN = 'INNER JOIN'
+LEFT_JOIN = 'LEFT JOIN'
+
+# Colonne affichée dans le résultat
+# calcul est une clé de CALCULS ou None pour la valeur de la colonne
+Champ = namedtuple('Champ', ['table', 'colonne', 'calcul'])
+Champ.__new__.__defaults__ = (None,)
+
+# Filtre appliqué aux lignes
+# lien est l'opérateur logique (AND ou OR) qui relie le filtre au filtre suivant
+Filtre = namedtuple('Filtre', ['table', 'colonne', 'operateur', 'valeur', 'lien'])
+
+# Requête SQL et valeurs de ses paramètres dans l'ordre des ?
+Requete = namedtuple('Requete', ['sql', 'parametres'])
+
+# Opérateurs de comparaison
+OPERATEURS = ['=', '>', '<', '<=', '>=']
+
+# Opérateurs LIKE {Opérateur: Motif}
+# Les % sont ajoutés par SQLite pour que la valeur reste un paramètre
+OPERATEURS_LIKE = {'contient': "'%' || ? || '%'", 'commence': "? || '%'", 'termine': "'%' || ?"}
+
+# Calculs des champs {Calcul: {'nom': Nom affiché, 'sql': Expression, 'agregat': Fonction d'agrégation}}
+# Les dates sont enregistrées sous la forme yyyy-MM-dd
+CALCULS = {
+    'COUNT': {'nom': 'Nombre', 'sql': "count({})", 'agregat': True},
+    'SUM': {'nom': 'Somme', 'sql': "sum({})", 'agregat': True},
+    'AVG': {'nom': 'Moyenne', 'sql': "avg({})", 'agregat': True},
+    'MIN': {'nom': 'Minimum', 'sql': "min({})", 'agregat': True},
+    'MAX': {'nom': 'Maximum', 'sql': "max({})", 'agregat': True},
+    'MOIS': {'nom': 'Mois', 'sql': "strftime('%Y-%m', {})", 'agregat': False},
+    'TRIMESTRE': {'nom': 'Trimestre',
+                  'sql': "strftime('%Y', {0}) || '-T' || ((CAST(strftime('%m', {0}) AS INTEGER) + 2) / 3)",
+                  'agregat': False},
+    'ANNEE': {'nom': 'Année', 'sql': "strftime('%Y', {})", 'agregat': False}
+}
+
+# Séparateur des parties de l'alias d'un champ calculé
+SEPARATEUR_ALIAS = "__"
+
+
+def graphe(dict_reference):
+    """
+    Construire le graphe des clés étrangères
+
+    :param dict_reference: Dictionnaire {Table: {'to': [Tables référencées], 'from': [...], 'self': [...]}}
+    :return: Dictionnaire {Table: Ensemble des tables voisines}
+    """
+    voisins = {table: set() for table in dict_reference}
+    for table, references in dict_reference.items():
+        for reference in references['to']:
+            voisins[table].add(reference)
+            voisins[reference].add(table)
+    return voisins
+
+
+def condition(table, voisin, dict_table, dict_reference):
+    """
+    Obtenir la condition de jointure de deux tables voisines
+
+    La clé étrangère porte le nom de l'identifiant de la table référencée.
+
+    :param table: Table jointe
+    :param voisin: Table déjà jointe
+    :param dict_table: Dictionnaire {Table: {'id': Identifiant}}
+    :param dict_reference: Dictionnaire des références
+    :return: Condition SQL
+    """
+    if voisin in dict_reference[table]['to']:
+        identifiant = dict_table[voisin]['id']
+    else:
+        identifiant = dict_table[table]['id']
+    return "{0}.{2} = {1}.{2}".format(table, voisin, identifiant)
+
+
+def profondeurs(voisins, racine, tables):
+    """
+    Obtenir la distance de chaque table à la table principale
+
+    Seules les tables de l'ensemble sont parcourues.
+
+    :param voisins: Graphe des clés étrangères
+    :param racine: Table principale
+    :param tables: Ensemble des tables
+    :return: Dictionnaire {Table: Nombre de jointures depuis la table principale} des tables atteintes
+    """
+    distances = {racine: 0}
+    a_visiter = deque([racine])
+    while a_visiter:
+        parent = a_visiter.popleft()
+        for table in voisins[parent] & tables:
+            if table not in distances:
+                distances[table] = distances[parent] + 1
+                a_visiter.append(table)
+    return distances
+
+
+def tables_reliees(voisins, racine, tables):
+    """
+    Obtenir le plus petit ensemble de tables qui relie des tables
+
+    Parmi les ensembles de même taille, celui dont la somme des distances à la table principale est la plus petite est
+    choisi.
+
+    :param voisins: Graphe des clés étrangères
+    :param racine: Table principale
+    :param tables: Tables à relier, dont la table principale
+    :return: Ensemble des tables à joindre
+    :raise ValueError: Les tables ne peuvent pas être reliées ou plusieurs ensembles les relient différemment
+    """
+    tables = set(tables) | {racine}
+    autres = sorted(set(voisins) - tables)
+    for taille in range(len(autres) + 1):
+        candidats = list()
+        for intermediaires in combinations(autres, taille):
+            ensemble = tables | set(intermediaires)
+            distances = profondeurs(voisins, racine, ensemble)
+            if len(distances) == len(ensemble):
+                candidats.append((sum(distances.values()), intermediaires))
+        if not candidats:
+            continue
+
+        candidats.sort()
+        distance, intermediaires = candidats[0]
+        equivalents = [candidat[1] for candidat in candidats if candidat[0] == distance]
+        if len(equivalents) > 1:
+            raise ValueError("Les tables {} peuvent être reliées par {}. Ajoutez une de ces tables aux champs ou aux "
+                             "filtres.".format(", ".join(sorted(tables)),
+                                               " ou ".join(", ".join(choix) for choix in equivalents)))
+        return tables | set(intermediaires)
+    raise ValueError("Les tables {} ne peuvent pas être reliées".format(", ".join(sorted(tables))))
+
+
+def arbre(voisins, racine, tables):
+    """
+    Obtenir l'ordre des jointures et les conditions de chaque jointure
+
+    Les tables sont parcourues en largeur à partir de la table principale.
+
+    :param voisins: Graphe des clés étrangères
+    :param racine: Table principale (FROM)
+    :param tables: Ensemble connexe des tables à joindre
+    :return: (Liste des (Table, Tables déjà jointes reliées), Dictionnaire {Table: Tables qui lui sont jointes})
+    """
+    ordre = list()
+    enfants = {table: list() for table in tables}
+    jointes = {racine}
+    a_visiter = deque([racine])
+    while a_visiter:
+        parent = a_visiter.popleft()
+        for table in sorted(voisins[parent] & tables):
+            if table not in jointes:
+                ordre.append((table, sorted(voisins[table] & jointes)))
+                enfants[parent].append(table)
+                jointes.add(table)
+                a_visiter.append(table)
+    return ordre, enfants
+
+
+def types_jointure(racine, enfants, jointures):
+    """
+    Obtenir le type de jointure de chaque table
+
+    Une table est jointe par LEFT JOIN seulement si elle et toutes les tables qui lui sont jointes sont des LEFT JOIN.
+    Les tables intermédiaires prennent donc le type des tables qu'elles relient.
+
+    :param racine: Table principale
+    :param enfants: Dictionnaire {Table: Tables qui lui sont jointes}
+    :param jointures: Dictionnaire {Table: Type de jointure} choisi par l'utilisatrice
+    :return: Dictionnaire {Table: Type de jointure}
+    """
+    types = dict()
+
+    def visiter(table):
+        # Une table intermédiaire n'a pas de type choisi
+        gauche = jointures.get(table, LEFT_JOIN) == LEFT_JOIN
+        for enfant in enfants[table]:
+            gauche = visiter(enfant) == LEFT_JOIN and gauche
+        types[table] = LEFT_JOIN if gauche else INNER_JOIN
+        return types[table]
+
+    visiter(racine)
+    return types
+
+
+def predicat(filtre):
+    """
+    Obtenir le prédicat SQL d'un filtre et ses paramètres
+
+    :param filtre: Filtre
+    :return: (Prédicat, Liste des paramètres)
+    """
+    colonne = "{}.{}".format(filtre.table, filtre.colonne)
+    if filtre.operateur in OPERATEURS_LIKE:
+        return "({} LIKE {})".format(colonne, OPERATEURS_LIKE[filtre.operateur]), [filtre.valeur]
+    if filtre.operateur in OPERATEURS:
+        return "({} {} ?)".format(colonne, filtre.operateur), [filtre.valeur]
+    raise ValueError("Opérateur inconnu : {}".format(filtre.operateur))
+
+
+def alias(champ):
+    """
+    Obtenir le nom de la colonne d'un champ calculé
+
+    :param champ: Champ dont le calcul n'est pas None
+    :return: Alias sous la forme table__colonne__calcul
+    """
+    return SEPARATEUR_ALIAS.join([champ.table, champ.colonne, champ.calcul])
+
+
+def decomposer(nom):
+    """
+    Obtenir le champ d'un nom de colonne créé par alias
+
+    :param nom: Nom de la colonne du résultat
+    :return: Champ ou None si le nom n'est pas un alias
+    """
+    parties = nom.split(SEPARATEUR_ALIAS)
+    if len(parties) == 3 and parties[2] in CALCULS:
+        return Champ(*parties)
+    return None
+
+
+def expression(champ):
+    """
+    Obtenir l'expression SQL d'un champ
+
+    :param champ: Champ
+    :return: Expression SQL. Un champ calculé est suivi de son alias.
+    """
+    colonne = "{}.{}".format(champ.table, champ.colonne)
+    if champ.calcul is None:
+        return colonne
+    if champ.calcul not in CALCULS:
+        raise ValueError("Calcul inconnu : {}".format(champ.calcul))
+    return "{} AS {}".format(CALCULS[champ.calcul]['sql'].format(colonne), alias(champ))
+
+
+def planifier(racine, champs, filtres, ordre, jointures, dict_table, dict_reference):
+    """
+    Générer la requête d'une statistique
+
+    :param racine: Table principale (FROM)
+    :param champs: Liste des Champ
+    :param filtres: Liste des Filtre dans l'ordre. Le lien du dernier filtre est ignoré.
+    :param ordre: Champ du tri ou None. Lorsque les champs sont agrégés, le tri doit être un champ regroupé sinon les
+                  groupes sont triés dans l'ordre des champs.
+    :param jointures: Dictionnaire {Table: INNER_JOIN ou LEFT_JOIN} choisi par l'utilisatrice. Les tables absentes
+                      sont jointes par INNER JOIN.
+    :param dict_table: Dictionnaire des tables
+    :param dict_reference: Dictionnaire des références
+    :return: Requete
+    """
+    voisins = graphe(dict_reference)
+
+    # Tables à relier
+    utilisees = {racine} | {champ.table for champ in champs} | {filtre.table for filtre in filtres}
+    if ordre is not None:
+        utilisees.add(ordre.table)
+    for table in utilisees:
+        if table not in dict_table:
+            raise ValueError("Table inconnue : {}".format(table))
+
+    ordre_jointure, enfants = arbre(voisins, racine, tables_reliees(voisins, racine, utilisees))
+
+    # Une conjonction de filtres exclut les lignes sans valeur, la table filtrée est donc jointe par INNER JOIN
+    conjonction = all(filtre.lien != 'OR' for filtre in filtres[:-1])
+    choix = dict(jointures)
+    if conjonction:
+        for filtre in filtres:
+            choix[filtre.table] = INNER_JOIN
+    for table in utilisees:
+        choix.setdefault(table, INNER_JOIN)
+    types = types_jointure(racine, enfants, choix)
+
+    # Les filtres d'une conjonction sont placés dans la jointure de leur table
+    filtres_jointure = {table: list() for table in types}
+    filtres_where = list()
+    for filtre in filtres:
+        if conjonction and filtre.table != racine and types[filtre.table] == INNER_JOIN:
+            filtres_jointure[filtre.table].append(filtre)
+        else:
+            filtres_where.append(filtre)
+
+    parametres = list()
+    sql = "SELECT " + ", ".join(expression(champ) for champ in champs) + " "
+    sql = sql + "FROM " + racine + " "
+
+    for table, reliees in ordre_jointure:
+        conditions = [condition(table, voisin, dict_table, dict_reference) for voisin in reliees]
+        for filtre in filtres_jointure[table]:
+            texte, valeurs = predicat(filtre)
+            conditions.append(texte)
+            parametres.extend(valeurs)
+        sql = sql + types[table] + " " + table + " ON " + " AND ".join(conditions) + " "
+
+    if filtres_where:
+        sql = sql + "WHERE "
+        for i, filtre in enumerate(filtres_where):
+            texte, valeurs = predicat(filtre)
+            sql = sql + texte + " "
+            parametres.extend(valeurs)
+            if i < len(filtres_where) - 1:
+                sql = sql + ("OR " if filtre.lien == 'OR' else "AND ")
+
+    # Les champs qui ne sont pas agrégés forment les groupes, identifiés par leur position dans le SELECT
+    groupes = [i for i, champ in enumerate(champs, 1) if champ.calcul is None or not CALCULS[champ.calcul]['agregat']]
+    if len(groupes) < len(champs):
+        if groupes:
+            sql = sql + "GROUP BY " + ", ".join(str(i) for i in groupes) + " "
+
+        # Le tri doit être un champ regroupé, sinon les groupes sont triés dans l'ordre des champs
+        tri = [i for i in groupes if ordre is not None and champs[i - 1][:2] == ordre[:2]]
+        if groupes:
+            sql = sql + "ORDER BY " + ", ".join(str(i) for i in (tri[:1] or groupes))
+    elif ordre is not None:
+        sql = sql + "ORDER BY {}.{}".format(ordre.table, ordre.colonne)
+
+    return Requete(sql.strip(), parametres)
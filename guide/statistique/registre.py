@@ -0,0 +1,132 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Registre des statistiques enregistrées
+
+Le registre conserve la statistique lue de chaque fichier du dossier des statistiques avec la date de modification et
+la taille du fichier. Il est conservé en mémoire et dans le fichier index.json du dossier. Lors de la liste des
+statistiques, seuls les fichiers ajoutés ou modifiés depuis la dernière lecture sont lus.
+
+Ce module n'utilise pas PyQt.
+
+Methodes :
+    lister : Obtenir les statistiques du dossier
+    obtenir : Obtenir une statistique du dossier
+"""
+
+# Python import
+import json
+import os
+
+# Project import
+from guide.statistique import definition
+
+# Nom du fichier de l'index dans le dossier des statistiques
+FICHIER_INDEX = "index.json"
+
+# Index de chaque dossier {Dossier: {Fichier: (Date de modification, Taille, Statistique)}}
+_INDEX = dict()
+
+
+def lire_index(dossier):
+    """
+    Lire l'index enregistré d'un dossier
+
+    :param dossier: Dossier des statistiques
+    :return: Dictionnaire {Fichier: (Date de modification, Taille, Statistique)}
+    """
+    try:
+        with open(os.path.join(dossier, FICHIER_INDEX), encoding='utf-8') as fichier:
+            contenu = json.load(fichier)
+        return {nom: (entree['modification'], entree['taille'], definition.de_dictionnaire(entree['statistique']))
+                for nom, entree in contenu.items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        # Un index absent ou invalide est reconstruit
+        return dict()
+
+
+def ecrire_index(dossier, index):
+    """
+    Enregistrer l'index d'un dossier
+
+    :param dossier: Dossier des statistiques
+    :param index: Dictionnaire {Fichier: (Date de modification, Taille, Statistique)}
+    """
+    contenu = {nom: {'modification': modification, 'taille': taille,
+                     'statistique': definition.en_dictionnaire(statistique)}
+               for nom, (modification, taille, statistique) in index.items()}
+    try:
+        with open(os.path.join(dossier, FICHIER_INDEX), 'w', encoding='utf-8') as fichier:
+            json.dump(contenu, fichier, ensure_ascii=False)
+    except OSError:
+        pass  # L'index sera reconstruit à la prochaine ouverture
+
+
+def lister(dossier):
+    """
+    Obtenir les statistiques du dossier
+
+    Les fichiers invalides sont ignorés.
+
+    :param dossier: Dossier des statistiques
+    :return: Liste des (Fichier, Statistique) triée par titre
+    """
+    os.makedirs(dossier, exist_ok=True)
+    if dossier not in _INDEX:
+        _INDEX[dossier] = lire_index(dossier)
+    index = _INDEX[dossier]
+
+    modifie = False
+    presents = set()
+    with os.scandir(dossier) as fichiers:
+        for fichier in fichiers:
+            if not fichier.is_file() or \
+                    os.path.splitext(fichier.name)[1] not in (definition.EXTENSION, definition.EXTENSION_ANCIENNE):
+                continue
+            presents.add(fichier.name)
+
+            etat = fichier.stat()
+            entree = index.get(fichier.name)
+            if entree is not None and entree[0] == etat.st_mtime_ns and entree[1] == etat.st_size:
+                continue
+
+            # Lire seulement un fichier ajouté ou modifié
+            try:
+                index[fichier.name] = (etat.st_mtime_ns, etat.st_size, definition.lire(fichier.path))
+            except ValueError:
+                index.pop(fichier.name, None)
+            modifie = True
+
+    # Retirer les fichiers supprimés
+    for nom in set(index) - presents:
+        del index[nom]
+        modifie = True
+
+    if modifie:
+        ecrire_index(dossier, index)
+
+    return sorted(((nom, entree[2]) for nom, entree in index.items()), key=lambda element: element[1].titre.lower())
+
+
+def obtenir(dossier, fichier):
+    """
+    Obtenir une statistique du dossier
+
+    :param dossier: Dossier des statistiques
+    :param fichier: Nom du fichier
+    :return: Statistique ou None si le fichier n'est pas une statistique valide
+    """
+    return dict(lister(dossier)).get(fichier)
@@ -0,0 +1,127 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Totaux démographiques des groupes pour les rapports aux bailleurs de fonds
+
+Les totaux sont lus dans la table sommaire_groupe qui contient une ligne par mois, type d'activité et lieu. Cette table
+est maintenue par des triggers lorsqu'un groupe est enregistré. Le total d'une année lit donc au plus douze lignes par
+type d'activité et par lieu au lieu de tous les groupes.
+
+Methodes :
+    periode : Obtenir le premier et le dernier mois d'une année
+    totaux_annuels : Obtenir les totaux d'une année
+    totaux_par_categorie : Obtenir les totaux d'une année pour chaque type d'activité et chaque lieu
+
+Classes
+    Totaux : Nombre de groupes et nombre de personnes de chaque tranche d'âge
+"""
+
+# Python import
+from collections import namedtuple
+
+# PyQt import
+from PyQt5.QtSql import QSqlQuery
+
+# Project import
+from guide.script.database import database_error
+from guide.script.database.schema import COLONNES_GROUPE
+
+# Nombre de groupes et nombre de personnes de chaque tranche d'âge
+Totaux = namedtuple('Totaux', ['groupe'] + COLONNES_GROUPE)
+
+
+def periode(annee, mois_debut=1):
+    """
+    Obtenir le premier et le dernier mois d'une année
+
+    :param annee: Année du premier mois
+    :param mois_debut: Premier mois de l'année (4 pour une année financière commençant en avril)
+    :return: (Premier mois, Dernier mois) au format yyyy-MM
+    """
+    if mois_debut == 1:
+        return "{:04d}-01".format(annee), "{:04d}-12".format(annee)
+    return "{:04d}-{:02d}".format(annee, mois_debut), "{:04d}-{:02d}".format(annee + 1, mois_debut - 1)
+
+
+def totaux_annuels(database, annee, mois_debut=1, id_type_activite=None, id_lieu=None):
+    """
+    Obtenir les totaux d'une année
+
+    :param database: Base de données
+    :param annee: Année du premier mois
+    :param mois_debut: Premier mois de l'année
+    :param id_type_activite: Limiter les totaux à un type d'activité
+    :param id_lieu: Limiter les totaux à un lieu
+    :return: Totaux ou None si la requête échoue
+    """
+    sql = "SELECT sum(groupe), " + ", ".join("sum({})".format(colonne) for colonne in COLONNES_GROUPE) + " " \
+          "FROM sommaire_groupe " \
+          "WHERE mois BETWEEN :debut AND :fin "
+    if id_type_activite is not None:
+        sql = sql + "AND id_type_activite = :id_type_activite "
+    if id_lieu is not None:
+        sql = sql + "AND id_lieu = :id_lieu "
+
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare(sql)
+    debut, fin = periode(annee, mois_debut)
+    query.bindValue(':debut', debut)
+    query.bindValue(':fin', fin)
+    if id_type_activite is not None:
+        query.bindValue(':id_type_activite', id_type_activite)
+    if id_lieu is not None:
+        query.bindValue(':id_lieu', id_lieu)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    query.first()
+    return Totaux(*(int(query.value(i) or 0) for i in range(len(Totaux._fields))))
+
+
+def totaux_par_categorie(database, annee, mois_debut=1):
+    """
+    Obtenir les totaux d'une année pour chaque type d'activité et chaque lieu
+
+    :param database: Base de données
+    :param annee: Année du premier mois
+    :param mois_debut: Premier mois de l'année
+    :return: Dictionnaire {(Type d'activité, Lieu): Totaux} ou None si la requête échoue
+    """
+    query = QSqlQuery(database)
+    query.setForwardOnly(True)
+    query.prepare("SELECT id_type_activite, id_lieu, sum(groupe), " +
+                  ", ".join("sum({})".format(colonne) for colonne in COLONNES_GROUPE) + " "
+                  "FROM sommaire_groupe "
+                  "WHERE mois BETWEEN :debut AND :fin "
+                  "GROUP BY id_type_activite, id_lieu")
+    debut, fin = periode(annee, mois_debut)
+    query.bindValue(':debut', debut)
+    query.bindValue(':fin', fin)
+    query.exec_()
+
+    # Affichage d'un message d'erreur si la requete echoue
+    if database_error.sql_error_handler(query.lastError()):
+        return None
+
+    resultat = dict()
+    while query.next():
+        resultat[(int(query.value(0)), int(query.value(1)))] = \
+            Totaux(*(int(query.value(i + 2)) for i in range(len(Totaux._fields))))
+    return resultat
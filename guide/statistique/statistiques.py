@@ -17,40 +17,143 @@
 Module permettant de créer des statistiques. 
 
 Le module n'est pas responsable de l'affichage ni du traitement vers la base de donnée. Il sert seulement à créer
-des fichiers XML contenant les requetes à effectuer pour obtenir les statistiques. 
+des fichiers de statistiques contenant la définition et la requête compilée (voir le module definition). 
 
 L'objectif est de fournir à l'utilisateur une interface simple et conviviale pour effectuer des requêtes SQLite
 sans que l'utilisateur n'ai à écrire de code. 
 
+Methodes :
+    creer_widget : Créer le widget qui permet d'entrer la valeur d'un paramètre
+    valeur_widget : Obtenir la valeur d'un paramètre dans un format valide pour la base de donnée
+
 Classes
     Statistiques : Dialog par lequel l'utilisateur peut créer des ficher de statistiques.
+    ParametresStatistique : Dialog pour modifier les paramètres d'une statistique enregistrée
 """
 
 # Python import
 import os
-import tempfile
-import uuid
-import xml.etree.cElementTree as ET
 
 # PyQt import
-from PyQt5.QtWidgets import QComboBox, QTableWidgetItem, QLineEdit, QSpinBox, QDateEdit, QTimeEdit, QDateTimeEdit, QCheckBox, QDoubleSpinBox, QWidget, QAbstractSpinBox, QCompleter, QWidget, QDialog
-from PyQt5.QtCore import QSignalMapper, Qt, QDate, QTime, QStringListModel, QSettings
+from PyQt5.QtWidgets import QComboBox, QTableWidgetItem, QLineEdit, QSpinBox, QDateEdit, QTimeEdit, QDateTimeEdit, QCheckBox, QDoubleSpinBox, QWidget, QAbstractSpinBox, QCompleter, QWidget, QDialog, QFormLayout, QDialogButtonBox
+from PyQt5.QtCore import QSignalMapper, Qt, QDate, QTime, QDateTime, QStringListModel, QSettings
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery
 from PyQt5.QtGui import QPalette, QColor
 
-# PyLaTeX import
-from pylatex import Document, Command, PageStyle, MiniPage, LineBreak, MediumText, LargeText, Head, LongTabu
-from pylatex.utils import bold
-
 # Project import
 from guide.script.database import database_error
 from guide.facturation import facturation
 from guide.script.interface import validator
 from guide.script.data import data_error
+from guide.statistique import planificateur
+from guide.statistique import definition
+from guide.statistique import execution
 
 # Interface import
 from guide.interface.ui_statistique import Ui_Statistique
 
+# Type du paramètre de chaque type de colonne dans l'ordre des Statistiques.TYPE_*
+TYPE_PARAMETRE = [definition.TYPE_TEXTE, definition.TYPE_ENTIER, definition.TYPE_DATE, definition.TYPE_HEURE,
+                  definition.TYPE_BOOLEEN, definition.TYPE_DATE_HEURE, definition.TYPE_PRIX, definition.TYPE_STATUS]
+
+# Status d'inscription affichés (Texte, Valeur)
+LISTE_STATUS = [('Active', facturation.STATUS_INSCRIPTION),
+                ('Facturée', facturation.STATUS_FACTURE),
+                ('Annulée', facturation.STATUS_INSCRIPTION_ANNULEE),
+                ('Remboursée', facturation.STATUS_REMBOURSE)]
+
+def creer_widget(type_parametre, valeur=None):
+    """
+    Créer le widget qui permet d'entrer la valeur d'un paramètre
+
+    Argument :
+        type_parametre : Type du paramètre (definition.TYPE_*)
+        valeur : Valeur affichée. La valeur par défaut du widget est utilisée si elle est None.
+
+    Return :
+        Widget
+    """
+    if type_parametre == definition.TYPE_TEXTE:
+        widget = QLineEdit()
+        widget.setFrame(False)
+        if valeur is not None:
+            widget.setText(str(valeur))
+    elif type_parametre == definition.TYPE_ENTIER:
+        widget = QSpinBox()
+        widget.setFrame(False)
+        widget.setMaximum(10000)
+        widget.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        if valeur is not None:
+            widget.setValue(int(valeur))
+    elif type_parametre == definition.TYPE_DATE:
+        widget = QDateEdit()
+        widget.setFrame(False)
+        widget.setCalendarPopup(True)
+        if valeur is not None:
+            widget.setDate(QDate.fromString(valeur, 'yyyy-MM-dd'))
+        else:
+            widget.setDate(QDate.currentDate())
+    elif type_parametre == definition.TYPE_HEURE:
+        widget = QTimeEdit()
+        widget.setFrame(False)
+        widget.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        if valeur is not None:
+            widget.setTime(QTime.fromString(valeur, 'HH:mm'))
+    elif type_parametre == definition.TYPE_BOOLEEN:
+        widget = QCheckBox()
+        if valeur is not None:
+            widget.setChecked(bool(valeur))
+    elif type_parametre == definition.TYPE_DATE_HEURE:
+        widget = QDateTimeEdit()
+        widget.setFrame(False)
+        widget.setCalendarPopup(True)
+        if valeur is not None:
+            widget.setDateTime(QDateTime.fromString(valeur, 'yyyy-MM-dd hh:mm:ss'))
+        else:
+            widget.setDate(QDate.currentDate())
+    elif type_parametre == definition.TYPE_PRIX:
+        widget = QDoubleSpinBox()
+        widget.setFrame(False)
+        widget.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        if valeur is not None:
+            widget.setValue(float(valeur))
+    else: # TYPE_STATUS
+        widget = QComboBox()
+        for texte, status in LISTE_STATUS:
+            widget.addItem(texte, status)
+        if valeur is not None:
+            widget.setCurrentIndex(max(widget.findData(valeur), 0))
+    return widget
+
+
+def valeur_widget(widget, type_parametre):
+    """
+    Obtenir la valeur d'un paramètre dans un format valide pour la base de donnée
+
+    Argument :
+        widget : Widget créé par creer_widget
+        type_parametre : Type du paramètre (definition.TYPE_*)
+
+    Return :
+        Valeur du paramètre
+    """
+    if type_parametre == definition.TYPE_TEXTE:
+        return widget.text()
+    elif type_parametre == definition.TYPE_ENTIER:
+        return widget.value()
+    elif type_parametre == definition.TYPE_DATE:
+        return widget.date().toString('yyyy-MM-dd')
+    elif type_parametre == definition.TYPE_HEURE:
+        return widget.time().toString('HH:mm')
+    elif type_parametre == definition.TYPE_BOOLEEN:
+        return int(widget.isChecked())
+    elif type_parametre == definition.TYPE_DATE_HEURE:
+        return widget.dateTime().toString('yyyy-MM-dd hh:mm:ss')
+    elif type_parametre == definition.TYPE_PRIX:
+        return widget.value()
+    else: # TYPE_STATUS
+        return widget.currentData()
+
 
 class Statistiques(QDialog):
     """
@@ -67,7 +170,7 @@ class Statistiques(QDialog):
         ajouter_ligne_champs : Ajoute une ligne à la table des champs
         creer_combo_box : Ajoute un ComboBox dans le tablea avec un mapping vers le numéro de ligne 
         remplire_combobox : Ajoute la liste d'un dictionnaire à un combobox
-        colonne_champs_selectionnee : Affiche la ligne suivante dans la table des champs
+        colonne_champs_selectionnee : Afficher les calculs disponibles selon le type de la colonne
         table_champs_selectionnee : Afficher les informations relative à la table sélectionnée
                                     dans les combobox colonne et contraintes
         set_style : Ajout du style aux lignes du tableau
@@ -534,12 +637,15 @@ class Statistiques(QDialog):
         self.remplire_combobox(self.tbl_champs.cellWidget(r, 0), self.generer_liste_table_champ(r))
 
         # Combobox colonne vide
-        cbx_colonne = QComboBox()
-        self.tbl_champs.setCellWidget(r, 1, cbx_colonne)
+        self.creer_combo_box(self.tbl_champs, r, 1, self.colonne_champs_selectionnee)
+
+        # ComboBox calcul vide
+        cbx_calcul = QComboBox()
+        self.tbl_champs.setCellWidget(r, 2, cbx_calcul)
 
         # ComboBox contrainte vide
         cbx_contrainte = QComboBox()
-        self.tbl_champs.setCellWidget(r, 2, cbx_contrainte)
+        self.tbl_champs.setCellWidget(r, 3, cbx_contrainte)
 
         # Ajouter le style à la ligne
         self.set_row_style(self.tbl_champs, r)
@@ -548,35 +654,15 @@ class Statistiques(QDialog):
         """
         Générer le dictionnaire des tables à afficher dans les ComboBox du tableau des champs.
 
-        Seule les tables qui ont un foreign key sur la table de la ligne précédente sont affichée pour éviter
-        de créer des requêtes qui sont impossibles. 
+        Toutes les tables sont affichées sur chaque ligne. Les tables intermédiaires nécessaires pour relier les tables
+        sélectionnées sont ajoutées par le planificateur lors de la génération de la requête.
 
         Arguments : 
             row : Ligne sur laquelle le ComboBox est ajouté
         Return : 
             Dictionnaire des tables
         """
-        # Afficher toute les tables pour la première colonne
-        if row == 0:
-            return self.DICT_TABLE
-        # Afficher seulement les tables ayant une foreign key pour les colonnes suivantes
-        else:
-            # Obtenir la table de la rangee precendante
-            last_table = self.tbl_champs.cellWidget(row-1, 0).currentData()
-
-            # Créer la liste des tables ayant une référence vers ou de cette table
-            reference_dict = self.DICT_REFERENCE_TABLE[last_table]
-            reference_to = reference_dict['to']
-            reference_from = reference_dict['from']
-            reference_self = reference_dict['self']
-            reference_list = reference_to + reference_from + reference_self
-            
-            # Construire le dictionnaire à retourner
-            dict = {}
-            for reference in sorted(reference_list):
-                dict[reference] = {'nom' : self.DICT_TABLE[reference]['nom']}
-
-            return dict
+        return self.DICT_TABLE
 
     def table_champs_selectionnee(self, row):
         """
@@ -590,6 +676,7 @@ class Statistiques(QDialog):
             # Effacer le contenu existant
             self.tbl_champs.cellWidget(row, 1).clear()
             self.tbl_champs.cellWidget(row, 2).clear()
+            self.tbl_champs.cellWidget(row, 3).clear()
 
             # Déterminer le nom de la 
 
@@ -615,6 +702,39 @@ class Statistiques(QDialog):
             # Activer la table de tri
             self.activer_table_tri()
 
+    def colonne_champs_selectionnee(self, row):
+        """
+        Afficher les calculs disponibles selon le type de la colonne
+
+        Un calcul vide affiche la valeur de la colonne. Lorsqu'un champ est agrégé, les champs sans agrégation forment
+        les groupes du résultat.
+
+        Arguments :
+            row : Ligne du table qui a été activée
+        """
+        cbx_calcul = self.tbl_champs.cellWidget(row, 2)
+        cbx_calcul.clear()
+
+        table = self.tbl_champs.cellWidget(row, 0).currentData()
+        colonne = self.tbl_champs.cellWidget(row, 1).currentData()
+        if not table or not colonne:
+            return
+
+        # Afficher les calculs selon le type de colonne
+        column_type = self.dictionnaire_colonne(table)[colonne]['type']
+        if column_type in (self.TYPE_INTEGER, self.TYPE_PRIX):
+            liste_calcul = ['COUNT', 'SUM', 'AVG', 'MIN', 'MAX']
+        elif column_type in (self.TYPE_DATE, self.TYPE_DATETIME):
+            liste_calcul = ['COUNT', 'MIN', 'MAX', 'MOIS', 'TRIMESTRE', 'ANNEE']
+        elif column_type in (self.TYPE_STRING, self.TYPE_TIME):
+            liste_calcul = ['COUNT', 'MIN', 'MAX']
+        else:
+            liste_calcul = ['COUNT']
+
+        cbx_calcul.addItem("")
+        for calcul in liste_calcul:
+            cbx_calcul.addItem(planificateur.CALCULS[calcul]['nom'], calcul)
+
     def make_read_only(self, row):
         """
         Disable le combobox de la ligne precedente
@@ -643,10 +763,10 @@ class Statistiques(QDialog):
         # Ajouter les éléments au ComboBox
         if last_table == current_table:
             for key, value in sorted(self.DICT_CONTRAINTE_MEME_TABLE.items()):
-                self.tbl_champs.cellWidget(r, 2).addItem(value['nom'], key)
+                self.tbl_champs.cellWidget(r, 3).addItem(value['nom'], key)
         else:
             for key, value in sorted(self.DICT_CONTRAINTE_AUTRE_TABLE.items()):
-                self.tbl_champs.cellWidget(r, 2).addItem(value['nom'], key)
+                self.tbl_champs.cellWidget(r, 3).addItem(value['nom'], key)
 
     def activer_table_tri(self):
         """
@@ -747,41 +867,11 @@ class Statistiques(QDialog):
             self.tbl_tri.cellWidget(row, 2).addItem(self.DICT_OPERATEUR['>=']['nom'], '>=')
 
         # Afficher le widget pour la valeur selon le type de valeur
+        widget = creer_widget(TYPE_PARAMETRE[column_type])
         if column_type == self.TYPE_STRING:
-            # Créer un nouveau LineEdit
-            widget = QLineEdit()
-            widget.setFrame(False)
             completer = QCompleter()
             completer.setModel(QStringListModel(self.get_field_list(row)))
             widget.setCompleter(completer)
-        elif column_type == self.TYPE_INTEGER:
-            widget = QSpinBox()
-            widget.setFrame(False)
-            widget.setMaximum(10000)
-            widget.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        elif column_type == self.TYPE_DATE:
-            widget = QDateEdit()
-            widget.setFrame(False)
-            widget.setCalendarPopup(True)
-            widget.setDate(QDate.currentDate())
-        elif column_type == self.TYPE_TIME:
-            widget = QTimeEdit()
-            widget.setFrame(False)
-            widget.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        elif column_type == self.TYPE_BOOLEAN:
-            widget = QCheckBox()
-        elif column_type == self.TYPE_DATETIME:
-            widget = QDateTimeEdit()
-            widget.setFrame(False)
-            widget.setCalendarPopup(True)
-            widget.setDate(QDate.currentDate())
-        elif column_type == self.TYPE_PRIX:
-            widget = QDoubleSpinBox()
-            widget.setFrame(False)
-            widget.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        else: # TYPE_STATUS_INSCRIPTION
-            widget = QComboBox()
-            widget.addItems(['Active', 'Facturée', 'Annulée', 'Remboursée'])
 
         self.tbl_tri.setCellWidget(row, 3, widget)
 
@@ -848,171 +938,73 @@ class Statistiques(QDialog):
         for key, value in sorted(dict_colonne.items()):
             self.cbx_colonne.addItem(value['nom'], key)
 
-    def afficher_csv(self, sql=None):
+    def afficher_csv(self, requete=None, titre=None, parent=None):
         """
-        Effectuer la requete et afficher les résultats dans MS Excel
+        Effectuer la requete en arrière-plan et afficher les résultats dans MS Excel
 
         Argument : 
-            sql : Requête à effectuer
+            requete : planificateur.Requete à effectuer
+            titre : Titre du dialog de progression. Le titre entré dans le dialog est utilisé par défaut.
+            parent : Fenêtre du dialog de progression. Le dialog des statistiques est utilisé par défaut.
         """
-        if not sql:
-            sql = self.generer_requete()
+        if not requete:
+            requete = self.generer_requete()
+        if not titre:
+            titre = self.txt_titre.text()
 
         # Vérifier si la requête est vide
-        if sql:
-            query = QSqlQuery()
-            query.exec_(sql)
-
-            # S'il y a une erreur lors de l'exécution de la requête
-            if not database_error.sql_error_handler(query.lastError()):
-                temp_dir = tempfile.mkdtemp()
-                file = str(uuid.uuid4()) + ".csv"
-                filename = os.path.join(temp_dir, file)
-        
-                column_count = query.record().count()
-                with open(filename, 'w') as file:
-                    # Ajouter les headers
-                    line = ""
-                    for i in range(column_count):
-                        table = query.record().field(i).tableName() 
-                        colonne = query.record().field(i).name()
-                        dict_colonne = self.dictionnaire_colonne(table)
-                        line = line + dict_colonne[colonne]['nom'] + ","
-                    line[:-1]
-                    file.write(line)
-                    file.write('\n')
-
-                    # Ajouter les lignes
-                    while query.next():
-                        line = ""
-                        for i in range(column_count):
-                            line = line + query.value(i) + ","
-                        line[:-1]
-                        file.write(line)
-                        file.write('\n')
-
-                os.startfile(os.path.normpath(filename))
-        else:
+        if requete:
+            execution.lancer(self.DATABASE, requete, "csv", titre, self.dictionnaire_colonne, parent or self)
+        elif requete is None:
             data_error.requete_vide()
 
-    def afficher_pdf(self, sql=None):
+    def afficher_pdf(self, requete=None, titre=None, parent=None):
         """
-        Effectuer la requete et afficher les résultats dans un fichier PDF
+        Effectuer la requete en arrière-plan et afficher les résultats dans un fichier PDF
 
         Argument : 
-            requete : Requête à effectuer
+            requete : planificateur.Requete à effectuer
+            titre : Titre du document. Le titre entré dans le dialog est utilisé par défaut.
+            parent : Fenêtre du dialog de progression. Le dialog des statistiques est utilisé par défaut.
         """
-        if not sql:
-            sql = self.generer_requete()
+        if not requete:
+            requete = self.generer_requete()
+        if not titre:
+            titre = self.txt_titre.text()
 
         # Vérifier si la requête est vide
-        if sql:
-            query = QSqlQuery()
-            query.exec_(sql)
-
-            # S'il y a une erreur lors de l'exécution de la requête
-            if not database_error.sql_error_handler(query.lastError()):
-                # Générer le fichier PDF
-                geometry_options = {"margin": "1in"}
-                doc = Document(page_numbers=True, geometry_options=geometry_options)
-
-                # Document header
-                header = PageStyle("header")
-                # Left header
-                with header.create(Head("L")):
-                    header.append(self.txt_titre.text())
-                # Right header
-                with header.create(Head("R")):
-                    header.append("Centre femmes du Haut-Richelieu")
-
-                doc.preamble.append(header)
-                doc.change_document_style("header")
-
-                # Titre du document
-                with doc.create(MiniPage(align='c')):
-                    doc.append(LargeText(bold(self.txt_titre.text())))
-                    doc.append(LineBreak())
-                    doc.append(MediumText("Générée le : {}".format(QDate.currentDate().toString('dd MMMM yyyy'))))
-
-                column_count = query.record().count()
-
-                # Continuer seulement si le nombre de colonne est de moins de 4
-                if column_count > 4:
-                    data_error.trop_champs()
-                else:
-                    # Generer le tableau
-                    with doc.create(LongTabu("X[l]"*column_count)) as data_table:
-                        # Création de l'entête
-                        header_row1 = []
-                        for i in range(column_count):
-                            table = query.record().field(i).tableName() 
-                            colonne = query.record().field(i).name()
-                            dict_colonne = self.dictionnaire_colonne(table)
-                            header_row1.append(dict_colonne[colonne]['nom'])
-
-                        data_table.add_row(header_row1, mapper=[bold])
-                        data_table.add_hline()
-                        data_table.end_table_header()
-                        data_table.add_empty_row()
-            
-                        # Ajouter les données
-                        while query.next():
-                            row = []
-                            for i in range(column_count):
-                                row.append(query.value(i))
-                            data_table.add_row(row)
-                            data_table.add_empty_row()
-
-                        data_table.add_hline()
-
-                    temp_dir = tempfile.mkdtemp()
-                    file = str(uuid.uuid4())
-                    filename = os.path.join(temp_dir, file)
-
-                    doc.generate_pdf(filename, compiler="pdflatex")
-
-                    file_ext = file + ".pdf"
-                    filename_ext = os.path.join(temp_dir, file_ext)
-                    os.startfile(os.path.normpath(filename_ext))
-        else:
+        if requete:
+            execution.lancer(self.DATABASE, requete, "pdf", titre, self.dictionnaire_colonne, parent or self)
+        elif requete is None:
             data_error.requete_vide()
 
-    def generer_requete(self):
-        """
-        Générer la requête SQLite à effectuer
+    def generer_statistique(self):
         """
+        Générer la statistique définie dans le dialog
+
+        La valeur de chaque filtre devient un paramètre nommé. La requête est compilée avec le nom des paramètres.
 
+        Return :
+            definition.Statistique, None si aucune table n'est sélectionnée ou False si les tables ne peuvent pas
+            être reliées (un message est affiché)
+        """
         if self.tbl_champs.cellWidget(0, 0).currentData():
-            # Début de la requête
-            sql = "SELECT "
+            # Table principale de la requête
+            table_principale = self.tbl_champs.cellWidget(0, 0).currentData()
 
-            # Ajouter les champs à la requête
+            # Champs affichés
+            champs = []
             for row in range(self.tbl_champs.rowCount()):
                 table = self.tbl_champs.cellWidget(row, 0).currentData()
                 colonne = self.tbl_champs.cellWidget(row, 1).currentData()
+                calcul = self.tbl_champs.cellWidget(row, 2).currentData()
 
                 if table and colonne:
-                    sql = sql + table + "." + colonne + ", "
-
-            # Enlever la dernière virgule ajoutée
-            sql = sql[:-2] + " "
+                    champs.append(planificateur.Champ(table, colonne, calcul))
 
-            # Déterminer la table principale de la requête
-            table_principale = self.tbl_champs.cellWidget(0, 0).currentData()
-            sql = sql + "FROM " + table_principale + " "
-
-            # Déterminer les tables secondaires
-            dict_table_secondaire = self.liste_table_secondaire()
-
-            # Ajouter les tables secondaires à la requête
-            for key, value in dict_table_secondaire.items():
-                sql = sql + value['contrainte'] + " " + key[0] + " ON " + key[1] + "." + value['id'] + " = " + key[0] + "." + value['id'] + " "
-
-            # Vérifier s'il y a des options de tri
-            if self.tbl_tri.cellWidget(0, 0).currentData():
-                sql = sql + "WHERE "
-
-            # Ajouter les options de tri
+            # Options de tri
+            filtres = []
+            parametres = []
             for row in range(self.tbl_tri.rowCount()):
                 table = self.tbl_tri.cellWidget(row, 0).currentData()
                 colonne = self.tbl_tri.cellWidget(row, 1).currentData()
@@ -1020,27 +1012,69 @@ class Statistiques(QDialog):
                 contrainte = self.tbl_tri.cellWidget(row, 4).currentData()
 
                 if table and contrainte:
-                    valeur = self.get_constraint_value(row)
-                    sql = sql + "(" + table + "." + colonne + " "
-                    if operateur == 'contient':
-                        sql = sql + "LIKE " + "'%" + valeur[-1:-1] + "%' " + contrainte + " " 
-                    elif operateur == 'commence':
-                        sql = sql + "LIKE " + "'" + valeur[-1:-1] + "%' " + contrainte + " " 
-                    elif operateur == 'termine':
-                        sql = sql + "LIKE " + "'%" + valeur[-1:-1] + "' " + contrainte + " " 
-                    else:
-                        sql = sql + operateur + " " + valeur + " " + contrainte + " "
-                    sql = sql[:-4] + ") "
-
-            # Ajouter l'ordre
-            sql = sql + "ORDER BY " + self.cbx_table.currentData() + "." + self.cbx_colonne.currentData()
-            print(sql)
-            return sql
+                    parametre = self.generer_parametre(row, len(parametres) + 1)
+                    parametres.append(parametre)
+                    filtres.append(planificateur.Filtre(table, colonne, operateur, parametre.nom, contrainte))
+
+            # Ordre
+            ordre = None
+            if self.cbx_table.currentData() and self.cbx_colonne.currentData():
+                ordre = planificateur.Champ(self.cbx_table.currentData(), self.cbx_colonne.currentData())
+
+            # Obtenir le type de fichier de sortie
+            if self.rbt_excel.isChecked():
+                sortie = "csv"
+            else:
+                sortie = "pdf"
+
+            try:
+                return definition.compiler(self.txt_titre.text(), sortie, table_principale, champs, filtres, ordre,
+                                           self.liste_jointure(), parametres, self.DICT_TABLE,
+                                           self.DICT_REFERENCE_TABLE)
+            except ValueError as erreur:
+                # Les tables ne peuvent pas être reliées ou peuvent l'être de plusieurs façons
+                data_error.jointure_impossible(str(erreur))
+                return False
+
+    def generer_requete(self):
+        """
+        Générer la requête SQLite à effectuer
+
+        Return :
+            planificateur.Requete, None si aucune table n'est sélectionnée ou False si les tables ne peuvent pas
+            être reliées
+        """
+        statistique = self.generer_statistique()
+        if statistique:
+            return definition.requete(statistique)
+        return statistique
+
+    def generer_parametre(self, row, numero):
+        """
+        Générer le paramètre nommé d'un filtre
+
+        Argument :
+            row : Ligne du filtre
+            numero : Numéro du paramètre. Il rend le nom unique lorsque la même colonne est filtrée deux fois.
+
+        Return :
+            definition.Parametre dont la valeur est celle entrée dans la ligne
+        """
+        table = self.tbl_tri.cellWidget(row, 0).currentData()
+        colonne = self.tbl_tri.cellWidget(row, 1).currentData()
+        column_type = self.dictionnaire_colonne(table)[colonne]['type']
+
+        libelle = "{} : {} ({})".format(self.DICT_TABLE[table]['nom'], self.tbl_tri.cellWidget(row, 1).currentText(),
+                                        self.tbl_tri.cellWidget(row, 2).currentText())
+        return definition.Parametre("{}_{}_{}".format(table, colonne, numero), libelle, TYPE_PARAMETRE[column_type],
+                                    self.get_constraint_value(row))
 
     def get_constraint_value(self, row):
         """
         Retourne la valeur de la contrainte dans un format valide pour la base de donnée
 
+        La valeur est passée en paramètre à la requête.
+
         Argument :
             row : Ligne de la contrainte
         """
@@ -1049,59 +1083,28 @@ class Statistiques(QDialog):
         dict_colonne = self.dictionnaire_colonne(table)
         column_type = dict_colonne[colonne]['type']
 
-        if column_type == self.TYPE_STRING:
-            return "'" + self.tbl_tri.cellWidget(row, 3).text() + "'"
-        elif column_type == self.TYPE_INTEGER:
-            return self.tbl_tri.cellWidget(row, 3).value()
-        elif column_type == self.TYPE_DATE:
-            return self.tbl_tri.cellWidget(row, 3).date().toString('yyyy-MM-dd')
-        elif column_type == self.TYPE_TIME:
-            return self.tbl_tri.cellWidget(row, 3).time().toString('HH:mm')
-        elif column_type == self.TYPE_BOOLEAN:
-            return self.tbl_tri.cellWidget(row, 3).checked()
-        elif column_type == self.TYPE_DATETIME:
-            return self.tbl_tri.cellWidget(row, 3).dateTime().toString('yyyy-MM-dd hh:mm:ss')
-        elif column_type == self.TYPE_PRIX:
-            return self.tbl_tri.cellWidget(row, 3).value()
-        else: # TYPE_STATUS_INSCRIPTION
-            if self.tbl_tri.cellWidget(row, 3).currentText() == 'Active':
-                return facturation.STATUS_INSCRIPTION
-            elif self.tbl_tri.cellWidget(row, 3).currentText() == 'Facturée':
-                return facturation.STATUS_FACTURE
-            elif self.tbl_tri.cellWidget(row, 3).currentText() == 'Annulée':
-                return facturation.STATUS_INSCRIPTION_ANNULEE
-            else:
-                return facturation.STATUS_REMBOURSE
+        return valeur_widget(self.tbl_tri.cellWidget(row, 3), TYPE_PARAMETRE[column_type])
 
-    def liste_table_secondaire(self):
+    def liste_jointure(self):
         """
-        Générer la liste des tables secondaires
+        Générer la liste des types de jointure choisis dans la table des champs
+
+        La contrainte d'une ligne est le type de jointure de la table de la ligne suivante.
 
         Return : 
-            Dictionnaire des tables secondaires
+            Dictionnaire {Table: Type de jointure}
         """
+        dict_jointure = {}
         for row in range(1, self.tbl_champs.rowCount()):
-            last_row = row - 1
-
-            # Tableau des lignes actuelle et suivante
-            last_table = self.tbl_champs.cellWidget(last_row, 0).currentData()
             current_table = self.tbl_champs.cellWidget(row, 0).currentData()
-            contrainte = self.tbl_champs.cellWidget(last_row, 2).currentData()
-
-            dict_table_secondaire = {}
-
-            # Ajouter la table à la liste
-            if current_table and contrainte:
-                if last_table != current_table:
-                    # Déterminer l'identifiant pour la clause 'ON'
-                    if last_table in self.DICT_REFERENCE_TABLE[current_table]['to']:
-                        id = self.DICT_TABLE[last_table]['id']
-                    else:
-                        id = self.DICT_TABLE[current_table]['id']
-                    dict_table_secondaire[(current_table, last_table)] = {'contrainte': contrainte, 'id' : id}
-
-            return dict_table_secondaire
-    
+            contrainte = self.tbl_champs.cellWidget(row - 1, 3).currentData()
+
+            # La première contrainte d'une table est conservée
+            if current_table and contrainte in self.DICT_CONTRAINTE_AUTRE_TABLE:
+                dict_jointure.setdefault(current_table, contrainte)
+
+        return dict_jointure
+
     def enregistrer(self):
         """
         Enregistrer la statistique
@@ -1110,34 +1113,22 @@ class Statistiques(QDialog):
         if not self.txt_titre.text():
             data_error.aucun_nom_statistique()
         else:
-            # Obtenir la requête
-            requete = self.generer_requete()
+            # Obtenir la statistique compilée
+            statistique = self.generer_statistique()
 
-            # Obtenir le type de fichier de sortie
-            if self.rbt_excel.isChecked():
-                sortie = "csv"
-            else:
-                sortie = "pdf"
-            
             # Vérifier si la requête est vide
-            if requete:
-                stat = ET.Element("stat")
-
-                ET.SubElement(stat, "sql").text = requete
-                ET.SubElement(stat, "output").text = sortie
-
-                tree = ET.ElementTree(stat)
-
+            if statistique:
                 # Obtenir le chemin vers la folder pour enregistrer des réglages
                 settings = QSettings("SDR Soft", "PyGUIDE")
-                statistique = settings.value("Statistique")
+                dossier = settings.value("Statistique")
 
-                filename = self.txt_titre.text() + ".gxml"
-                tree.write(os.path.join(statistique, filename))
+                filename = self.txt_titre.text() + definition.EXTENSION
+                definition.ecrire(statistique, os.path.join(dossier, filename))
                 self.accept()
-            else:
+            elif statistique is None:
                 data_error.requete_vide()
 
+
 class StatistiquesDialog(Statistiques, Ui_Statistique):
     """Dialog pour les statistiques"""
     def __init__(self, database):
@@ -1157,3 +1148,44 @@ class StatistiquesDialog(Statistiques, Ui_Statistique):
         self.btn_affiche_excel.clicked.connect(self.afficher_csv)
         self.btn_afficher_pdf.clicked.connect(self.afficher_pdf)
         self.btn_enregistrer.clicked.connect(self.enregistrer)
+
+
+class ParametresStatistique(QDialog):
+    """
+    Dialog pour modifier les paramètres d'une statistique enregistrée
+
+    Les valeurs enregistrées avec la statistique sont affichées par défaut.
+
+    Methodes :
+        valeurs : Obtenir la valeur de chaque paramètre
+    """
+    def __init__(self, statistique):
+        super(ParametresStatistique, self).__init__()
+        self.setWindowTitle(statistique.titre)
+
+        # Paramètres et widget de chaque paramètre
+        self.PARAMETRES = statistique.parametres
+        self.WIDGETS = []
+
+        layout = QFormLayout(self)
+        for parametre in self.PARAMETRES:
+            widget = creer_widget(parametre.type, parametre.valeur)
+            self.WIDGETS.append(widget)
+            layout.addRow(parametre.libelle, widget)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        layout.addRow(buttons)
+
+        # Slots
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+    def valeurs(self):
+        """
+        Obtenir la valeur de chaque paramètre
+
+        Return :
+            Dictionnaire {Nom: Valeur}
+        """
+        return {parametre.nom: valeur_widget(widget, parametre.type)
+                for parametre, widget in zip(self.PARAMETRES, self.WIDGETS)}
@@ -0,0 +1,80 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Mesure de la performance de la facturation et des inscriptions avec pytest-benchmark
+
+La base de données est générée par guide.script.benchmark.generateur dans un dossier temporaire. La variable
+d'environnement PYGUIDE_BASE_BENCHMARK permet d'utiliser une copie d'une base de données générée précédemment.
+
+Utilisation :
+    python -m pytest tests/benchmark --benchmark-autosave
+    python -m pytest tests/benchmark --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+# Python import
+import itertools
+import os
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("PyQt5.QtSql")
+
+# PyQt import
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtSql import QSqlDatabase
+
+# Project import
+from guide.script.benchmark import facturation
+
+# Nombre de répétitions de chaque opération
+REPETITIONS = 100
+
+# Graine du générateur de données
+GRAINE = 0
+
+
+@pytest.fixture(scope='module')
+def operations(tmp_path_factory):
+    """
+    Opérations mesurées sur une base de données temporaire
+    """
+    # Le pilote QSQLITE est chargé par l'application
+    application = QCoreApplication.instance() or QCoreApplication([])
+    generateur = random.Random(GRAINE)
+
+    database = facturation.creer_base_donnees(str(tmp_path_factory.mktemp("benchmark")), generateur,
+                                              facturation.PARTICIPANTES, facturation.CATEGORIES,
+                                              facturation.SEMAINES, facturation.INSCRIPTIONS,
+                                              os.environ.get("PYGUIDE_BASE_BENCHMARK"))
+    yield facturation.operations(database, generateur, REPETITIONS)
+
+    database.close()
+    del database
+    QSqlDatabase.removeDatabase(facturation.CONNEXION)
+    del application
+
+
+@pytest.mark.parametrize('nom', ['inscrire', 'facturer', 'rang', 'disponibilite', 'presence'])
+def test_operation(benchmark, operations, nom):
+    operation = operations[nom]
+    repetition = itertools.count()
+
+    # Chaque appel utilise la répétition suivante tirée par le générateur
+    resultat = benchmark.pedantic(lambda: operation(next(repetition)), rounds=REPETITIONS, iterations=1)
+
+    assert resultat
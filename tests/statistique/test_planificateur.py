@@ -0,0 +1,113 @@
+# This file is part of PyGuide.
+#
+# PyGuide is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# PyGuide is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with PyGuide.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Jointures planifiées sur une base de données générée par guide.script.benchmark.generateur
+
+Les tables et leurs références sont celles de Statistiques (DICT_TABLE et DICT_REFERENCE_TABLE), copiées ici pour que
+les tests n'utilisent pas PyQt.
+"""
+
+# Python import
+import random
+import sqlite3
+
+import pytest
+
+# Project import
+from guide.script.benchmark import generateur
+from guide.statistique import planificateur
+
+# Tables des statistiques {Table: {'id': Identifiant}}
+DICT_TABLE = {
+    'activite': {'id': 'id_activite'},
+    'article': {'id': 'id_article'},
+    'categorie_activite': {'id': 'id_categorie_activite'},
+    'facture': {'id': 'id_facture'},
+    'groupe': {'id': 'id_groupe'},
+    'inscription': {'id': 'id_inscription'},
+    'lieu': {'id': 'id_lieu'},
+    'membre': {'id': 'id_membre'},
+    'participante': {'id': 'id_participante'},
+    'responsable': {'id': 'id_responsable'},
+    'type_activite': {'id': 'id_type_activite'}
+}
+
+# Tables référencées par chaque table
+DICT_REFERENCE_TABLE = {
+    'activite': {'to': ['categorie_activite']},
+    'article': {'to': ['facture', 'activite']},
+    'categorie_activite': {'to': ['responsable', 'type_activite', 'lieu']},
+    'facture': {'to': ['participante']},
+    'groupe': {'to': ['activite']},
+    'inscription': {'to': ['participante', 'activite']},
+    'lieu': {'to': []},
+    'membre': {'to': ['participante']},
+    'participante': {'to': []},
+    'responsable': {'to': []},
+    'type_activite': {'to': []}
+}
+
+# Nombre de participantes de la base de données générée
+PARTICIPANTES = 500
+
+
+@pytest.fixture(scope='module')
+def connexion():
+    """
+    Base de données générée en mémoire
+    """
+    connexion = sqlite3.connect(":memory:", isolation_level=None)
+    connexion.execute("BEGIN")
+    generateur.creer_tables(connexion)
+    generateur.generer(connexion, random.Random(0), participantes=PARTICIPANTES)
+    generateur.terminer_schema(connexion)
+    connexion.execute("COMMIT")
+    yield connexion
+    connexion.close()
+
+
+def planifier(racine, champs):
+    return planificateur.planifier(racine, [planificateur.Champ(*champ) for champ in champs], [], None, dict(),
+                                   DICT_TABLE, DICT_REFERENCE_TABLE)
+
+
+def test_article_joint_par_facture(connexion):
+    # Les articles d'une participante sont ceux de ses factures, pas ceux des activités où elle est inscrite
+    requete = planifier('participante', [('participante', 'id_participante'), ('inscription', 'status'),
+                                         ('article', 'id_facture')])
+    assert "JOIN facture" in requete.sql
+    assert "JOIN activite" not in requete.sql
+
+    lignes = connexion.execute(requete.sql, requete.parametres).fetchall()
+    assert lignes
+    facture = dict(connexion.execute("SELECT id_facture, id_participante FROM facture"))
+    assert all(facture[id_facture] == id_participante for id_participante, _, id_facture in lignes)
+
+
+def test_jointure_ambigue_refusee():
+    # À partir d'un article, une participante est l'acheteuse (facture) ou une inscrite à l'activité (inscription)
+    with pytest.raises(ValueError):
+        planifier('article', [('article', 'prix'), ('participante', 'nom'), ('inscription', 'status')])
+
+
+def test_cycle_ferme(connexion):
+    # Lorsque toutes les tables du cycle sont utilisées, les deux chemins sont dans la clause ON
+    requete = planifier('article', [('article', 'id_facture'), ('facture', 'id_participante'),
+                                    ('activite', 'id_activite'), ('inscription', 'id_participante'),
+                                    ('participante', 'id_participante')])
+    lignes = connexion.execute(requete.sql, requete.parametres).fetchall()
+    assert lignes
+    assert all(ligne[1] == ligne[3] == ligne[4] for ligne in lignes)